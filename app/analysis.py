@@ -1,24 +1,28 @@
-import csv
 import io
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
 import numpy as np
 import pandas as pd
 import requests
 
+from app.ingest import read_rows
+from app.dataset import ColumnStats, column_stats
+from app.parallel import PARALLEL_MIN_CELLS, map_columns
+from app.patterns import pattern_cell
+from app.semantic import NUMERIC_TYPES, fits
+from app.sketches import (APPROX_DISTINCT_ERROR, APPROX_DISTINCT_ROWS, TOP_K, Moments, SpaceSaving, TDigest,
+                          merge_sketches, quantile_cell, sketch_frame)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # CSV/Parsing helpers
 # ──────────────────────────────────────────────────────────────────────────────
 
 def detect_and_split_data(text: str):
-    lines = text.strip().splitlines()
-    if not lines:
-        return [], []
-    delim = "," if "," in lines[0] else "|"
-    rows = list(csv.reader(lines, delimiter=delim))
-    return (rows[0], rows[1:]) if len(rows) > 1 else ([], [])
+    return read_rows(io.StringIO(text))
 
 
 _SPLIT_CAMEL = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
@@ -30,66 +34,142 @@ def _split_words(col: str) -> str:
 # Profile / Quality / Catalog / Compliance (original logic)
 # ──────────────────────────────────────────────────────────────────────────────
 
-def profile_analysis(df: pd.DataFrame):
-    now, total = datetime.now().strftime("%Y-%m-%d %H:%M:%S"), len(df)
-    rows = []
-    for col in df.columns:
-        s = df[col]
-        nulls = int(s.isnull().sum())
-        blanks = int((s.astype(str).str.strip() == "").sum())
-        uniq = int(s.nunique(dropna=True))
-        comp = round(100 * (total - nulls - blanks) / total, 2) if total else 0
-        if pd.api.types.is_numeric_dtype(s):
-            vals = pd.to_numeric(s, errors="coerce").dropna()
-            stats = (vals.min(), vals.max(), vals.median(), vals.std()) if not vals.empty else ("N/A",) * 4
-        else:
-            lengths = s.dropna().astype(str).str.strip().replace("", pd.NA).dropna().str.len()
-            stats = (
-                lengths.min() if not lengths.empty else "N/A",
-                lengths.max() if not lengths.empty else "N/A",
-                lengths.median() if not lengths.empty else "N/A",
-                "N/A"
-            )
-        rows.append([col, total, uniq, comp, nulls, blanks, *stats, now])
-    hdr = ["Field", "Total", "Unique", "Completeness (%)",
-           "Nulls", "Blanks", "Min", "Max", "Median", "Std", "Analysis Date"]
-    return hdr, rows
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
 
+def _default_valid_count(st, kind: str) -> int:
+    """Values that fit the column's semantic type *kind* (app.semantic).
 
-_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
-_DATE_PARSE = lambda x: pd.to_datetime(x, errors="coerce")
-
-def _default_valid_count(s: pd.Series) -> int:
-    if pd.api.types.is_numeric_dtype(s):
-        return pd.to_numeric(s, errors="coerce").notna().sum()
-    if "date" in s.name.lower() or pd.api.types.is_datetime64_any_dtype(s):
-        return _DATE_PARSE(s).notna().sum()
-    if "email" in s.name.lower():
-        return s.astype(str).str.match(_EMAIL_RE).sum()
-    return s.astype(str).str.strip().ne("").sum()
-
-def quality_analysis(df: pd.DataFrame, rules: dict[str, re.Pattern] | None = None):
-    now, total = datetime.now().strftime("%Y-%m-%d %H:%M:%S"), len(df)
-    rows = []
-    for col in df.columns:
-        s = df[col]
-        nulls = int(s.isnull().sum())
-        blanks = int((s.astype(str).str.strip() == "").sum())
-        comp_pct = round(100 * (total - nulls - blanks) / total, 2) if total else 0
-        uniq_pct = round(100 * s.nunique(dropna=True) / total, 2) if total else 0
-        if rules and col in rules:
-            valid_cnt = s.dropna().astype(str).str.match(rules[col]).sum()
+    A column too dirty to type still gets the date/email check its name
+    promises; any other text column counts its non-blank values.
+    """
+    name = str(st.s.name).lower()
+    if st.is_numeric:
+        return st.numeric.notna().sum()
+    if kind == "date" or "date" in name or pd.api.types.is_datetime64_any_dtype(st.s):
+        return st.dates.notna().sum()
+    if kind == "email" or "email" in name:
+        return fits(st.text[~st.null_mask], "email").sum()
+    if kind in NUMERIC_TYPES:
+        return st.lenient_numeric.notna().sum()
+    if kind in ("phone", "boolean"):
+        return fits(st.text[~st.null_mask], kind).sum()
+    return st.text.ne("").sum()
+
+def approx_distinct_mode(settings: dict):
+    """(min_rows, rel_error) for ColumnStats.distinct from the app settings, or None when turned off."""
+    try:
+        rows = int(float(settings.get("approx_distinct_rows", APPROX_DISTINCT_ROWS)))
+        err = float(settings.get("approx_distinct_error", APPROX_DISTINCT_ERROR))
+    except (TypeError, ValueError):
+        rows, err = APPROX_DISTINCT_ROWS, APPROX_DISTINCT_ERROR
+    return (rows, err) if rows > 0 and 0 < err < 1 else None
+
+def column_metrics(st, rule=None, approx=None) -> dict:
+    """Every Profile and Quality figure for one column, computed together.
+
+    *st* is the column's ColumnStats, so each derived view (null mask, stripped
+    text, numbers) is built once and the result is kept on it; Profile, Quality
+    and the KPIs are projections of this dict. Min/Max/Median/Std describe the
+    values of a numeric column and the stripped text lengths of any other; the
+    median comes from the column's quantile sketch (ColumnStats.digest) and
+    reads "≈v (±e pctl)" when that is not exact. Validity checks the values
+    against the column's semantic type unless *rule* (a quality regex) is
+    given. *approx* (see approx_distinct_mode) lets long columns estimate their
+    distinct count; "distinct_mark" is then "≈".
+    """
+    m = st.metrics
+    if m is None:
+        col = st.s.name
+        if st.is_numeric:
+            vals = st.numeric.dropna()
+            stats = ((vals.min(), vals.max(), quantile_cell(st.digest("numeric"), 0.5), vals.std())
+                     if not vals.empty else ("N/A",) * 4)
         else:
-            valid_cnt = _default_valid_count(s)
-        valid_pct = round(100 * valid_cnt / total, 2) if total else 0
-        score = round((comp_pct + valid_pct) / 2, 2)
-        rows.append([col, total, comp_pct, uniq_pct, valid_pct, score, now])
-    hdr = ["Field", "Total", "Completeness (%)", "Uniqueness (%)",
-           "Validity (%)", "Quality Score (%)", "Analysis Date"]
-    return hdr, rows
+            lengths = st.text_lengths
+            stats = ((lengths.min(), lengths.max(), quantile_cell(st.digest("text_lengths"), 0.5), "N/A")
+                     if not lengths.empty else ("N/A",) * 4)
+        m = st.metrics = {
+            "field": col, "kind": "numeric" if st.is_numeric else "text", "total": len(st.s),
+            "nulls": st.nulls, "blanks": st.blanks,
+            "min": stats[0], "max": stats[1], "median": stats[2], "std": stats[3],
+            "valid": int(_default_valid_count(st, st.semantic.kind)),
+        }
+    distinct, mark = st.distinct(approx)
+    m = dict(m, distinct=distinct, distinct_mark=mark)
+    return m if rule is None else dict(m, valid=st.matches(rule))
+
+PROFILE_HEADERS = ["Field", "Total", "Unique", "Completeness (%)",
+                   "Nulls", "Blanks", "Min", "Max", "Median", "Std", "Analysis Date"]
+QUALITY_HEADERS = ["Field", "Total", "Completeness (%)", "Uniqueness (%)",
+                   "Validity (%)", "Quality Score (%)", "Analysis Date"]
+
+def _profile_row(m: dict, now: str) -> list:
+    total = m["total"]
+    comp = round(100 * (total - m["nulls"] - m["blanks"]) / total, 2) if total else 0
+    uniq = f"{m['distinct_mark']}{m['distinct']:,}" if m["distinct_mark"] else m["distinct"]
+    return [m["field"], total, uniq, comp, m["nulls"], m["blanks"],
+            m["min"], m["max"], m["median"], m["std"], now]
+
+def _quality_row(m: dict, now: str) -> list:
+    total = m["total"]
+    comp_pct = round(100 * (total - m["nulls"] - m["blanks"]) / total, 2) if total else 0
+    uniq_pct = round(100 * m["distinct"] / total, 2) if total else 0
+    if m["distinct_mark"]:
+        uniq_pct = f"{m['distinct_mark']}{uniq_pct}"
+    if m["valid"] is None:      # sketched without the values: validity is unknown
+        return [m["field"], total, comp_pct, uniq_pct, "N/A", "N/A", now]
+    valid_pct = round(100 * m["valid"] / total, 2) if total else 0
+    score = round((comp_pct + valid_pct) / 2, 2)
+    return [m["field"], total, comp_pct, uniq_pct, valid_pct, score, now]
+
+def _metrics_batch(frame: pd.DataFrame, rules=None, approx=None) -> list:
+    """(column_metrics, metrics under the column's rule or None) for each column of *frame*."""
+    out = []
+    for col in frame.columns:
+        st = column_stats(frame, col)
+        rule = (rules or {}).get(col)
+        out.append((column_metrics(st, approx=approx),
+                    None if rule is None else column_metrics(st, rule, approx)))
+    return out
+
+def all_column_metrics(df: pd.DataFrame, rules: dict | None = None, workers: int = 1, approx=None) -> list:
+    """column_metrics for every column of *df*, in column order.
+
+    Columns whose metrics are not cached yet are computed across *workers*
+    processes for wide tables (app.parallel.map_columns); the results are
+    cached on the columns' ColumnStats like serially computed ones.
+    """
+    rules = rules or {}
+    stats = [column_stats(df, col) for col in df.columns]
+    ruled = {}
+    todo = [i for i, st in enumerate(stats)
+            if st.metrics is None or st.distinct_mode(approx) not in st.distincts]
+    if workers > 1 and todo:
+        part = df.iloc[:, todo]
+        part.attrs = {}     # cached below on df's own ColumnStats, not under a copy of its version
+        results = map_columns(part, partial(_metrics_batch, rules=rules, approx=approx), workers)
+        for i, (m, with_rule) in zip(todo, results):
+            stats[i].metrics = m
+            stats[i].distincts[stats[i].distinct_mode(approx)] = (m["distinct"], m["distinct_mark"])
+            if with_rule is not None:
+                ruled[i] = with_rule
+    return [ruled.get(i) or column_metrics(st, rules.get(col), approx)
+            for i, (col, st) in enumerate(zip(df.columns, stats))]
+
+def profile_analysis(df: pd.DataFrame, workers: int = 1, approx=None):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [_profile_row(m, now) for m in all_column_metrics(df, workers=workers, approx=approx)]
+    return list(PROFILE_HEADERS), rows
+
+def quality_analysis(df: pd.DataFrame, rules: dict[str, re.Pattern] | None = None, workers: int = 1,
+                     approx=None):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [_quality_row(m, now) for m in all_column_metrics(df, rules, workers, approx)]
+    return list(QUALITY_HEADERS), rows
 
 
-def _business_description(col: str) -> str:
+def _business_description(col: str, kind: str | None = None) -> str:
+    """A one-line description from the column name, or from its semantic *kind* when the name says nothing."""
     name = col.lower()
     clean = re.sub(r'[^a-z0-9_]', ' ', name)
     tokens = [t for t in re.split(r'[_\s]+', clean) if t]
@@ -99,19 +179,21 @@ def _business_description(col: str) -> str:
     if tokens[-1] == "id":
         ent = " ".join(tokens[:-1]) or "record"
         return f"Unique identifier for each {ent}."
-    if "email" in tokens:
+    if "email" in tokens or kind == "email":
         return f"Email address of the {noun}."
-    if any(t in tokens for t in ("phone", "tel", "telephone")):
+    if any(t in tokens for t in ("phone", "tel", "telephone")) or kind == "phone":
         return f"Telephone number associated with the {noun}."
-    if "date" in tokens or "timestamp" in tokens:
+    if "date" in tokens or "timestamp" in tokens or kind == "date":
         return f"Date or time related to the {noun}."
-    if {"amount","total","price","cost","balance"} & set(tokens):
+    if {"amount","total","price","cost","balance"} & set(tokens) or kind == "currency":
         return f"Monetary amount representing the {noun}."
+    if kind == "percent":
+        return f"Percentage for the {noun}."
     if {"qty","quantity","count","number"} & set(tokens):
         return f"Number of {noun}."
     if "status" in tokens:
         return f"Current status of the {noun}."
-    if "flag" in tokens:
+    if "flag" in tokens or kind == "boolean":
         return f"Indicator flag for the {noun}."
     if "type" in tokens or "category" in tokens:
         return f"Classification type of the {noun}."
@@ -119,20 +201,26 @@ def _business_description(col: str) -> str:
         return f"Standard code representing the {noun}."
     return f"{_split_words(col).title()} for each record."
 
-def catalog_analysis(df: pd.DataFrame):
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _catalog_rows(frame: pd.DataFrame, now: str) -> list:
     rows = []
-    for col in df.columns:
-        s = df[col]
+    for col in frame.columns:
+        s = frame[col]
+        st = column_stats(frame, col)
         friendly = _split_words(col).title()
-        descr = _business_description(col)
-        dtype = ("Numeric" if pd.api.types.is_numeric_dtype(s)
-                 else "Date" if "date" in descr else "Text")
+        descr = _business_description(col, st.semantic.kind)
+        dtype = st.semantic.catalog_type
         nullable = "Yes" if s.isnull().any() else "No"
+        pattern = pattern_cell(st.patterns)
         example = str(s.dropna().iloc[0]) if not s.dropna().empty else ""
-        rows.append([col, friendly, descr, dtype, nullable, example, now])
+        rows.append([col, friendly, descr, dtype, nullable, pattern, example, now])
+    return rows
+
+def catalog_analysis(df: pd.DataFrame, workers: int = 1):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # a catalog row is cheap (null check + first value), so only very large tables pay for processes
+    rows = map_columns(df, partial(_catalog_rows, now=now), workers, min_cells=10 * PARALLEL_MIN_CELLS)
     hdr = ["Field", "Friendly Name", "Description",
-           "Data Type", "Nullable", "Example", "Analysis Date"]
+           "Data Type", "Nullable", "Pattern", "Example", "Analysis Date"]
     return hdr, rows
 
 
@@ -158,10 +246,11 @@ def _rule_based_anomalies(df: pd.DataFrame):
     findings = []
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     for col in df.columns:
-        s = df[col].astype(str).str.strip()
-        blanks = int((s == "").sum())
+        st = column_stats(df, col)
+        s = st.text
+        blanks = st.blanks
         nulls = int((s.str.lower() == "nan").sum())
-        numeric = pd.to_numeric(df[col], errors="coerce")
+        numeric = st.numeric
         if numeric.notna().any():
             neg = int((numeric < 0).sum())
             std = numeric.std(skipna=True) or 0
@@ -170,8 +259,8 @@ def _rule_based_anomalies(df: pd.DataFrame):
             neg = huge = 0
 
         bad_email = 0
-        if "email" in col.lower():
-            bad_email = int(~s.str.contains(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", regex=True, na=True).sum())
+        if "email" in col.lower() or st.semantic.kind == "email":
+            bad_email = int((~s.str.contains(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", regex=True, na=True)).sum())
 
         if blanks or nulls or neg or huge or bad_email:
             reason = []
@@ -202,6 +291,7 @@ def anomalies_analysis(df: pd.DataFrame):
       • Duplicate full rows
       • Numeric outliers (|z| > 3)
       • Email format checks for columns with 'email' in the name
+      • Rare values in coded text columns (see common_values)
     """
     findings = []
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -213,15 +303,14 @@ def anomalies_analysis(df: pd.DataFrame):
 
     # 1) Missing / blank cells
     for col in df.columns:
-        s = df[col]
-        blanks_mask = s.astype(str).str.strip().eq("") | s.isna()
-        n_blanks = int(blanks_mask.sum())
+        st = column_stats(df, col)
+        n_blanks = st.blanks + st.nulls
         if n_blanks:
             findings.append([col, f"{n_blanks} missing/blank", "Impute, drop or enforce NOT NULL", now])
 
     # 2) Numeric outliers via z-score > 3
     for col in df.columns:
-        s_num = pd.to_numeric(df[col], errors="coerce")
+        s_num = column_stats(df, col).numeric
         if s_num.notna().sum() == 0:
             continue
         mu = s_num.mean()
@@ -233,20 +322,26 @@ def anomalies_analysis(df: pd.DataFrame):
                 findings.append([col, f"{len(out_idx)} numeric outlier(s) |z|>3", "Investigate/clip/winsorize", now])
 
     # 3) Email format check
-    email_cols = [c for c in df.columns if "email" in c.lower()]
+    email_cols = [c for c in df.columns
+                  if "email" in c.lower() or column_stats(df, c).semantic.kind == "email"]
     if email_cols:
         email_re = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
         for col in email_cols:
-            bad = 0
-            for _, val in df[col].items():
-                if pd.isna(val):
-                    continue
-                v = str(val).strip()
-                if v and not email_re.match(v):
-                    bad += 1
+            st = column_stats(df, col)
+            v = st.text[~st.null_mask]
+            bad = int((v.ne("") & ~v.str.match(email_re)).sum())
             if bad:
                 findings.append([col, f"{bad} invalid email(s)", "Validate with regex & cleanse source", now])
 
+    # 4) Rare values where a few values make up nearly the whole column
+    for col in df.columns:
+        st = column_stats(df, col)
+        common = None if st.is_numeric else common_values(st.heavy_hitters)
+        if common:
+            rare = int((st.s.notna() & ~st.s.isin(common)).sum())
+            if rare:
+                findings.append([col, _rare_reason(rare, len(common)), RARE_RECOMMENDATION, now])
+
     if not findings:
         findings = [["(none)", "No anomalies found", "", now]]
 
@@ -258,6 +353,309 @@ def detect_anomalies(df: pd.DataFrame):
     return anomalies_analysis(df)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Top values (heavy hitters) per column
+# ──────────────────────────────────────────────────────────────────────────────
+# Every column gets a Space-Saving summary (app.sketches.SpaceSaving) in one
+# pass, in memory, chunk by chunk or over a stream. The same summaries feed the
+# rarity check in the anomaly detectors and the synthetic data generators.
+
+TOP_VALUES_HEADERS = ["Field", "Rank", "Value", "Count", "Share (%)", "Count Error", "Analysis Date"]
+RARE_COVERAGE = 0.99        # a column is "coded" when its top values cover this share of it
+RARE_SHARE = 0.001          # ... and a value under this share of such a column is rare
+RARE_MIN_ROWS = 1_000       # columns with fewer values are not judged
+RARE_RECOMMENDATION = "Check for typos or unmapped codes"
+
+def _top_rows(field, ss: SpaceSaving, k: int, now: str) -> list:
+    """Top Values rows for one column; Count may be over by at most Count Error (0 = exact)."""
+    return [[field, rank, v, c, round(100 * c / ss.n, 2) if ss.n else 0.0, e, now]
+            for rank, (v, c, e) in enumerate(ss.top(k), 1)]
+
+def _top_values_table(summaries: dict, k: int):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [r for col, ss in summaries.items() for r in _top_rows(col, ss, k, now)]
+    return list(TOP_VALUES_HEADERS), rows
+
+def top_values_analysis(df: pd.DataFrame, k: int = TOP_K):
+    """The *k* most frequent values of every column with counts and shares (the Profile "Top Values" view)."""
+    return _top_values_table({col: column_stats(df, col).heavy_hitters for col in df.columns}, k)
+
+def top_values_stream(batches, k: int = TOP_K):
+    """top_values_analysis over a stream of batches (a file, a URI, a spilled dataset's chunks)."""
+    summaries = {}
+    for frame in batches:
+        for col in frame.columns:
+            summaries.setdefault(str(col), SpaceSaving()).update(frame[col])
+    return _top_values_table(summaries, k)
+
+def top_values_chunks(spill, k: int = TOP_K):
+    """top_values_analysis over every row of a SpilledFrame, one chunk in memory at a time."""
+    return top_values_stream(spill.iter_chunks(), k)
+
+def common_values(ss: SpaceSaving, k: int = TOP_K):
+    """The column's common values as a set when it is coded, else None.
+
+    A column is coded when its top *k* values surely cover RARE_COVERAGE of it;
+    its common values are those among them with at least RARE_SHARE of the rows.
+    Anything else (a mistyped code, an unmapped category) is then rare.
+    """
+    if ss.n < RARE_MIN_ROWS:
+        return None
+    top = ss.top(k)
+    covered = sum(c - e for _, c, e in top)     # counts can only be over-estimates
+    if covered < RARE_COVERAGE * ss.n:
+        return None
+    return {v for v, c, _ in top if c >= RARE_SHARE * ss.n}
+
+def _rare_reason(n: int, k: int) -> str:
+    return f"{n} rare value(s) outside the {k} common value(s)"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Chunked Profile / Quality / Anomalies for datasets spilled to disk
+# ──────────────────────────────────────────────────────────────────────────────
+# Each analyzer streams the SpilledFrame chunk by chunk, keeps small mergeable
+# partials per column (app.sketches) and turns them into the same table as the
+# in-memory version. Counts, min/max and std are exact; distinct counts are
+# exact up to DISTINCT_EXACT_MAX values per column while all columns together
+# hold at most DISTINCT_EXACT_BUDGET hashes (or, in approximate mode, up to its
+# row threshold) and a HyperLogLog estimate past that, medians come from a
+# t-digest — estimates read "≈N" / "≈value".
+
+DISTINCT_EXACT_MAX = 5_000_000      # hashed distinct values kept per column ...
+DISTINCT_EXACT_BUDGET = 25_000_000  # ... and over all columns of one pass (8 bytes each)
+DISTINCT_MERGE_MIN = 1 << 16        # queued hashes before a column's first merge
+DUPLICATE_ROWS_MAX = 20_000_000     # row hashes kept for the duplicate-row check
+
+
+class _HashBudget:
+    """Hashes held by the _Distinct sets of one pass, against DISTINCT_EXACT_BUDGET."""
+
+    def __init__(self, limit: int = DISTINCT_EXACT_BUDGET):
+        self.limit, self.held = limit, 0
+
+
+class _Distinct:
+    """Distinct non-null values counted through 64-bit hashes.
+
+    Each chunk's unique hashes are queued and merged into the sorted set once
+    the queue is as long as the set, so a column is re-sorted O(log N) times
+    rather than once per chunk. A column past *cap*, or the one that takes the
+    shared *budget* past its limit, drops its hashes and is left to the HLL.
+    """
+
+    def __init__(self, cap: int = DISTINCT_EXACT_MAX, budget: _HashBudget | None = None):
+        self.cap, self.budget, self.over = cap, budget, cap <= 0
+        self.seen, self.queue, self.queued = np.empty(0, dtype=np.uint64), [], 0
+
+    def add(self, s: pd.Series):
+        if self.over:
+            return
+        vals = s.dropna()
+        if vals.empty:
+            return
+        h = np.unique(pd.util.hash_pandas_object(vals, index=False).to_numpy())
+        self.queue.append(h)
+        self.queued += len(h)
+        self._held(len(h))
+        if self.queued >= max(len(self.seen), DISTINCT_MERGE_MIN) or len(self.seen) + self.queued > self.cap:
+            self._merge()
+        if len(self.seen) > self.cap or (self.budget is not None and self.budget.held > self.budget.limit):
+            self._held(-len(self.seen) - self.queued)
+            self.seen, self.queue, self.queued, self.over = np.empty(0, dtype=np.uint64), [], 0, True
+
+    def _held(self, n: int):
+        if self.budget is not None:
+            self.budget.held += n
+
+    def _merge(self):
+        if not self.queue:
+            return
+        held = len(self.seen) + self.queued
+        self.seen = np.unique(np.concatenate([self.seen, *self.queue]))
+        self.queue, self.queued = [], 0
+        self._held(len(self.seen) - held)
+
+    @property
+    def count(self) -> int:
+        self._merge()
+        return len(self.seen)
+
+
+def chunk_metrics(spill, rules: dict[str, re.Pattern] | None = None, approx=None) -> list:
+    """column_metrics for every column of a SpilledFrame, merged over one pass through its chunks.
+
+    With *approx* (see approx_distinct_mode) and at least its row threshold,
+    distinct counts skip the exact hash sets and come from the sketches alone.
+    """
+    cols = spill.columns
+    valid = dict.fromkeys(cols, 0)
+    estimate = approx is not None and len(spill) >= approx[0]
+    budget = _HashBudget()
+    distinct = {c: _Distinct(0 if estimate else DISTINCT_EXACT_MAX, budget) for c in cols}
+    sketches, kinds = {}, {}
+    for chunk in spill.iter_chunks():
+        sketch_frame(chunk, sketches, approx[1] if approx else None)
+        for col in cols:
+            st = ColumnStats(chunk[col])
+            distinct[col].add(st.s)
+            if col not in kinds:        # typed once, from the first chunk
+                kinds[col] = st.semantic.kind
+            kind = kinds[col]
+            valid[col] += int(st.matches(rules[col]) if rules and col in rules
+                              else _default_valid_count(st, kind))
+    metrics = []
+    for col in cols:
+        m = sketches[col].metrics(col) if col in sketches else _empty_metrics(col)
+        if not distinct[col].over:      # below the cap the hashed count is exact
+            m.update(distinct=distinct[col].count, distinct_mark="")
+        metrics.append(dict(m, valid=valid[col]))
+    return metrics
+
+
+def _empty_metrics(col) -> dict:
+    return {"field": col, "kind": "text", "total": 0, "nulls": 0, "blanks": 0, "distinct": 0,
+            "distinct_mark": "", "min": "N/A", "max": "N/A", "median": "N/A", "std": "N/A", "valid": 0}
+
+
+def profile_chunks(spill, approx=None):
+    """profile_analysis over every row of a SpilledFrame, one chunk in memory at a time."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return list(PROFILE_HEADERS), [_profile_row(m, now) for m in chunk_metrics(spill, approx=approx)]
+
+
+def quality_chunks(spill, rules: dict[str, re.Pattern] | None = None, approx=None):
+    """quality_analysis over every row of a SpilledFrame, one chunk in memory at a time."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return list(QUALITY_HEADERS), [_quality_row(m, now) for m in chunk_metrics(spill, rules, approx)]
+
+
+def anomalies_chunks(spill):
+    """anomalies_analysis over every row of a SpilledFrame in two passes.
+
+    Duplicate rows are reported as one finding with their number rather than
+    one finding per row. Numeric columns are also checked against the 1.5×IQR
+    fences, with the quartiles read from a t-digest built in the first pass,
+    and text columns for rare values with a Space-Saving summary.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    cols = spill.columns
+    email_cols = [c for c in cols if "email" in c.lower()]
+    missing, bad_email = dict.fromkeys(cols, 0), dict.fromkeys(email_cols, 0)
+    moments = {c: Moments() for c in cols}
+    digests = {c: TDigest() for c in cols}
+    hitters = {c: SpaceSaving() for c in cols if spill.dtypes.get(c) in (None, "str")}
+    row_hashes, hashed, dups = np.empty(0, dtype=np.uint64), 0, 0
+
+    # pass 1: missing/blank, emails, duplicates and the moments for the z-scores
+    for chunk in spill.iter_chunks():
+        if hashed < DUPLICATE_ROWS_MAX:
+            h = pd.util.hash_pandas_object(chunk.iloc[:DUPLICATE_ROWS_MAX - hashed], index=False).to_numpy()
+            hashed += len(h)
+            uniq = np.unique(h)
+            dups += len(h) - len(uniq) + int(np.isin(uniq, row_hashes, assume_unique=True).sum())
+            row_hashes = np.union1d(row_hashes, uniq)
+        for col in cols:
+            st = ColumnStats(chunk[col])
+            missing[col] += st.blanks + st.nulls
+            moments[col].update(st.numeric)
+            digests[col].update(st.numeric)
+            if col in hitters:
+                hitters[col].update(st.s)
+            if col in bad_email:
+                v = st.text[~st.null_mask]
+                bad_email[col] += int((v.ne("") & ~v.str.match(_EMAIL_RE)).sum())
+
+    # pass 2: |z| > 3 against the whole-column mean and std, and the IQR fences
+    sigma = {c: m.std(ddof=0) for c, m in moments.items() if m.n}
+    sigma = {c: s for c, s in sigma.items() if s and np.isfinite(s) and s > 0}
+    fences = {}
+    for col, d in digests.items():
+        if d.n >= 5:
+            q1, q3 = d.quantile(0.25), d.quantile(0.75)
+            if q3 > q1:
+                fences[col] = (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    common = {c: common_values(ss) for c, ss in hitters.items()}
+    common = {c: v for c, v in common.items() if v}
+    outliers, fenced, rare = dict.fromkeys(sigma, 0), dict.fromkeys(fences, 0), dict.fromkeys(common, 0)
+    if sigma or fences or common:
+        for chunk in spill.iter_chunks(columns=list(dict.fromkeys([*sigma, *fences, *common]))):
+            for col in chunk.columns:
+                if col in common:
+                    s = chunk[col]
+                    rare[col] += int((s.notna() & ~s.isin(common[col])).sum())
+                if col not in sigma and col not in fences:
+                    continue
+                x = ColumnStats(chunk[col]).numeric
+                if col in sigma:
+                    outliers[col] += int(((x - moments[col].mean).abs() / sigma[col] > 3).sum())
+                if col in fences:
+                    lo, hi = fences[col]
+                    fenced[col] += int(((x < lo) | (x > hi)).sum())
+
+    findings = []
+    if dups:
+        scope = "" if hashed == len(spill) else f" in the first {hashed:,} rows"
+        findings.append(["(row)", f"{dups} duplicate row(s){scope}", "Deduplicate or add a key", now])
+    for col in cols:
+        if missing[col]:
+            findings.append([col, f"{missing[col]} missing/blank", "Impute, drop or enforce NOT NULL", now])
+    for col, n in outliers.items():
+        if n:
+            findings.append([col, f"{n} numeric outlier(s) |z|>3", "Investigate/clip/winsorize", now])
+    for col, n in fenced.items():
+        if n:
+            lo, hi = fences[col]
+            err = max(digests[col].rank_error(0.25), digests[col].rank_error(0.75))
+            bound = f", quartiles ±{100 * err:.2g} pctl" if err else ""
+            findings.append([col, f"{n} value(s) outside the IQR fences [{lo:g}, {hi:g}]{bound}",
+                             "Investigate/clip/winsorize", now])
+    for col, n in bad_email.items():
+        if n:
+            findings.append([col, f"{n} invalid email(s)", "Validate with regex & cleanse source", now])
+    for col, n in rare.items():
+        if n:
+            findings.append([col, _rare_reason(n, len(common[col])), RARE_RECOMMENDATION, now])
+
+    if not findings:
+        findings = [["(none)", "No anomalies found", "", now]]
+
+    hdr = ["Field", "Reason", "Recommendation", "Detected At"]
+    return hdr, findings
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Profile from mergeable sketches (nothing held but the sketches)
+# ──────────────────────────────────────────────────────────────────────────────
+# A source that is never loaded — a big file, a URI, an S3 prefix — is profiled
+# by folding each batch into one ColumnSketch per column; parts read in
+# parallel are sketched separately and merged. Memory is a few hundred KB per
+# column whatever the row count. Unique counts are HyperLogLog estimates,
+# medians t-digest estimates past a few thousand distinct values; both read "≈".
+
+def sketch_batches(batches, rel_error: float | None = None) -> dict:
+    """{column: ColumnSketch} over every batch (raw text or typed frames)."""
+    sketches = {}
+    for frame in batches:
+        sketch_frame(frame.rename(columns=str), sketches, rel_error)
+    return sketches
+
+def profile_from_sketches(sketches: dict):
+    """The Profile table of {column: ColumnSketch} (see sketch_batches / merge_sketches)."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return list(PROFILE_HEADERS), [_profile_row(sk.metrics(col), now) for col, sk in sketches.items()]
+
+def profile_stream(batches, rel_error: float | None = None):
+    """profile_analysis of a stream of batches without keeping their rows."""
+    return profile_from_sketches(sketch_batches(batches, rel_error))
+
+def profile_parts(parts, workers: int = 4, rel_error: float | None = None):
+    """profile_stream over several batch streams (parts of one source) read side by side, then merged."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        sketched = list(pool.map(partial(sketch_batches, rel_error=rel_error), parts))
+    return profile_from_sketches(merge_sketches(sketched))
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # LLM plumbing
 # ──────────────────────────────────────────────────────────────────────────────
@@ -327,17 +725,23 @@ def _llm_json(defaults: dict, prompt: str, model: str | None = None, timeout=60)
 # AI Catalog & AI Anomalies (with fallbacks)
 # ──────────────────────────────────────────────────────────────────────────────
 
+def _quick_unique(st, approx) -> dict:
+    """{"unique": n}, plus "unique_estimated" when n is a HyperLogLog estimate."""
+    n, mark = st.distinct(approx)
+    return {"unique": int(n), "unique_estimated": True} if mark else {"unique": int(n)}
+
 def ai_catalog_analysis(df: pd.DataFrame, defaults: dict):
     """LLM-backed catalog; falls back to heuristic if the call fails."""
     try:
         preview_rows = min(12, len(df))
         sample = df.head(preview_rows).astype(str).to_dict(orient="records")
+        approx = approx_distinct_mode(defaults)
         schema = []
         for c in df.columns:
-            dtype = str(df[c].dtype)
-            nulls = int(df[c].isna().sum())
-            uniq = int(df[c].nunique(dropna=True))
-            schema.append({"name": c, "dtype": dtype, "nulls": nulls, "unique": uniq})
+            st = column_stats(df, c)
+            schema.append({"name": c, "dtype": str(df[c].dtype), "nulls": st.nulls, **_quick_unique(st, approx),
+                           "pattern": pattern_cell(st.patterns), "semantic_type": st.semantic.kind,
+                           "type_confidence": round(st.semantic.confidence, 2)})
 
         prompt = (
             "You are generating a data catalog for a tabular dataset.\n"
@@ -363,12 +767,15 @@ def ai_catalog_analysis(df: pd.DataFrame, defaults: dict):
                 it.get("description",""),
                 it.get("data_type",""),
                 it.get("nullable",""),
+                # shapes are counted locally, not guessed by the model
+                pattern_cell(column_stats(df, it["field"]).patterns) if it.get("field") in df.columns else "",
                 it.get("example",""),
                 now
             ])
         if not rows:
             raise RuntimeError("Empty AI catalog")
-        hdr = ["Field", "Friendly Name", "Description", "Data Type", "Nullable", "Example", "Analysis Date"]
+        hdr = ["Field", "Friendly Name", "Description", "Data Type", "Nullable", "Pattern", "Example",
+               "Analysis Date"]
         return hdr, rows
 
     except Exception:
@@ -380,14 +787,16 @@ def ai_detect_anomalies(df: pd.DataFrame, defaults: dict):
     try:
         preview_rows = min(30, len(df))
         sample = df.head(preview_rows).astype(str).to_dict(orient="records")
+        approx = approx_distinct_mode(defaults)
         quick = {}
         for c in df.columns:
-            s = df[c]
+            st = column_stats(df, c)
             quick[c] = {
-                "nulls": int(s.isna().sum()),
-                "blanks": int((s.astype(str).str.strip() == "").sum()),
-                "unique": int(s.nunique(dropna=True)),
-                "dtype": str(s.dtype),
+                "nulls": st.nulls,
+                "blanks": st.blanks,
+                **_quick_unique(st, approx),
+                "dtype": str(st.s.dtype),
+                "semantic_type": st.semantic.kind,
             }
 
         prompt = (
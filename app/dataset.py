@@ -0,0 +1,382 @@
+import itertools
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from app.patterns import shape_counts
+from app.semantic import SemanticType, infer_semantic_type
+from app.sketches import SpaceSaving, TDigest, approx_distinct
+
+try:
+    import pyarrow  # noqa: F401  (backs the compact string dtype)
+except ImportError:
+    pyarrow = None
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                  Dataset: one immutable, versioned table                ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# The app holds exactly one Dataset at a time. Loads, tasks and analyses build a
+# new one and swap it in with a single assignment, so a reader (grid, analysis,
+# export) that took a reference keeps a consistent table. Nothing mutates a
+# Dataset's frame in place; derive a new frame (replace_columns) and wrap it.
+
+_versions = itertools.count(1)
+VERSION_ATTR = "dataset_version"    # stamped into frame.attrs so analyzers can find cached stats
+
+
+class Dataset:
+    """A DataFrame (columnar arrays) plus where it came from and a version id.
+
+    *sample* is the sample_frame info dict when the rows are a reservoir sample,
+    *db* is {"dsn", "source", "rows_total"} when they are the head of a database table.
+    *spill* is a SpilledFrame when every row lives on disk; *frame* is then only
+    the first rows (for previews), while len/shape/value/rows page from disk.
+    """
+
+    __slots__ = ("frame", "version", "sample", "db", "spill")
+
+    def __init__(self, frame: pd.DataFrame, sample=None, db=None, spill=None):
+        self.frame = frame
+        self.version = next(_versions)
+        frame.attrs[VERSION_ATTR] = self.version
+        self.sample = sample
+        self.db = db
+        self.spill = spill
+
+    @classmethod
+    def from_rows(cls, headers, rows):
+        """Wrap a (headers, rows) result table, e.g. the output of an analysis."""
+        return cls(pd.DataFrame(list(rows), columns=list(headers), dtype=object))
+
+    @property
+    def columns(self) -> list:
+        return list(self.frame.columns) if self.spill is None else list(self.spill.columns)
+
+    @property
+    def shape(self):
+        return self.frame.shape if self.spill is None else (len(self.spill), len(self.spill.columns))
+
+    def __len__(self):
+        return len(self.frame) if self.spill is None else len(self.spill)
+
+    def __repr__(self):
+        return f"Dataset(v{self.version}, {self.shape[0]} rows x {self.shape[1]} cols)"
+
+    def value(self, row: int, col: int):
+        """Cell value, or None when missing."""
+        v = self.frame.iat[row, col] if self.spill is None else self.spill.value(row, col)
+        return None if _missing(v) else v
+
+    def text(self, row: int, col: int) -> str:
+        v = self.value(row, col)
+        return "" if v is None else str(v)
+
+    def rows(self, start: int = 0, stop: int | None = None) -> list:
+        """Plain Python rows (None for missing) — only for code that needs lists."""
+        if self.spill is None:
+            part = self.frame.iloc[start:stop]
+        else:
+            part = self.spill.slice(start, len(self.spill) if stop is None else stop)
+        return part.astype(object).where(part.notna(), None).values.tolist()
+
+    def semantic_types(self) -> dict:
+        """{column: SemanticType} of the in-memory rows, inferred once per column and version."""
+        return {c: column_stats(self.frame, c).semantic for c in self.frame.columns}
+
+    def with_frame(self, frame: pd.DataFrame) -> "Dataset":
+        """A new version over *frame* that keeps this dataset's provenance.
+
+        The result is an in-memory dataset: a spilled dataset's rows stay on disk
+        only as long as nothing derives a new frame from them.
+        """
+        return Dataset(frame, sample=self.sample, db=self.db)
+
+    def with_columns(self, changes: dict) -> "Dataset":
+        """A new version with *changes* ({column: values}) applied; see replace_columns."""
+        return self.with_frame(replace_columns(self.frame, changes))
+
+
+def replace_columns(frame: pd.DataFrame, changes: dict) -> pd.DataFrame:
+    """Copy-on-write snapshot of *frame* with *changes* ({column: values}) swapped in.
+
+    Whole columns are replaced, never written into, so only the changed columns
+    get new buffers and every other column is shared with *frame*.
+    """
+    out = frame.copy(deep=False)
+    for col, values in changes.items():
+        out[col] = values
+    return out
+
+
+def _missing(v) -> bool:
+    try:
+        return bool(pd.isna(v))
+    except (TypeError, ValueError):
+        return False    # list-like cells
+
+
+EMPTY = Dataset(pd.DataFrame())
+
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                     Compact column storage / memory                     ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+
+CATEGORY_MAX_RATIO = 0.5    # text with distinct/non-null at or below this becomes categorical
+
+
+def _arrow_strings():
+    """Arrow-backed string dtype with NaN for missing (what pandas 3 calls "str")."""
+    if pyarrow is None:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:           # pandas < 2.3 names the NaN-semantics variant differently
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """*df* with smaller column layouts and the same values.
+
+    Low-cardinality text becomes categorical, other text Arrow-backed strings
+    (when pyarrow is installed), integers the narrowest integer type that holds
+    them. Floats, dates, booleans and mixed-type columns are left alone.
+    """
+    arrow = _arrow_strings()
+    changes = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(s):
+            continue
+        if pd.api.types.is_integer_dtype(s):
+            small = pd.to_numeric(s, downcast="integer")
+            if small.dtype.itemsize < s.dtype.itemsize:
+                changes[col] = small
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            vals = s.dropna()
+            if vals.empty or pd.api.types.infer_dtype(vals, skipna=True) != "string":
+                continue
+            if vals.nunique() <= CATEGORY_MAX_RATIO * len(vals):
+                changes[col] = s.astype("category")
+            elif arrow is not None and s.dtype != arrow:
+                changes[col] = s.astype(arrow)
+    return replace_columns(df, changes) if changes else df
+
+
+def memory_report(df: pd.DataFrame):
+    """(headers, rows) of memory use per column, largest first, plus a total row."""
+    usage = df.memory_usage(deep=True, index=False)
+    total = int(usage.sum())
+    rows = [[col, str(df[col].dtype), int(b), round(b / (1 << 20), 2), round(100 * b / total, 1) if total else 0.0]
+            for col, b in usage.sort_values(ascending=False).items()]
+    rows.append(["(total)", f"{len(df):,} rows", total, round(total / (1 << 20), 2), 100.0 if total else 0.0])
+    return ["Field", "Dtype", "Bytes", "Memory (MB)", "Share (%)"], rows
+
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                           Undo / redo history                           ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+
+HISTORY_DEPTH = 10      # undo steps kept; snapshots share unchanged columns
+
+
+class DatasetHistory:
+    """Undo/redo stacks of Dataset versions around the current one."""
+
+    def __init__(self, depth: int = HISTORY_DEPTH):
+        self.depth = depth
+        self.current = None
+        self._undo, self._redo = [], []
+
+    def reset(self, ds: Dataset | None):
+        """Start over from *ds* (a fresh load), dropping both stacks."""
+        self.current = ds
+        self._undo.clear(); self._redo.clear()
+
+    def push(self, ds: Dataset):
+        """Make *ds* current, keeping the previous version for undo."""
+        if self.current is not None:
+            self._undo.append(self.current)
+            del self._undo[:-self.depth]
+        self._redo.clear()
+        self.current = ds
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> Dataset | None:
+        if not self._undo:
+            return None
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self) -> Dataset | None:
+        if not self._redo:
+            return None
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
+
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                        Per-column statistics cache                      ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# Profile, Quality and the anomaly checks all want the same derived views of a
+# column (stripped text, null mask, numeric coercion, ...). column_stats() hands
+# out one ColumnStats per (dataset version, column); each view is computed the
+# first time any analyzer asks for it.
+
+STATS_VERSIONS = 2      # dataset versions whose column stats are kept
+
+_stats = {}             # (version, column) -> ColumnStats
+_stats_lock = threading.Lock()
+
+_LENIENT_NUMBER = r"[-+]?\d*\.?\d+"
+
+
+class ColumnStats:
+    """Derived views of one column, each computed on first use."""
+
+    def __init__(self, s: pd.Series, frame: pd.DataFrame | None = None):
+        self.s = s
+        self.frame = frame      # the frame *s* came from; guards the cache against copies
+        self.metrics = None     # app.analysis.column_metrics result, once computed
+        self.distincts = {}     # distinct_mode(approx) -> (count, mark), once computed
+        self._matches = {}
+        self._digests = {}
+
+    @cached_property
+    def null_mask(self) -> pd.Series:
+        return self.s.isna()
+
+    @cached_property
+    def nulls(self) -> int:
+        return int(self.null_mask.sum())
+
+    @cached_property
+    def raw_text(self) -> pd.Series:
+        return self.s.astype(str)
+
+    @cached_property
+    def text(self) -> pd.Series:
+        """Values as stripped strings (missing values stay missing)."""
+        return self.raw_text.str.strip()
+
+    @cached_property
+    def blanks(self) -> int:
+        if self.is_numeric:
+            return 0        # numbers never print as blank; skip building the text view
+        return int((self.text == "").sum())
+
+    @cached_property
+    def nunique(self) -> int:
+        return int(self.s.nunique(dropna=True))
+
+    def distinct_mode(self, approx=None):
+        """*approx* = (min_rows, rel_error) if this column is long enough to estimate, else None."""
+        return approx if approx and len(self.s) - self.nulls >= approx[0] else None
+
+    def distinct(self, approx=None) -> tuple:
+        """(count, mark) of distinct non-null values.
+
+        Exact (mark "") unless *approx* = (min_rows, rel_error) and the column has
+        at least min_rows values; then a HyperLogLog estimate marked "≈", which
+        needs kilobytes where nunique builds a hash set of every value.
+        """
+        mode = self.distinct_mode(approx)
+        if mode not in self.distincts:
+            self.distincts[mode] = (self.nunique, "") if mode is None else (approx_distinct(self.s, mode[1]), "≈")
+        return self.distincts[mode]
+
+    @cached_property
+    def is_numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(self.s)
+
+    @cached_property
+    def numeric(self) -> pd.Series:
+        return pd.to_numeric(self.s, errors="coerce")
+
+    @cached_property
+    def dates(self) -> pd.Series:
+        return pd.to_datetime(self.s, errors="coerce")
+
+    @cached_property
+    def text_lengths(self) -> pd.Series:
+        """Lengths of the non-null, non-blank stripped values."""
+        t = self.text[~self.null_mask]
+        return t[t != ""].str.len()
+
+    @cached_property
+    def lenient_numeric(self) -> pd.Series:
+        """Floats read the forgiving way: $1,200 / (35) / 12% are numbers, anything else NaN."""
+        t = self.text
+        neg = _flag(t.str.startswith("(") & t.str.endswith(")"))
+        t = t.where(~neg, t.str[1:-1])
+        pct = _flag(t.str.endswith("%"))
+        t = t.str.replace(r"[$,%]", "", regex=True).str.strip()
+        v = pd.to_numeric(t.where(_flag(t.str.fullmatch(_LENIENT_NUMBER))), errors="coerce").astype(float)
+        v = v.where(~neg, -v)
+        return v.where(~pct, v / 100.0)
+
+    def digest(self, view: str) -> TDigest:
+        """Quantile sketch of a numeric view ("numeric", "text_lengths", "lenient_numeric").
+
+        Built in one pass over the view, a block at a time, so no sorted copy of
+        the column is ever made; every percentile any analyzer wants is read from it.
+        """
+        if view not in self._digests:
+            self._digests[view] = TDigest().update(getattr(self, view))
+        return self._digests[view]
+
+    @cached_property
+    def heavy_hitters(self) -> SpaceSaving:
+        """Most frequent non-null values with their counts, from one Space-Saving pass."""
+        return SpaceSaving().update(self.s)
+
+    @cached_property
+    def semantic(self) -> SemanticType:
+        """What the column holds (integer, currency, email, ...), inferred from a sample (app.semantic)."""
+        return infer_semantic_type(self.s)
+
+    @cached_property
+    def patterns(self) -> pd.Series:
+        """Counts of the values' shapes ("AA-9999", see app.patterns), most common first."""
+        return shape_counts(self.s)
+
+    def matches(self, rx) -> int:
+        """Non-null values that re.match *rx* (a quality rule, compiled or not)."""
+        key = getattr(rx, "pattern", rx)
+        if key not in self._matches:
+            self._matches[key] = int(self.raw_text[~self.null_mask].str.match(rx).sum())
+        return self._matches[key]
+
+
+def _flag(mask: pd.Series) -> pd.Series:
+    return mask.fillna(False).astype(bool)
+
+
+def column_stats(df: pd.DataFrame, col) -> ColumnStats:
+    """ColumnStats for df[col], shared with every other caller while *df* is a Dataset's frame."""
+    version = df.attrs.get(VERSION_ATTR)
+    if version is None:
+        return ColumnStats(df[col])
+    key = (version, col)
+    with _stats_lock:
+        st = _stats.get(key)
+        if st is not None and st.frame is df:
+            return st
+        st = _stats[key] = ColumnStats(df[col], df)
+        keep = sorted({v for v, _ in _stats})[-STATS_VERSIONS:]
+        for k in [k for k in _stats if k[0] not in keep]:
+            del _stats[k]
+    return st
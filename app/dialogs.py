@@ -51,7 +51,7 @@ from app.settings import defaults
 # Quality Rule Assignment
 # ──────────────────────────────────────────────────────────────────────────────
 class QualityRuleDialog(wx.Dialog):
-    def __init__(self, parent, fields, current_rules):
+    def __init__(self, parent, fields, current_rules, suggested_rules=None):
         super().__init__(parent, title="Quality Rule Assignment",
                          size=(760, 580),
                          style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
@@ -59,6 +59,9 @@ class QualityRuleDialog(wx.Dialog):
         self.fields = fields
         self.current_rules = current_rules
         self.loaded_rules = {}
+        # {field: regex} read off the column's value shapes, offered next to loaded rules
+        self.suggested_rules = dict(suggested_rules or {})
+        self.suggested = {f"Suggested: {fld}": rx for fld, rx in self.suggested_rules.items()}
 
         # lighter lavender
         BG = wx.Colour(245, 242, 255)
@@ -80,6 +83,7 @@ class QualityRuleDialog(wx.Dialog):
         self.field_list.SetBackgroundColour(INPUT_BG)
         self.field_list.SetForegroundColour(INPUT_TXT)
         self.field_list.SetFont(wx.Font(10, wx.FONTFAMILY_SWISS, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        self.field_list.Bind(wx.EVT_LISTBOX, self.on_pick_field)
         fsz.Add(self.field_list, 1, wx.EXPAND | wx.ALL, 5)
         main.Add(fsz, 1, wx.EXPAND | wx.ALL, 5)
 
@@ -95,6 +99,8 @@ class QualityRuleDialog(wx.Dialog):
         self.rule_choice.SetForegroundColour(INPUT_TXT)
         self.rule_choice.SetFont(wx.Font(10, wx.FONTFAMILY_SWISS, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
         self.rule_choice.Bind(wx.EVT_COMBOBOX, self.on_pick_rule)
+        if self.suggested:
+            self.rule_choice.Append(list(self.suggested))
         g.Add(self.rule_choice, 0, wx.EXPAND)
 
         s2 = wx.StaticText(pnl, label="Or enter regex pattern:")
@@ -165,7 +171,7 @@ class QualityRuleDialog(wx.Dialog):
             data = json.load(open(path, "r", encoding="utf-8"))
             self.loaded_rules = {k: (v if isinstance(v, str) else v.get("pattern", "")) for k, v in data.items()}
             self.rule_choice.Clear()
-            self.rule_choice.Append(list(self.loaded_rules))
+            self.rule_choice.Append(list(self.loaded_rules) + list(self.suggested))
             self.preview.SetValue(json.dumps(data, indent=2))
             wx.MessageBox(f"Loaded {len(self.loaded_rules)} rule(s).", "Rules loaded", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
@@ -175,6 +181,15 @@ class QualityRuleDialog(wx.Dialog):
         name = self.rule_choice.GetValue()
         if name in self.loaded_rules:
             self.pattern_txt.SetValue(self.loaded_rules[name])
+        elif name in self.suggested:
+            self.pattern_txt.SetValue(self.suggested[name])
+
+    def on_pick_field(self, _):
+        # one field picked: offer its suggested rule unless a pattern has been typed in
+        sel = self.field_list.GetSelections()
+        typed = self.pattern_txt.GetValue().strip()
+        if len(sel) == 1 and (not typed or typed in self.suggested_rules.values()):
+            self.pattern_txt.SetValue(self.suggested_rules.get(self.fields[sel[0]], ""))
 
     def on_assign(self, _):
         sel = self.field_list.GetSelections()
@@ -196,6 +211,51 @@ class QualityRuleDialog(wx.Dialog):
         wx.MessageBox(f"Assigned to {len(sel)} field(s).", "Assigned", wx.OK | wx.ICON_INFORMATION)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Database source
+# ──────────────────────────────────────────────────────────────────────────────
+class DatabaseSourceDialog(wx.Dialog):
+    """Connection string + table/query + how many rows to bring into the grid."""
+    def __init__(self, parent):
+        super().__init__(parent, title="Load from Database", size=(620, 380),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        panel = wx.Panel(self)
+        v = wx.BoxSizer(wx.VERTICAL)
+
+        v.Add(wx.StaticText(panel, label="Connection (sqlite:///path.db, a .db/.sqlite file, "
+                                         "postgresql://…, or module:<driver>?key=value&…):"),
+              0, wx.LEFT | wx.RIGHT | wx.TOP, 8)
+        self.dsn = wx.TextCtrl(panel, value=defaults.get("db_last_dsn", ""))
+        v.Add(self.dsn, 0, wx.EXPAND | wx.ALL, 8)
+
+        v.Add(wx.StaticText(panel, label="Table name or SELECT query:"), 0, wx.LEFT | wx.RIGHT, 8)
+        self.source = wx.TextCtrl(panel, value=defaults.get("db_last_source", ""), style=wx.TE_MULTILINE)
+        v.Add(self.source, 1, wx.EXPAND | wx.ALL, 8)
+
+        row = wx.BoxSizer(wx.HORIZONTAL)
+        row.Add(wx.StaticText(panel, label="Rows to load into the grid (0 = all):"), 0,
+                wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 6)
+        try:
+            initial = int(float(defaults.get("db_preview_rows", 100000)))
+        except (TypeError, ValueError):
+            initial = 100000
+        self.rows = wx.SpinCtrl(panel, min=0, max=100_000_000, initial=initial)
+        row.Add(self.rows, 0)
+        v.Add(row, 0, wx.ALL, 8)
+        note = wx.StaticText(panel, label="Profile and Quality always run inside the database over the whole table.")
+        note.SetForegroundColour(wx.Colour(94, 64, 150))
+        v.Add(note, 0, wx.LEFT | wx.RIGHT, 8)
+
+        okc = wx.StdDialogButtonSizer(); ok = wx.Button(panel, wx.ID_OK); ca = wx.Button(panel, wx.ID_CANCEL)
+        okc.AddButton(ok); okc.AddButton(ca); okc.Realize()
+        v.Add(okc, 0, wx.ALIGN_RIGHT | wx.ALL, 8)
+        panel.SetSizer(v)
+
+    def get_params(self):
+        return {"dsn": self.dsn.GetValue().strip(), "source": self.source.GetValue().strip(),
+                "rows": self.rows.GetValue() or None}
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Synthetic Data — polished UI + realistic names
 # ──────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,705 @@
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import lzma
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pa_ipc = pq = None
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Streaming ingest
+# ──────────────────────────────────────────────────────────────────────────────
+
+CHUNK_SIZE = 1 << 20        # bytes pulled from the source per read
+BATCH_ROWS = 50_000         # rows handed to the consumer per batch
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only raw stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks):
+        self._it = iter(chunks)
+        self._buf = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        # fill *b* across chunk boundaries so peek() sees whole magic numbers
+        n = 0
+        while n < len(b):
+            if not self._buf:
+                try:
+                    self._buf = next(self._it)
+                except StopIteration:
+                    break
+                continue
+            k = min(len(b) - n, len(self._buf))
+            b[n:n + k] = self._buf[:k]
+            self._buf = self._buf[k:]
+            n += k
+        return n
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Progress / cancellation
+# ──────────────────────────────────────────────────────────────────────────────
+
+class LoadCancelled(Exception):
+    """Raised inside a reader once its LoadProgress has been cancelled."""
+
+
+class LoadProgress:
+    """Rows and bytes read so far, shared between a loader thread and the UI.
+
+    Readers call add() as data arrives; cancel() from any thread makes the
+    next add()/check() raise LoadCancelled. *on_update(progress)* is called
+    from the loader thread at most every *interval* seconds.
+    """
+
+    def __init__(self, total_bytes=None, on_update=None, interval=0.1):
+        self.rows = 0
+        self.bytes = 0
+        self.total_bytes = total_bytes
+        self.on_update = on_update
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._last = 0.0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise LoadCancelled()
+
+    def fraction(self):
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes / self.total_bytes)
+
+    def add(self, rows: int = 0, nbytes: int = 0):
+        self.check()
+        with self._lock:
+            self.rows += rows
+            self.bytes += nbytes
+            now = time.monotonic()
+            notify = self.on_update and now - self._last >= self.interval
+            if notify:
+                self._last = now
+        if notify:
+            self.on_update(self)
+
+    def count_chunks(self, chunks):
+        for chunk in chunks:
+            self.add(nbytes=len(chunk))
+            yield chunk
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Compression (gzip / bz2 / xz / zstd)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+_EXT_TO_COMPRESSION = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".xz": "xz",
+                       ".zst": "zstd", ".zstd": "zstd"}
+
+
+def detect_compression(head: bytes, name: str = "") -> str | None:
+    """Compression of a stream from its first bytes, else from the file/URI extension."""
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    ext = os.path.splitext(name.split("?", 1)[0])[1].lower()
+    return _EXT_TO_COMPRESSION.get(ext)
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise RuntimeError("Reading or writing .zst data needs the 'zstandard' package")
+
+
+def _decompressed(stream, kind: str):
+    """Decompressing reader over a path (which it then owns) or a binary stream."""
+    if kind == "gzip":
+        return gzip.open(stream, "rb")
+    if kind == "bz2":
+        return bz2.open(stream, "rb")
+    if kind == "xz":
+        return lzma.open(stream, "rb")
+    _require_zstd()
+    if isinstance(stream, str):
+        stream = open(stream, "rb")
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, closefd=True)
+    return io.BufferedReader(reader, CHUNK_SIZE)
+
+
+def compress_bytes(data: bytes, kind: str | None) -> bytes:
+    if not kind or kind == "none":
+        return data
+    if kind == "gzip":
+        return gzip.compress(data)
+    if kind == "bz2":
+        return bz2.compress(data)
+    if kind == "xz":
+        return lzma.compress(data)
+    _require_zstd()
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def compression_for_path(path: str) -> str | None:
+    return _EXT_TO_COMPRESSION.get(os.path.splitext(path)[1].lower())
+
+
+class _Opened:
+    """A stream open_source already returned, passed through it again as is (not re-decoded)."""
+
+    __slots__ = ("stream",)
+
+    def __init__(self, stream):
+        self.stream = stream
+
+
+def open_source(src):
+    """Return a buffered binary stream for a path, file object or iterable of byte chunks.
+
+    Compressed input (by magic bytes or extension) is decoded transparently.
+    """
+    if isinstance(src, _Opened):
+        return src.stream
+    name = src if isinstance(src, str) else getattr(src, "name", "")
+    if isinstance(src, str):
+        stream = open(src, "rb")
+    elif isinstance(src, io.TextIOBase):
+        chunks = (s.encode("utf-8") for s in iter(lambda: src.read(CHUNK_SIZE), ""))
+        stream = io.BufferedReader(_ChunkStream(chunks), CHUNK_SIZE)
+    elif hasattr(src, "peek"):
+        stream = src
+    elif hasattr(src, "read"):
+        stream = io.BufferedReader(_ChunkStream(iter(lambda: src.read(CHUNK_SIZE), b"")), CHUNK_SIZE)
+    else:
+        stream = io.BufferedReader(_ChunkStream(src), CHUNK_SIZE)
+    kind = detect_compression(stream.peek(8)[:8], name if isinstance(name, str) else "")
+    if kind and isinstance(src, str):
+        stream.close()
+        stream = src
+    return _decompressed(stream, kind) if kind else stream
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Columnar formats (Parquet / Arrow IPC a.k.a. Feather v2)
+# ──────────────────────────────────────────────────────────────────────────────
+
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+_EXT_TO_COLUMNAR = {".parquet": "parquet", ".pq": "parquet",
+                    ".feather": "feather", ".arrow": "feather", ".ipc": "feather"}
+
+
+def columnar_format(name: str) -> str | None:
+    """'parquet' / 'feather' from a file name or URI, else None."""
+    ext = os.path.splitext(name.split("?", 1)[0])[1].lower()
+    return _EXT_TO_COLUMNAR.get(ext)
+
+
+def _columnar_magic(head: bytes) -> str | None:
+    if head.startswith(b"PAR1"):
+        return "parquet"
+    if head.startswith(b"ARROW1"):
+        return "feather"
+    return None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet/Feather data needs the 'pyarrow' package")
+
+
+def _columnar_source(src):
+    """Return (format, source): columnar input ready for pyarrow, or (None, src/stream) for CSV."""
+    if isinstance(src, str):
+        fmt = columnar_format(src)
+        if fmt is None:
+            with open(src, "rb") as f:
+                fmt = _columnar_magic(f.read(8))
+        return fmt, src
+    stream = open_source(src)
+    fmt = _columnar_magic(stream.peek(8)[:8])
+    # Parquet keeps its schema in a footer, so streamed input is buffered for random access
+    return (fmt, io.BytesIO(stream.read())) if fmt else (None, _Opened(stream))
+
+
+def _nullable_ints(arrow_type):
+    return pd.Int64Dtype() if pa.types.is_integer(arrow_type) else None
+
+
+def iter_columnar_frames(src, fmt: str, batch_rows: int = BATCH_ROWS, columns=None, progress=None):
+    """Yield typed DataFrame batches from Parquet row groups or Arrow IPC record batches.
+
+    Only *columns* are decoded when given.
+    """
+    _require_pyarrow()
+    if fmt == "parquet":
+        batches = pq.ParquetFile(src).iter_batches(batch_size=batch_rows, columns=columns)
+    else:
+        reader = pa_ipc.open_file(src)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        if columns:
+            batches = (b.select(columns) for b in batches)
+    for batch in batches:
+        for off in range(0, batch.num_rows, batch_rows):
+            part = batch.slice(off, batch_rows)
+            if progress:
+                progress.add(rows=part.num_rows, nbytes=part.nbytes)
+            yield part.to_pandas(types_mapper=_nullable_ints)
+
+
+def _settle_ints(df: pd.DataFrame) -> pd.DataFrame:
+    """Integer columns read as nullable come back as plain int64 when they have no nulls."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.Int64Dtype) and not df[col].isna().any():
+            df[col] = df[col].astype("int64")
+    return df
+
+
+def _arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    """Mixed object columns (grid edits, analysis output) are written as strings."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col]):
+            df[col] = df[col].astype("string")
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def write_columnar(df: pd.DataFrame, dest, fmt: str, compression: str = "zstd"):
+    """Write *df* to a path or binary buffer as Parquet or Feather."""
+    _require_pyarrow()
+    df = _arrow_ready(df)
+    if fmt == "parquet":
+        df.to_parquet(dest, index=False, compression=compression)
+    else:
+        df.to_feather(dest, compression=compression)
+
+
+def columnar_bytes(df: pd.DataFrame, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    write_columnar(df, buf, fmt)
+    return buf.getvalue()
+
+
+def sniff_delimiter(line: str) -> str:
+    return "," if "," in line else "|"
+
+
+def _text_lines(stream, encoding="utf-8"):
+    text = io.TextIOWrapper(stream, encoding=encoding, errors="ignore", newline="")
+    for line in text:
+        if line.strip():
+            return itertools.chain([line], text), line
+    return iter(()), ""
+
+
+def iter_row_batches(src, batch_rows: int = BATCH_ROWS, encoding: str = "utf-8"):
+    """Yield (header, rows) batches from *src* without reading it fully into memory.
+
+    The header is the first non-blank line; the delimiter is sniffed from it the same
+    way detect_and_split_data always has (comma, else pipe).
+    """
+    stream = open_source(src)
+    try:
+        lines, first = _text_lines(stream, encoding)
+        if not first:
+            return
+        reader = csv.reader(lines, delimiter=sniff_delimiter(first))
+        header = next(reader)
+        while True:
+            batch = [r for r in itertools.islice(reader, batch_rows) if r]
+            if not batch:
+                break
+            yield header, batch
+    finally:
+        if isinstance(src, str):
+            stream.close()
+
+
+def read_rows(src, batch_rows: int = BATCH_ROWS):
+    """Return (header, rows) for *src*; ([], []) when there are no data rows."""
+    hdr, data = [], []
+    for header, batch in iter_row_batches(src, batch_rows):
+        hdr = header
+        data.extend(batch)
+    return (hdr, data) if data else ([], [])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Typed columnar ingest
+# ──────────────────────────────────────────────────────────────────────────────
+
+_LEADING_ZERO = r"^[+-]?0\d"
+
+
+def _skip_blank_lines(stream, progress=None):
+    """Return a stream positioned at the first non-blank line, plus that line."""
+    for line in iter(stream.readline, b""):
+        if line.strip():
+            chunks = itertools.chain([line], iter(lambda: stream.read(CHUNK_SIZE), b""))
+            if progress:
+                chunks = progress.count_chunks(chunks)
+            return io.BufferedReader(_ChunkStream(chunks), CHUNK_SIZE), line
+    return None, b""
+
+
+def _blank_to_null(df: pd.DataFrame) -> pd.DataFrame:
+    """Null out whitespace-only strings (the parser already nulls empty cells)."""
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_string_dtype(s) and not pd.api.types.is_object_dtype(s) or (
+                pd.api.types.is_object_dtype(s) and pd.api.types.infer_dtype(s, skipna=True) == "string"):
+            blank = s.str.strip().eq("")
+            if blank.any():
+                df[col] = s.mask(blank)
+    return df
+
+
+def infer_column_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert text columns that are wholly numeric to int/float columns, in place.
+
+    Values with leading zeros (zip codes, account numbers) keep the column as text.
+    """
+    for col in df.columns:
+        s = df[col]
+        if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+            continue
+        vals = s.dropna()
+        if vals.empty:
+            continue
+        num = pd.to_numeric(vals, errors="coerce")
+        if num.isna().any() or vals.astype(str).str.match(_LEADING_ZERO).any():
+            continue
+        num = pd.to_numeric(s)
+        if (num.dropna() % 1 == 0).all() and num.abs().max() < 2 ** 53:
+            num = num.astype("int64" if len(vals) == len(s) else "Int64")
+        df[col] = num
+    return df
+
+
+class ColumnTyper:
+    """infer_column_types for a column that arrives in batches: the decision is
+    updated batch by batch and, like the whole-column rule, ends up numeric
+    only if every value in every batch was a number without leading zeros.
+    """
+
+    __slots__ = ("kind", "integral", "max_abs", "has_null")
+
+    def __init__(self):
+        self.kind = None        # None (no values yet) | "num" | "text" | "native"
+        self.integral = True
+        self.max_abs = 0.0
+        self.has_null = False
+
+    def update(self, s: pd.Series):
+        """Fold in one batch; returns its values as numbers while the column is still numeric."""
+        self.has_null = self.has_null or bool(s.isna().any())
+        if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+            self.kind = "native" if self.kind in (None, "native") else "text"
+            return None
+        if self.kind == "native":
+            self.kind = "text"
+        if self.kind == "text":
+            return None
+        vals = s.dropna()
+        if vals.empty:
+            return None
+        num = pd.to_numeric(vals, errors="coerce")
+        if num.isna().any() or vals.astype(str).str.match(_LEADING_ZERO).any():
+            self.kind = "text"
+            return None
+        self.kind = "num"
+        self.integral = self.integral and bool((num % 1 == 0).all())
+        self.max_abs = max(self.max_abs, float(num.abs().max()))
+        return num
+
+    def merge(self, other: "ColumnTyper"):
+        """Combine with the typer of another part of the same column."""
+        kinds = {self.kind, other.kind} - {None}
+        self.kind = kinds.pop() if len(kinds) == 1 else ("text" if kinds else None)
+        self.integral = self.integral and other.integral
+        self.max_abs = max(self.max_abs, other.max_abs)
+        self.has_null = self.has_null or other.has_null
+        return self
+
+    def dtype(self):
+        """Target dtype once every batch has been seen (None = keep what was stored)."""
+        if self.kind == "num":
+            if self.integral and self.max_abs < 2 ** 53:
+                return "Int64" if self.has_null else "int64"
+            return "float64"
+        return "str" if self.kind == "text" else None
+
+
+def iter_frames(src, batch_rows: int = BATCH_ROWS, encoding: str = "utf-8", columns=None,
+                progress=None):
+    """Yield DataFrame batches parsed by the pandas C reader.
+
+    Cells come back as text with empty/blank cells already null; dtypes are
+    settled once over the whole column by read_frame. Only *columns* are kept
+    when given; *progress* (a LoadProgress) counts the decoded bytes and rows.
+    """
+    stream = open_source(src)
+    try:
+        body, first = _skip_blank_lines(stream, progress)
+        if body is None:
+            return
+        delim = sniff_delimiter(first.decode(encoding, errors="ignore"))
+        with pd.read_csv(body, sep=delim, dtype=str, keep_default_na=False, na_values=[""],
+                         encoding=encoding, encoding_errors="ignore", chunksize=batch_rows,
+                         usecols=columns) as reader:
+            for chunk in reader:
+                if progress:
+                    progress.add(rows=len(chunk))
+                yield _blank_to_null(chunk)
+    finally:
+        if isinstance(src, str):
+            stream.close()
+
+
+def read_frame(src, batch_rows: int = BATCH_ROWS, on_batch=None, columns=None,
+               infer_types: bool = True, progress=None) -> pd.DataFrame:
+    """Return a typed DataFrame for *src*; an empty frame when there are no data rows.
+
+    Delimited text and Parquet/Feather (by extension or magic bytes) are both
+    accepted; *columns* limits the load to those columns. With *infer_types*
+    off, text columns are left as text (for callers that combine several parts).
+    *on_batch(batch, rows_so_far)* is called as each raw batch arrives, so callers
+    can show the first rows while the rest of a download is still in flight.
+    """
+    fmt, src = _columnar_source(src)
+    batches = (iter_columnar_frames(src, fmt, batch_rows, columns, progress) if fmt
+               else iter_frames(src, batch_rows, columns=columns, progress=progress))
+    frames, rows = [], 0
+    for f in batches:
+        if not len(f):
+            continue
+        frames.append(f)
+        rows += len(f)
+        if on_batch:
+            on_batch(f, rows)
+    if not frames:
+        return pd.DataFrame()
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    if fmt:
+        return _settle_ints(df)
+    return infer_column_types(df) if infer_types else df
+
+
+def iter_batches(src, batch_rows: int = BATCH_ROWS, columns=None, progress=None):
+    """Raw batches of *src* in any supported format (text untyped, Parquet/Feather typed)."""
+    fmt, src = _columnar_source(src)
+    if fmt:
+        yield from iter_columnar_frames(src, fmt, batch_rows, columns, progress)
+    else:
+        yield from iter_frames(src, batch_rows, columns=columns, progress=progress)
+
+
+def typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the ingest null/dtype rules to an in-memory frame (synthetic data, MDM output)."""
+    return infer_column_types(_blank_to_null(df.copy()))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parallel parse of large local files
+# ──────────────────────────────────────────────────────────────────────────────
+
+PARALLEL_MIN_BYTES = 64 << 20   # smaller files are not worth the process start-up
+_QUOTE = ord('"')
+
+
+def _quotes(mm, start: int, end: int) -> int:
+    return int(np.count_nonzero(np.frombuffer(mm, np.uint8, end - start, start) == _QUOTE))
+
+
+def split_ranges(mm, start: int, parts: int):
+    """Byte ranges over *mm* from *start* that each begin at a record boundary.
+
+    A cut is moved forward to the next newline that lies outside a quoted field
+    (an even number of quotes before it), so embedded newlines never split a row.
+    """
+    size = len(mm)
+    quoted = mm.find(b'"', start) != -1
+    bounds, pos, parity = [start], start, 0
+    for i in range(1, parts):
+        target = max(start + (size - start) * i // parts, bounds[-1])
+        while True:
+            nl = mm.find(b"\n", target)
+            if nl == -1:
+                break
+            if quoted:
+                parity = (parity + _quotes(mm, pos, nl + 1)) % 2
+                pos = nl + 1
+            if not parity:
+                break
+            target = nl + 1
+        if nl == -1:
+            break
+        if nl + 1 > bounds[-1] and nl + 1 < size:
+            bounds.append(nl + 1)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_range(path, start, end, header, delim, encoding, columns):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        body = io.BytesIO(mm[start:end])
+    df = pd.read_csv(body, sep=delim, header=None, names=header, dtype=str,
+                     keep_default_na=False, na_values=[""], encoding=encoding,
+                     encoding_errors="ignore", usecols=columns)
+    return _blank_to_null(df)
+
+
+def read_frame_parallel(path: str, workers: int | None = None, on_batch=None, columns=None,
+                        min_bytes: int = PARALLEL_MIN_BYTES, encoding: str = "utf-8",
+                        progress=None) -> pd.DataFrame:
+    """read_frame for a large local delimited file, parsed across *workers* processes.
+
+    The file is memory-mapped and cut into newline/quote-aligned ranges; the parsed
+    ranges are joined back in file order. Small, compressed or columnar files go
+    through read_frame unchanged.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if (workers < 2 or size < min_bytes or columnar_format(path) or compression_for_path(path)):
+        return read_frame(path, on_batch=on_batch, columns=columns, progress=progress)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if detect_compression(mm[:8]) or _columnar_magic(mm[:8]):
+            return read_frame(path, on_batch=on_batch, columns=columns, progress=progress)
+        # header = first non-blank line (same rule as iter_frames)
+        pos = 0
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            end = size if nl == -1 else nl + 1
+            if mm[pos:end].strip():
+                break
+            pos = end
+        else:
+            return pd.DataFrame()
+        line = mm[pos:end]
+        if line.count(b'"') % 2:    # a quoted name runs on past this line
+            return read_frame(path, on_batch=on_batch, columns=columns, progress=progress)
+        delim = sniff_delimiter(line.decode(encoding, errors="ignore"))
+        # pandas reads the names as read_frame does: BOM dropped, repeats renamed "a.1"
+        header = list(pd.read_csv(io.BytesIO(line), sep=delim, nrows=0, encoding=encoding,
+                                  encoding_errors="ignore").columns)
+        ranges = split_ranges(mm, end, workers * 4)
+    if not ranges:
+        return pd.DataFrame()
+    frames, rows = [], 0
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        n = len(ranges)
+        parts = pool.map(_parse_range, [path] * n, *zip(*ranges), [header] * n, [delim] * n,
+                         [encoding] * n, [columns] * n)
+        for (start, end), f in zip(ranges, parts):   # map() yields in submission order = file order
+            if progress:
+                progress.add(rows=len(f), nbytes=end - start)
+            if not len(f):
+                continue
+            frames.append(f)
+            rows += len(f)
+            if on_batch:
+                on_batch(f, rows)
+    finally:
+        # on cancel/error, drop ranges that have not started instead of parsing them all
+        pool.shutdown(wait=True, cancel_futures=True)
+    if not frames:
+        return pd.DataFrame()
+    return infer_column_types(pd.concat(frames, ignore_index=True))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reservoir-sampled load
+# ──────────────────────────────────────────────────────────────────────────────
+
+SAMPLE_ROWS = 100_000
+
+
+def sample_frame(batches, n: int = SAMPLE_ROWS, seed=None, on_batch=None):
+    """Uniform sample of *n* rows from a stream of batches, read in a single pass.
+
+    Returns (sample, info). The sample keeps source row order and is typed like
+    read_frame; info holds exact counts for the whole stream: rows_total,
+    sample_rows and per-column non_null.
+    """
+    rng = np.random.default_rng(seed)
+    columns, res, idx = [], None, np.empty(n, dtype=np.int64)
+    seen = filled = 0
+    non_null = {}
+    for f in batches:
+        if not len(f):
+            continue
+        new = [c for c in f.columns if c not in columns]
+        if new:     # parts of a glob/prefix may add columns
+            columns += new
+            block = np.full((n, len(new)), None, dtype=object)
+            res = block if res is None else np.hstack([res, block])
+        for c, k in f.notna().sum().items():
+            non_null[c] = non_null.get(c, 0) + int(k)
+        vals = f.reindex(columns=columns).to_numpy(dtype=object)
+        b = len(vals)
+        take = min(n - filled, b)
+        if take:
+            res[filled:filled + take] = vals[:take]
+            idx[filled:filled + take] = np.arange(seen, seen + take)
+            filled += take
+        if take < b:
+            # Algorithm R, vectorised: row i replaces slot j ~ U[0, i] when j < n
+            rest = np.arange(seen + take, seen + b)
+            j = rng.integers(0, rest + 1)
+            hit = np.nonzero(j < n)[0]
+            if len(hit):
+                slots = j[hit]
+                # a slot hit twice in one batch keeps the later row, as row-by-row would
+                _, last = np.unique(slots[::-1], return_index=True)
+                keep = hit[len(hit) - 1 - last]
+                res[j[keep]] = vals[take + keep]
+                idx[j[keep]] = rest[keep]
+        seen += b
+        if on_batch:
+            on_batch(f, seen)
+    info = {"rows_total": seen, "sample_rows": filled,
+            "non_null": {c: non_null.get(c, 0) for c in columns}}
+    if not filled:
+        return pd.DataFrame(), info
+    order = np.argsort(idx[:filled], kind="stable")
+    df = pd.DataFrame(res[:filled][order], columns=columns)
+    return infer_column_types(_blank_to_null(df)), info
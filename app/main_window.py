@@ -3,6 +3,8 @@
 # Catalog: SLA column, editable & persisted + catalog toolbar
 # Rebranded to Data Buddy — Sidecar Application
 
+import bisect
+import io
 import os
 import re
 import json
@@ -11,6 +13,8 @@ import threading
 import inspect
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 
 import requests
@@ -18,15 +22,33 @@ import wx
 import wx.grid as gridlib
 import pandas as pd
 
-from app.settings import SettingsWindow
-from app.dialogs import QualityRuleDialog, DataBuddyDialog, SyntheticDataDialog
-from app.s3_utils import download_text_from_uri, upload_to_s3
+from app.settings import SettingsWindow, defaults
+from app.dialogs import QualityRuleDialog, DataBuddyDialog, SyntheticDataDialog, DatabaseSourceDialog
+from app.s3_utils import iter_uri_chunks, upload_to_s3
+from app.sources import is_multi_source, expand_source, read_source_frame, iter_source_batches, SOURCE_WORKERS
+from app.sql_source import read_table, count_rows, profile_table, quality_table
+from app.dataset import Dataset, DatasetHistory, EMPTY, column_stats, compact_frame, memory_report
+from app.spill import spill_batches, PREVIEW_ROWS
+from app.patterns import FREE_TEXT, fill_shape, most_common_shape, pattern_cell, shape_counts, suggest_rule
+from app.parallel import COLUMN_WORKERS
+from app.ingest import (read_frame, read_frame_parallel, typed_frame, iter_batches, sample_frame,
+                        LoadProgress, LoadCancelled, compression_for_path, write_columnar, columnar_format,
+                        COMPRESSION_EXTENSIONS, COLUMNAR_EXTENSIONS)
 from app.analysis import (
-    detect_and_split_data,
     profile_analysis,
     quality_analysis,
     catalog_analysis,
     compliance_analysis,
+    profile_chunks,
+    quality_chunks,
+    anomalies_chunks,
+    column_metrics,
+    approx_distinct_mode,
+    profile_stream,
+    profile_parts,
+    top_values_analysis,
+    top_values_chunks,
+    common_values,
 )
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -114,6 +136,16 @@ class KernelManager:
             self.data["state"]["kpis"] = dict(kpi_dict or {})
         self._save()
 
+    def set_memory(self, report_rows):
+        """Per-column memory of the current dataset, as rows from app.dataset.memory_report."""
+        *cols, total = report_rows
+        with self.lock:
+            self.data["state"]["memory"] = {
+                "total_bytes": int(total[2]),
+                "columns": {str(r[0]): {"dtype": r[1], "bytes": int(r[2])} for r in cols},
+            }
+        self._save()
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Custom controls (buttons, badges, pill)
@@ -294,8 +326,10 @@ class MainWindow(wx.Frame):
         self.kernel = KernelManager()
         self.kernel.log("app_started", version=self.kernel.data["kernel_version"])
 
-        self.headers = []
-        self.raw_data = []
+        self.dataset = None         # current Dataset; replaced as a whole, never edited in place
+        self.history = DatasetHistory()
+        self._load_progress = None  # LoadProgress of the background load in flight
+        self._load_title = ""
         self.knowledge_files = []
         self.quality_rules = {}
         self.current_process = ""
@@ -387,7 +421,15 @@ class MainWindow(wx.Frame):
         hz.Add(lab, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 6)
         hz.Add(self.knowledge_lbl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 6)
         hz.AddStretchSpacer()
+        self.sample_lbl = wx.StaticText(info_panel, label="")
+        self.sample_lbl.SetForegroundColour(wx.Colour(176, 64, 32))
+        self.btn_full_pass = RoundedShadowButton(info_panel, "Load Full Dataset", self.on_full_pass,
+                                                 colour=wx.Colour(160, 120, 200))
+        hz.Add(self.sample_lbl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 6)
+        hz.Add(self.btn_full_pass, 0, wx.ALL, 4)
+        self.sample_lbl.Hide(); self.btn_full_pass.Hide()
         info_panel.SetSizer(hz)
+        self.info_panel = info_panel
         main.Add(info_panel, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.TOP, 6)
 
         # Catalog toolbar (hidden unless Catalog is active)
@@ -403,9 +445,25 @@ class MainWindow(wx.Frame):
         self.catalog_toolbar_panel.Hide()
         main.Add(self.catalog_toolbar_panel, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.TOP, 4)
 
+        # Background load strip (hidden unless a load is running)
+        self.load_panel = wx.Panel(self); self.load_panel.SetBackgroundColour(wx.Colour(243, 239, 255))
+        lp = wx.BoxSizer(wx.HORIZONTAL)
+        self.load_lbl = wx.StaticText(self.load_panel, label="")
+        self.load_lbl.SetForegroundColour(wx.Colour(44,31,72))
+        self.load_gauge = wx.Gauge(self.load_panel, range=1000, size=(260, 14))
+        self.btn_cancel_load = RoundedShadowButton(self.load_panel, "Cancel", self.on_cancel_load,
+                                                   colour=wx.Colour(160, 120, 200))
+        lp.Add(self.load_lbl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 6)
+        lp.Add(self.load_gauge, 1, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 6)
+        lp.Add(self.btn_cancel_load, 0, wx.ALL, 4)
+        self.load_panel.SetSizer(lp)
+        self.load_panel.Hide()
+        main.Add(self.load_panel, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.TOP, 4)
+
         # Grid
         grid_panel = wx.Panel(self); grid_panel.SetBackgroundColour(BG)
-        self.grid = gridlib.Grid(grid_panel); self.grid.CreateGrid(0, 0)
+        self.grid = gridlib.Grid(grid_panel)
+        self._grid_table = DatasetTable(EMPTY); self.grid.SetTable(self._grid_table, True)
         self.grid.SetDefaultCellTextColour(wx.Colour(35, 31, 51))
         self.grid.SetDefaultCellBackgroundColour(wx.Colour(255,255,255))
         self.grid.SetLabelTextColour(wx.Colour(60,60,90))
@@ -424,6 +482,21 @@ class MainWindow(wx.Frame):
         m_file = wx.Menu(); m_file.Append(wx.ID_EXIT, "&Quit\tCtrl+Q"); mb.Append(m_file, "&File")
         self.Bind(wx.EVT_MENU, lambda e: self.Close(), id=wx.ID_EXIT)
 
+        # no Ctrl+Z/Ctrl+Y here: text boxes and grid editors keep their own undo keys
+        m_edit = wx.Menu()
+        m_edit.Append(wx.ID_UNDO, "&Undo Dataset Change"); m_edit.Append(wx.ID_REDO, "&Redo Dataset Change")
+        mb.Append(m_edit, "&Edit")
+        self.Bind(wx.EVT_MENU, self.on_undo, id=wx.ID_UNDO)
+        self.Bind(wx.EVT_MENU, self.on_redo, id=wx.ID_REDO)
+        self.Bind(wx.EVT_UPDATE_UI, lambda e: e.Enable(self.history.can_undo), id=wx.ID_UNDO)
+        self.Bind(wx.EVT_UPDATE_UI, lambda e: e.Enable(self.history.can_redo), id=wx.ID_REDO)
+
+        m_view = wx.Menu(); MEMORY_ID = wx.NewIdRef(); TOP_VALUES_ID = wx.NewIdRef()
+        m_view.Append(TOP_VALUES_ID, "Profile: &Top Values")
+        m_view.Append(MEMORY_ID, "&Memory Report"); mb.Append(m_view, "&View")
+        self.Bind(wx.EVT_MENU, lambda e: self.do_analysis_process("Top Values"), id=TOP_VALUES_ID)
+        self.Bind(wx.EVT_MENU, self.on_memory_report, id=MEMORY_ID)
+
         m_settings = wx.Menu(); OPEN_SETTINGS_ID = wx.NewIdRef()
         m_settings.Append(OPEN_SETTINGS_ID, "&Preferences...\tCtrl+,"); mb.Append(m_settings, "&Settings")
         self.Bind(wx.EVT_MENU, self.open_settings, id=OPEN_SETTINGS_ID)
@@ -460,15 +533,21 @@ class MainWindow(wx.Frame):
             pass
 
     # KPI
-    def _reset_kpis_for_new_dataset(self, hdr, data):
+    def _reset_kpis_for_new_dataset(self):
+        ds = self.dataset
+        rows = self.sample_info["rows_total"] if self.sample_info else len(ds)
+        if self.db_source:
+            rows = self.db_source["rows_total"]
+        hdr = ds.columns
         self.metrics.update({
-            "rows": len(data), "cols": len(hdr),
+            "rows": rows, "cols": len(hdr),
             "null_pct": None, "uniqueness": None, "dq_score": None,
             "validity": None, "completeness": None, "anomalies": None,
         })
         self._render_kpis()
-        self.kernel.set_last_dataset(columns=hdr, rows_count=len(data))
-        self.kernel.log("dataset_loaded", rows=len(data), cols=len(hdr))
+        self.kernel.set_last_dataset(columns=hdr, rows_count=rows)
+        self.kernel.log("dataset_loaded", rows=rows, cols=len(hdr), sampled=bool(self.sample_info),
+                        database=bool(self.db_source))
 
     def _render_kpis(self):
         self.card_rows.SetValue(self.metrics["rows"] if self.metrics["rows"] is not None else "—")
@@ -481,21 +560,107 @@ class MainWindow(wx.Frame):
         self.card_anoms.SetValue(str(self.metrics["anomalies"]) if self.metrics["anomalies"] is not None else "—")
         self.kernel.set_kpis(self.metrics)
 
-    # Utils
+    # Current dataset
+    @property
+    def df(self):
+        return self.dataset.frame if self.dataset is not None else None
+
+    @property
+    def sample_info(self):
+        return self.dataset.sample if self.dataset is not None else None
+
+    @property
+    def db_source(self):
+        return self.dataset.db if self.dataset is not None else None
+
+    @property
+    def spill(self):
+        return self.dataset.spill if self.dataset is not None else None
+
+    def _show_dataset(self, ds: Dataset, fresh=True):
+        """Swap *ds* in as the current dataset and show it. UI thread only;
+        workers build the Dataset and hand it over with wx.CallAfter.
+
+        A *fresh* dataset (a load) restarts the undo history; derived ones
+        (synthetic, MDM) are pushed so Undo returns to what they came from.
+        """
+        if fresh:
+            self.history.reset(ds)
+        else:
+            self.history.push(ds)
+        self._swap_in(ds)
+
+    def _swap_in(self, ds: Dataset):
+        self.dataset = ds
+        self._update_sample_banner()
+        self._display(ds); self._reset_kpis_for_new_dataset()
+        self.kernel.set_memory(memory_report(ds.frame)[1])
+
+    @staticmethod
+    def _compacted(df: pd.DataFrame) -> pd.DataFrame:
+        """Loaded data in its compact layout (see app.dataset.compact_frame) unless turned off."""
+        if str(defaults.get("compact_columns", True)).lower() in ("0", "false", "no", "off"):
+            return df
+        return compact_frame(df)
+
+    def on_memory_report(self, _evt=None):
+        if self.dataset is None:
+            wx.MessageBox("Load data first.", "No data", wx.OK | wx.ICON_WARNING); return
+        hdr, rows = memory_report(self.dataset.frame)
+        self.current_process = "Memory"
+        self.grid.EnableEditing(False)
+        self._show_catalog_toolbar(False)
+        self._display(hdr, rows)
+        self.kernel.log("memory_report", total_bytes=rows[-1][2], version=self.dataset.version)
+
+    def on_undo(self, _evt=None):
+        ds = self.history.undo()
+        if ds is not None:
+            self._swap_in(ds)
+            self.kernel.log("dataset_undo", version=ds.version)
+
+    def on_redo(self, _evt=None):
+        ds = self.history.redo()
+        if ds is not None:
+            self._swap_in(ds)
+            self.kernel.log("dataset_redo", version=ds.version)
+
+    def _update_sample_banner(self):
+        info, db, spill = self.sample_info, self.db_source, self.spill
+        if info:
+            self.sample_lbl.SetLabel(f"SAMPLED: {info['sample_rows']:,} of {info['rows_total']:,} rows "
+                                     f"— analysis results are estimates")
+        elif db:
+            self.sample_lbl.SetLabel(f"DATABASE: first {len(self.dataset):,} of {db['rows_total']:,} rows shown "
+                                     f"— Profile/Quality run in the database")
+        elif spill is not None:
+            self.sample_lbl.SetLabel(f"ON DISK: {len(spill):,} rows paged from a local cache "
+                                     f"— Profile/Quality/Anomalies run chunk by chunk")
+        self.sample_lbl.Show(bool(info or db or spill is not None)); self.btn_full_pass.Show(bool(info))
+        self.info_panel.Layout()
+
+    @staticmethod
+    def _column_workers() -> int:
+        """Processes for per-column analyses (app.parallel); 1 when parallel_columns is off."""
+        if str(defaults.get("parallel_columns", True)).lower() in ("0", "false", "no", "off"):
+            return 1
+        return COLUMN_WORKERS
+
     @staticmethod
-    def _as_df(rows, cols):
-        df = pd.DataFrame(rows, columns=cols)
-        return df.map(lambda x: None if (x is None or (isinstance(x, str) and x.strip() == "")) else x)
+    def _distinct_mode():
+        """(min_rows, rel_error) for HyperLogLog unique counts, or None (app.analysis.approx_distinct_mode)."""
+        return approx_distinct_mode(defaults)
 
     def _compute_profile_metrics(self, df: pd.DataFrame):
         total_cells = df.shape[0] * max(1, df.shape[1])
-        nulls = int(df.isna().sum().sum())
+        approx = self._distinct_mode()
+        metrics = [column_metrics(column_stats(df, c), approx=approx) for c in df.columns]
+        nulls = sum(m["nulls"] for m in metrics)
         null_pct = (nulls / total_cells) * 100.0 if total_cells else 0.0
         uniqs = []
-        for c in df.columns:
-            s = df[c].dropna()
-            n = len(s)
-            uniqs.append((s.nunique() / n * 100.0) if n else 0.0)
+        for m in metrics:
+            n = m["total"] - m["nulls"]
+            uniqs.append((m["distinct"] / n * 100.0) if n else 0.0)
         uniq_pct = sum(uniqs) / len(uniqs) if uniqs else 0.0
         return null_pct, uniq_pct
 
@@ -511,16 +676,15 @@ class MainWindow(wx.Frame):
 
     def _compute_quality_metrics(self, df: pd.DataFrame):
         total_cells = df.shape[0] * max(1, df.shape[1])
-        nulls = int(df.isna().sum().sum())
+        nulls = sum(column_metrics(column_stats(df, c))["nulls"] for c in df.columns)
         completeness = (1.0 - (nulls / total_cells)) * 100.0 if total_cells else 0.0
         rules = self._compile_rules()
         checked = 0; valid = 0
         for col, rx in rules.items():
             if col in df.columns:
-                for val in df[col].astype(str):
-                    checked += 1
-                    if rx.fullmatch(val) or rx.search(val):
-                        valid += 1
+                # a full match is also a search hit, so one vectorised search covers both
+                checked += len(df)
+                valid += int(column_stats(df, col).raw_text.str.contains(rx, na=False).sum())
         validity = (valid / checked) * 100.0 if checked else None
         if self.metrics["uniqueness"] is None or self.metrics["null_pct"] is None:
             null_pct, uniq_pct = self._compute_profile_metrics(df)
@@ -561,20 +725,268 @@ class MainWindow(wx.Frame):
                         count=len(self._get_prioritized_knowledge()),
                         files=[os.path.basename(p) for p in self._get_prioritized_knowledge()])
 
-    def _load_text_file(self, path): return open(path, "r", encoding="utf-8", errors="ignore").read()
+    def _load_frame_from_file(self, path, on_batch=None, columns=None, progress=None):
+        try:
+            min_bytes = int(float(defaults.get("parallel_parse_min_mb", 64)) * (1 << 20))
+        except (TypeError, ValueError):
+            min_bytes = 64 << 20
+        return read_frame_parallel(path, on_batch=on_batch, columns=columns, min_bytes=min_bytes,
+                                   progress=progress)
+
+    def _load_source(self, src, on_batch=None, columns=None, progress=None):
+        """Frame for a local file, HTTP/S3 URI, s3://bucket/prefix/ or local glob."""
+        if is_multi_source(src):
+            return read_source_frame(src, on_batch=on_batch, columns=columns, progress=progress)
+        if "://" in src:
+            return read_frame(iter_uri_chunks(src), on_batch=on_batch, columns=columns, progress=progress)
+        return self._load_frame_from_file(src, on_batch, columns, progress)
+
+    @staticmethod
+    def _source_bytes(src):
+        """Size of a plain local file (what LoadProgress counts), else None."""
+        if ("://" in src or is_multi_source(src) or not os.path.isfile(src)
+                or compression_for_path(src) or columnar_format(src)):
+            return None
+        return os.path.getsize(src)
+
+    # Background loads
+    def _start_load(self, title, work, event, total_bytes=None, db=None, on_result=None, **fields):
+        """Run work(progress) -> (df, sample_info) or a Dataset on a worker thread.
+
+        The current dataset stays in place until the load completes, then the new
+        Dataset is swapped in on the UI thread in one step. Cancel abandons the load.
+        With *on_result*, work's result is handed to on_result(result, event, fields)
+        instead and the current dataset is kept.
+        """
+        if self._load_progress is not None:
+            wx.MessageBox("Another load is still running.", title, wx.OK | wx.ICON_INFORMATION); return
+        progress = LoadProgress(total_bytes, on_update=lambda p: wx.CallAfter(self._show_load_progress, p))
+        self._load_progress, self._load_title = progress, title
+        self.load_lbl.SetLabel(f"{title}…"); self.load_gauge.SetValue(0)
+        self.load_panel.Show(); self.Layout()
+
+        def run():
+            try:
+                result = work(progress)
+                if on_result is not None:
+                    wx.CallAfter(self._end_load, progress, (result, event, fields), None, on_result); return
+                if isinstance(result, Dataset):
+                    ds = result
+                else:
+                    df, sample = result
+                    ds = Dataset(self._compacted(df), sample=sample, db=db)
+            except LoadCancelled:
+                wx.CallAfter(self._end_load, progress, None, None); return
+            except Exception as e:
+                wx.CallAfter(self._end_load, progress, None, e); return
+            wx.CallAfter(self._end_load, progress, (ds, event, fields), None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _show_load_progress(self, progress):
+        if progress is not self._load_progress or progress.cancelled:
+            return
+        frac = progress.fraction()
+        if frac is None:
+            self.load_gauge.Pulse()
+        else:
+            self.load_gauge.SetValue(int(frac * 1000))
+        self.load_lbl.SetLabel(f"{self._load_title}: {progress.rows:,} rows · {progress.bytes / 1e6:,.1f} MB")
+
+    def _end_load(self, progress, result, error, on_result=None):
+        if progress is not self._load_progress:
+            return
+        self._load_progress = None
+        self.load_panel.Hide(); self.Layout()
+        if error is not None or result is None:
+            self._drop_preview()
+        if error is not None:
+            wx.MessageBox(f"{self._load_title} failed:\n{error}", "Load", wx.OK | wx.ICON_ERROR)
+            self.kernel.log("load_failed", title=self._load_title, error=str(error)); return
+        if result is None:
+            self.kernel.log("load_cancelled", title=self._load_title, rows=progress.rows); return
+        if on_result is not None:
+            on_result(*result); return
+        ds, event, fields = result
+        self._show_dataset(ds)
+        if ds.sample:
+            fields.update(sample_rows=ds.sample["sample_rows"], rows_total=ds.sample["rows_total"])
+        if ds.db:
+            fields.update(rows_total=ds.db["rows_total"])
+        if ds.spill is not None:
+            fields.update(chunks=ds.spill.n_chunks, disk_bytes=ds.spill.disk_bytes())
+        self.kernel.log(event, rows=len(ds), cols=ds.shape[1], version=ds.version, **fields)
+
+    def on_cancel_load(self, _evt=None):
+        if self._load_progress is not None:
+            self._load_progress.cancel()
+            self.load_lbl.SetLabel(f"{self._load_title}: cancelling…")
+
+    def _first_batch_preview(self):
+        """on_batch callback for worker loads: show the first rows as soon as they parse."""
+        shown = []
+        def preview(batch, _rows):
+            if not shown:
+                shown.append(True)
+                wx.CallAfter(self._display, batch)
+        return preview
+
+    def _drop_preview(self):
+        """Put the current dataset back in the grid after a load that showed a preview and then
+        failed or was cancelled, so exports and edits never see the partial rows."""
+        self._display(self.dataset or EMPTY)
 
     # Upload menu (File or URI/S3)
     def on_upload_menu(self, evt=None):
         menu = wx.Menu()
         from_file = menu.Append(wx.ID_ANY, "From File…")
         from_uri  = menu.Append(wx.ID_ANY, "From URI / S3…")
+        menu.AppendSeparator()
+        smp_file  = menu.Append(wx.ID_ANY, "Sample Large File…")
+        smp_uri   = menu.Append(wx.ID_ANY, "Sample URI / S3…")
+        menu.AppendSeparator()
+        disk_file = menu.Append(wx.ID_ANY, "Open On Disk (File)…")
+        disk_uri  = menu.Append(wx.ID_ANY, "Open On Disk (URI / S3)…")
+        menu.AppendSeparator()
+        prof_file = menu.Append(wx.ID_ANY, "Profile Without Loading (File)…")
+        prof_uri  = menu.Append(wx.ID_ANY, "Profile Without Loading (URI / S3)…")
+        menu.AppendSeparator()
+        from_db   = menu.Append(wx.ID_ANY, "From Database…")
         self.Bind(wx.EVT_MENU, lambda e: self.on_load_file(), from_file)
         self.Bind(wx.EVT_MENU, lambda e: self.on_load_uri(),  from_uri)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_load_db(),   from_db)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_load_sample("file"), smp_file)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_load_sample("uri"),  smp_uri)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_load_on_disk("file"), disk_file)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_load_on_disk("uri"),  disk_uri)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_profile_source("file"), prof_file)
+        self.Bind(wx.EVT_MENU, lambda e: self.on_profile_source("uri"),  prof_uri)
         self.PopupMenu(menu)
         menu.Destroy()
 
+    @staticmethod
+    def _source_batches(src, columns=None, progress=None):
+        """Raw batches of any source _load_source accepts, read in one streaming pass."""
+        if is_multi_source(src):
+            return iter_source_batches(src, columns=columns, progress=progress)
+        return iter_batches(iter_uri_chunks(src) if "://" in src else src, columns=columns,
+                            progress=progress)
+
+    def _sample_source(self, src, rows, on_batch=None, columns=None, progress=None):
+        """(sample, info) from one streaming pass over any source _load_source accepts."""
+        sample, info = sample_frame(self._source_batches(src, columns, progress), rows, on_batch=on_batch)
+        info["source"] = src
+        return sample, info
+
+    def _spill_source(self, src, on_batch=None, columns=None, progress=None) -> Dataset:
+        """Dataset whose rows are spilled to the on-disk chunk cache as *src* streams in."""
+        spill = spill_batches(self._source_batches(src, columns, progress), on_batch=on_batch)
+        return Dataset(self._compacted(spill.head(PREVIEW_ROWS)), spill=spill)
+
+    @staticmethod
+    def _spill_min_bytes(src):
+        """Local files at least spill_min_mb big open on disk; 0 turns that off."""
+        try:
+            min_mb = float(defaults.get("spill_min_mb", 0) or 0)
+        except (TypeError, ValueError):
+            min_mb = 0
+        return min_mb > 0 and os.path.isfile(src) and os.path.getsize(src) >= min_mb * (1 << 20)
+
+    def on_load_on_disk(self, kind="file"):
+        """Open a source too big for memory: rows go to a local chunk cache and are paged in on demand."""
+        if kind == "file":
+            dlg = wx.FileDialog(self, "Open data file on disk", wildcard="Data|*.csv;*.tsv;*.txt;*.gz;*.bz2;*.xz;*.zst;*.parquet;*.feather;*.arrow|All|*.*",
+                                style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        else:
+            dlg = wx.TextEntryDialog(self, "Enter URI, s3://bucket/prefix/ or local glob to open on disk:",
+                                     "Open On Disk (URI / S3)")
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy(); return
+        src = (dlg.GetPath() if kind == "file" else dlg.GetValue()).strip(); dlg.Destroy()
+        if not src:
+            return
+        self._start_load(f"Opening {os.path.basename(src.rstrip('/')) or src} on disk",
+                         lambda p: self._spill_source(src, progress=p),
+                         "load_on_disk", total_bytes=self._source_bytes(src), source=src)
+
+    @staticmethod
+    def _profile_source(src, columns=None, progress=None):
+        """Profile table of any source _load_source accepts, from mergeable column sketches.
+
+        Parts of a prefix/glob are sketched side by side and merged; no rows are kept.
+        """
+        approx = MainWindow._distinct_mode()
+        rel_error = approx[1] if approx else None
+        if not is_multi_source(src):
+            return profile_stream(MainWindow._source_batches(src, columns, progress), rel_error)
+        parts = expand_source(src)
+        if not parts:
+            raise FileNotFoundError(f"No data files match {src}")
+        streams = [iter_batches(iter_uri_chunks(p) if "://" in p else p, columns=columns, progress=progress)
+                   for p in parts]
+        return profile_parts(streams, workers=min(SOURCE_WORKERS, len(parts)), rel_error=rel_error)
+
+    def on_profile_source(self, kind="file"):
+        """Profile a source in one streaming pass without loading it; the current dataset stays."""
+        if kind == "file":
+            dlg = wx.FileDialog(self, "Profile data file", wildcard="Data|*.csv;*.tsv;*.txt;*.gz;*.bz2;*.xz;*.zst;*.parquet;*.feather;*.arrow|All|*.*",
+                                style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        else:
+            dlg = wx.TextEntryDialog(self, "Enter URI, s3://bucket/prefix/ or local glob to profile:",
+                                     "Profile Without Loading (URI / S3)")
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy(); return
+        src = (dlg.GetPath() if kind == "file" else dlg.GetValue()).strip(); dlg.Destroy()
+        if not src:
+            return
+        self._start_load(f"Profiling {os.path.basename(src.rstrip('/')) or src}",
+                         lambda p: self._profile_source(src, progress=p), "profile_source",
+                         total_bytes=self._source_bytes(src), on_result=self._show_source_profile, source=src)
+
+    def _show_source_profile(self, result, event, fields):
+        hdr, data = result
+        self.current_process = "Profile"
+        self._display(hdr, data)
+        self.grid.EnableEditing(False)
+        self._show_catalog_toolbar(False)
+        self.kernel.log(event, fields=len(data), rows=data[0][1] if data else 0, sketched=True, **fields)
+
+    def on_load_sample(self, kind="file"):
+        if kind == "file":
+            dlg = wx.FileDialog(self, "Sample data file", wildcard="Data|*.csv;*.tsv;*.txt;*.gz;*.bz2;*.xz;*.zst;*.parquet;*.feather;*.arrow|All|*.*",
+                                style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        else:
+            dlg = wx.TextEntryDialog(self, "Enter URI, s3://bucket/prefix/ or local glob to sample:",
+                                     "Sample URI / S3")
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy(); return
+        src = (dlg.GetPath() if kind == "file" else dlg.GetValue()).strip(); dlg.Destroy()
+        if not src:
+            return
+        try:
+            default_rows = int(float(defaults.get("sample_rows", 100000)))
+        except (TypeError, ValueError):
+            default_rows = 100000
+        rows = wx.GetNumberFromUser("Rows to keep in the sample (the whole source is still read once "
+                                    "for exact counts):", "Rows", "Sample size",
+                                    default_rows, 100, 50_000_000, self)
+        if rows < 0:
+            return
+        self._start_load(f"Sampling {os.path.basename(src.rstrip('/')) or src}",
+                         lambda p: self._sample_source(src, rows, progress=p),
+                         "load_sample", total_bytes=self._source_bytes(src), source=src)
+
+    def on_full_pass(self, _evt=None):
+        """Replace the current sample with the full source it was drawn from."""
+        if not self.sample_info:
+            return
+        src = self.sample_info["source"]
+        self._start_load("Loading full dataset", lambda p: (self._load_source(src, progress=p), None),
+                         "load_full_pass", total_bytes=self._source_bytes(src), source=src)
+
     def on_load_uri(self, _evt=None):
-        dlg = wx.TextEntryDialog(self, "Enter URI (supports http(s):// and s3:// when configured):",
+        dlg = wx.TextEntryDialog(self, "Enter URI (http(s)://, s3://bucket/key, s3://bucket/prefix/ "
+                                       "or a local glob such as C:\\exports\\*.csv):",
                                  "Load from URI / S3")
         if dlg.ShowModal() != wx.ID_OK:
             dlg.Destroy(); return
@@ -582,37 +994,56 @@ class MainWindow(wx.Frame):
         dlg.Destroy()
         if not uri:
             return
-        try:
-            text = download_text_from_uri(uri)
-            hdr, data = detect_and_split_data(text)
-            self.headers, self.raw_data = hdr, data
-            self._display(hdr, data)
-            self._reset_kpis_for_new_dataset(hdr, data)
-            self.kernel.log("load_uri", uri=uri, rows=len(data), cols=len(hdr))
-        except Exception as e:
-            wx.MessageBox(f"Could not read from URI:\n{e}", "Load URI", wx.OK | wx.ICON_ERROR)
+        self._start_load(f"Loading {uri}", lambda p: (self._load_source(uri, progress=p), None),
+                         "load_uri", total_bytes=self._source_bytes(uri), uri=uri)
+
+    @staticmethod
+    def _load_db(dsn, source, limit=None, on_batch=None, progress=None):
+        """(df, db_info) for the first *limit* rows of a table or query; the full row count comes from SQL."""
+        df = read_table(dsn, source, limit=limit, on_batch=on_batch, progress=progress)
+        return df, {"dsn": dsn, "source": source, "rows_total": count_rows(dsn, source)}
+
+    def on_load_db(self, _evt=None):
+        dlg = DatabaseSourceDialog(self)
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy(); return
+        params = dlg.get_params(); dlg.Destroy()
+        dsn, source, limit = params["dsn"], params["source"], params["rows"]
+        if not dsn or not source:
+            return
+        defaults["db_last_dsn"], defaults["db_last_source"] = dsn, source
+        db = {}
+
+        def work(progress):
+            df, info = self._load_db(dsn, source, limit, progress=progress)
+            db.update(info)
+            return df, None
+
+        self._start_load(f"Loading {source.splitlines()[0][:60]}", work, "load_db",
+                         db=db, source=source, limit=limit)
 
     # local file loader
     def on_load_file(self, _evt=None):
-        dlg = wx.FileDialog(self, "Open data file", wildcard="Data|*.csv;*.tsv;*.txt|All|*.*",
+        dlg = wx.FileDialog(self, "Open data file", wildcard="Data|*.csv;*.tsv;*.txt;*.gz;*.bz2;*.xz;*.zst;*.parquet;*.feather;*.arrow|All|*.*",
                             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
         if dlg.ShowModal() != wx.ID_OK: return
         path = dlg.GetPath(); dlg.Destroy()
-        try:
-            text = self._load_text_file(path)
-            hdr, data = detect_and_split_data(text)
-        except Exception as e:
-            wx.MessageBox(f"Could not read file: {e}", "Error", wx.OK | wx.ICON_ERROR); return
-        self.headers, self.raw_data = hdr, data
-        self._display(hdr, data); self._reset_kpis_for_new_dataset(hdr, data)
-        self.kernel.log("load_file", path=path, rows=len(data), cols=len(hdr))
+        if self._spill_min_bytes(path):
+            self._start_load(f"Opening {os.path.basename(path)} on disk",
+                             lambda p: self._spill_source(path, progress=p),
+                             "load_on_disk", total_bytes=self._source_bytes(path), source=path)
+            return
+        self._start_load(f"Loading {os.path.basename(path)}",
+                         lambda p: (self._load_frame_from_file(path, progress=p), None),
+                         "load_file", total_bytes=self._source_bytes(path), path=path)
 
     def on_rules(self, _evt=None):
-        if not self.headers:
+        if self.dataset is None:
             wx.MessageBox("Load data first so fields are available.", "Quality Rules",
                           wx.OK | wx.ICON.WARNING); return
         try:
-            dlg = QualityRuleDialog(self, list(self.headers), dict(self.quality_rules))
+            dlg = QualityRuleDialog(self, self.dataset.columns, dict(self.quality_rules),
+                                    suggested_rules=self._suggested_rules())
             if dlg.ShowModal() == wx.ID_OK:
                 self.quality_rules = getattr(dlg, "current_rules", self.quality_rules)
                 self.kernel.log("rules_updated", rules=self.quality_rules)
@@ -621,6 +1052,12 @@ class MainWindow(wx.Frame):
             wx.MessageBox(f"Could not open Quality Rule Assignment:\n{e}",
                           "Quality Rules", wx.OK | wx.ICON_ERROR)
 
+    def _suggested_rules(self) -> dict:
+        """{field: regex} for the columns whose values fall into a few shapes (app.patterns.suggest_rule)."""
+        df = self.df
+        rules = {c: suggest_rule(column_stats(df, c).patterns) for c in df.columns}
+        return {c: rx for c, rx in rules.items() if rx}
+
     # Settings & Buddy
     def open_settings(self, _evt=None):
         try:
@@ -653,12 +1090,42 @@ class MainWindow(wx.Frame):
         except Exception as e:
             wx.MessageBox(f"Little Buddy failed to open:\n{e}", "Little Buddy", wx.OK | wx.ICON_ERROR)
 
-    # Synthetic data (unchanged)
+    # Synthetic data
+    @staticmethod
+    def _most_common_format(strings, default_mask="999-999-9999"):
+        """The most common shape of *strings* ("(999) 999-9999"), masked in one vectorized pass."""
+        return most_common_shape(shape_counts(pd.Series(list(strings), dtype=object)), default_mask)
+
     @staticmethod
-    def _most_common_format(strings, default_mask="DDD-DDD-DDDD"):
-        def mask_one(s): return re.sub(r"\d", "D", s)
-        masks = [mask_one(s) for s in strings if isinstance(s, str)]
-        return Counter(masks).most_common(1)[0][0] if masks else default_mask
+    def _sample_shapes(counts: pd.Series, taken=(), integer=False, tries=20):
+        """Picker of fresh, unique values in the column's shapes at their observed rates.
+
+        Values in *taken* (the real ones) and values already picked are drawn
+        again, up to *tries* times, then replaced by the next free number past
+        the largest real one once the shapes have run out of room. With
+        *integer*, all-digit shapes never start with 0 and values are ints.
+        """
+        shapes, weights = list(counts.index), counts.tolist()
+        seen = {str(v) for v in taken}
+        last = max((int(v) for v in seen if v.isdigit()), default=0)
+        def draw(shape):
+            if integer and set(shape) == {"9"} and len(shape) > 1:
+                return str(random.randint(10 ** (len(shape) - 1), 10 ** len(shape) - 1))
+            return fill_shape(shape)
+        def pick(_row=None):
+            nonlocal last
+            for _ in range(tries):
+                v = draw(random.choices(shapes, weights)[0])
+                if v not in seen:
+                    break
+            else:
+                last += 1
+                while str(last) in seen:
+                    last += 1
+                v = str(last)
+            seen.add(v)
+            return int(v) if integer and v.isdigit() else v
+        return pick
 
     @staticmethod
     def _sample_with_weights(values):
@@ -673,6 +1140,22 @@ class MainWindow(wx.Frame):
             return vals[-1]
         return pick
 
+    @staticmethod
+    def _sample_top_values(hitters, values):
+        """Picker drawing the column's heavy hitters at their counted rates and the other *values* for the rest."""
+        if not values: return lambda *_: None
+        top = [(v, c) for v, c, _ in hitters.top(hitters.capacity) if str(v).strip() != ""]
+        held = {v for v, _ in top}
+        others = [v for v in values if v not in held]
+        vals = [v for v, _ in top]; cum = list(accumulate(c for _, c in top))
+        covered = min(cum[-1], len(values)) if cum else 0
+        def pick(_row=None):
+            r = random.random() * len(values)
+            if r < covered or not others:
+                return vals[min(bisect.bisect_right(cum, r), len(vals) - 1)]
+            return random.choice(others)
+        return pick
+
     def _build_generators(self, src_df: pd.DataFrame, fields):
         gens = {}
         # simple realistic name pools
@@ -683,39 +1166,44 @@ class MainWindow(wx.Frame):
         for col in fields:
             lower = col.lower()
             series = src_df[col] if col in src_df.columns else pd.Series([], dtype=object)
-            col_vals = [v for v in series.tolist() if (v is not None and str(v).strip() != "")]
+            col_vals = [v for v in series.dropna().tolist() if str(v).strip() != ""]
             col_strs = [str(v) for v in col_vals]
-            if "email" in lower:
+            st = column_stats(src_df, col) if col in src_df.columns else None
+            hitters = st.heavy_hitters if st else None
+            kind = st.semantic.kind if st else None
+            if "email" in lower or kind == "email":
                 domains = [s.split("@",1)[1].lower() for s in col_strs if "@" in s]
                 dom = self._sample_with_weights(domains or ["gmail.com","yahoo.com","outlook.com","example.com"])
-                pick = self._sample_with_weights(col_vals) if col_vals else None
+                pick = self._sample_top_values(hitters, col_vals) if col_vals else None
                 gens[col] = (lambda _row, p=pick, d=dom: (p() if p and random.random()<0.7 else f"user{random.randint(1000,9999)}@{d()}"))
                 continue
-            if any(k in lower for k in ["phone","mobile","cell","telephone"]):
+            if any(k in lower for k in ["phone","mobile","cell","telephone"]) or kind == "phone":
                 mask = self._most_common_format([s for s in col_strs if re.search(r"\d", s)])
-                gens[col] = lambda _row, m=mask: "".join(str(random.randint(0,9)) if ch=="D" else ch for ch in m); continue
+                gens[col] = lambda _row, m=mask: fill_shape(m); continue
+            tail = re.split(r"[^a-z0-9]+", re.sub(r"([a-z])([A-Z])", r"\1_\2", str(col)).lower())[-1]
+            shapes = st.patterns.drop(FREE_TEXT, errors="ignore") if st else None
+            if tail in ("id", "key", "uuid", "guid") and shapes is not None and len(shapes):
+                # new identifiers in the source's formats, never copies of real ones
+                gens[col] = self._sample_shapes(shapes.head(20), col_strs, kind == "integer"); continue
             if "first" in lower and "name" in lower:
                 gens[col] = lambda _row, pool=first_names: random.choice(pool); continue
             if "last" in lower and "name" in lower:
                 gens[col] = lambda _row, pool=last_names: random.choice(pool); continue
-            if "date" in lower or "dob" in lower:
+            if "date" in lower or "dob" in lower or kind == "date":
                 dmax=datetime.today(); dmin=dmax-timedelta(days=3650); delta=(dmax-dmin).days or 365
                 gens[col]=lambda _row, a=dmin, d=delta: (a+timedelta(days=random.randint(0, max(1,d)))).strftime("%Y-%m-%d"); continue
-            uniq = set(col_vals)
-            if uniq and len(uniq) <= 50:
-                gens[col] = self._sample_with_weights(col_vals); continue
             if col_vals:
-                pick = self._sample_with_weights(col_vals); gens[col]=lambda _r, p=pick: p()
+                pick = self._sample_top_values(hitters, col_vals); gens[col]=lambda _r, p=pick: p()
             else:
                 letters="abcdefghijklmnopqrstuvwxyz"
                 gens[col]=lambda _r: "".join(random.choice(letters) for _ in range(random.randint(5,10)))
         return gens
 
     def on_generate_synth(self, _evt=None):
-        if not self.headers:
+        if self.dataset is None:
             wx.MessageBox("Load data first to choose fields.", "No data", wx.OK | wx.ICON_WARNING)
             return
-        src_df = pd.DataFrame(self.raw_data, columns=self.headers)
+        src_df = self.df
         try:
             dlg = SyntheticDataDialog(self, sample_df=src_df)
         except TypeError:
@@ -727,7 +1215,7 @@ class MainWindow(wx.Frame):
             df = dlg.get_dataframe()
             if df is None or df.empty:
                 n_rows = 100
-                fields = list(self.headers)
+                fields = list(src_df.columns)
                 gens = self._build_generators(src_df, fields)
                 out_rows = []
                 for _ in range(int(n_rows)):
@@ -743,10 +1231,9 @@ class MainWindow(wx.Frame):
             if hasattr(dlg, "Destroy"): dlg.Destroy()
             return
         if hasattr(dlg, "Destroy"): dlg.Destroy()
-        hdr = list(df.columns); data = df.values.tolist()
-        self.headers = hdr; self.raw_data = data
-        self._display(hdr, data); self._reset_kpis_for_new_dataset(hdr, data)
-        self.kernel.log("synthetic_generated", rows=len(data), cols=len(hdr), fields=hdr)
+        ds = Dataset(self._compacted(typed_frame(df)))
+        self._show_dataset(ds, fresh=False)
+        self.kernel.log("synthetic_generated", rows=len(ds), cols=ds.shape[1], fields=ds.columns)
 
     # MDM helpers and action
     @staticmethod
@@ -894,8 +1381,13 @@ class MainWindow(wx.Frame):
             golden.append(merged)
         return pd.DataFrame(golden, columns=all_cols)
 
+    @staticmethod
+    def _mdm_frame(df: pd.DataFrame):
+        # matching works on plain Python values with None for missing cells
+        return df.astype(object).where(df.notna(), None)
+
     def on_mdm(self, _evt=None):
-        if not self.headers:
+        if self.dataset is None:
             wx.MessageBox("Load a base dataset first (or generate synthetic data).",
                           "MDM", wx.OK | wx.ICON_WARNING); return
 
@@ -906,16 +1398,12 @@ class MainWindow(wx.Frame):
 
         dataframes=[]
         if params["include_current"]:
-            dataframes.append(pd.DataFrame(self.raw_data, columns=self.headers))
+            dataframes.append(self._mdm_frame(self.df))
         try:
-            for src in params["sources"]:
-                if src["type"]=="file":
-                    text = self._load_text_file(src["value"])
-                    hdr,data = detect_and_split_data(text)
-                else:
-                    text = download_text_from_uri(src["value"])
-                    hdr,data = detect_and_split_data(text)
-                dataframes.append(pd.DataFrame(data, columns=hdr))
+            # sources are fetched side by side; results keep the order they were added in
+            with ThreadPoolExecutor(max_workers=SOURCE_WORKERS) as pool:
+                for df in pool.map(lambda src: self._load_source(src["value"]), params["sources"]):
+                    dataframes.append(self._mdm_frame(df))
         except Exception as e:
             wx.MessageBox(f"Failed to load a source:\n{e}", "MDM", wx.OK | wx.ICON_ERROR); return
 
@@ -937,12 +1425,11 @@ class MainWindow(wx.Frame):
             wx.MessageBox(f"MDM failed:\n{e}\n\n{traceback.format_exc()}",
                           "MDM", wx.OK | wx.ICON_ERROR); return
 
-        hdr = list(golden.columns); data = golden.astype(str).values.tolist()
-        self.headers, self.raw_data = hdr, data
-        self._display(hdr, data); self._reset_kpis_for_new_dataset(hdr, data)
+        ds = Dataset(self._compacted(typed_frame(golden)))
+        self._show_dataset(ds, fresh=False)
         self.current_process = "MDM"
         self._show_catalog_toolbar(False)
-        self.kernel.log("mdm_completed", golden_rows=len(data), golden_cols=len(hdr), params=params)
+        self.kernel.log("mdm_completed", golden_rows=len(ds), golden_cols=ds.shape[1], params=params)
 
     # Catalog metadata persistence helpers
     def _load_catalog_meta(self):
@@ -1038,15 +1525,39 @@ class MainWindow(wx.Frame):
 
     # Analyses
     def do_analysis_process(self, proc_name: str):
-        if not self.headers:
+        if self.dataset is None:
             wx.MessageBox("Load data first.", "No data", wx.OK | wx.ICON_WARNING); return
 
         self.current_process = proc_name
-        df = self._as_df(self.raw_data, self.headers)
+        df = self.df
 
-        if proc_name == "Profile":
+        if proc_name in ("Profile", "Quality") and self.db_source:
+            hdr, data = self._pushed_analysis(proc_name)
+            if hdr is None:
+                return
+
+        elif proc_name in ("Profile", "Quality", "Detect Anomalies") and self.spill is not None:
+            hdr, data = self._chunked_analysis(proc_name)
+            if hdr is None:
+                return
+
+        elif proc_name == "Top Values":
+            try:
+                with wx.BusyCursor():
+                    if self.spill is not None:
+                        hdr, data = top_values_chunks(self.spill)
+                    else:
+                        hdr, data = top_values_analysis(df)
+            except Exception as e:
+                wx.MessageBox(f"Top Values failed:\n{e}", proc_name, wx.OK | wx.ICON_ERROR); return
+            self.grid.EnableEditing(False)
+            self._show_catalog_toolbar(False)
+            self.kernel.log("run_top_values", columns=len({r[0] for r in data}), rows=len(data),
+                            chunked=self.spill is not None, sampled=bool(self.sample_info))
+
+        elif proc_name == "Profile":
             try:
-                out = profile_analysis(df)
+                out = profile_analysis(df, workers=self._column_workers(), approx=self._distinct_mode())
                 hdr, data = self._coerce_hdr_data(out)
             except Exception:
                 desc = pd.DataFrame({
@@ -1055,17 +1566,19 @@ class MainWindow(wx.Frame):
                     "Unique": [df[c].nunique() for c in df.columns],
                 })
                 hdr, data = list(desc.columns), desc.values.tolist()
+            hdr, data = self._label_sampled(hdr, data)
             null_pct, uniq_pct = self._compute_profile_metrics(df)
             self.metrics["null_pct"] = null_pct
             self.metrics["uniqueness"] = uniq_pct
             self._render_kpis()
             self.grid.EnableEditing(False)
             self._show_catalog_toolbar(False)
-            self.kernel.log("run_profile", null_pct=null_pct, uniqueness=uniq_pct)
+            self.kernel.log("run_profile", null_pct=null_pct, uniqueness=uniq_pct, sampled=bool(self.sample_info))
 
         elif proc_name == "Quality":
             try:
-                out = quality_analysis(df, self.quality_rules)
+                out = quality_analysis(df, self.quality_rules, workers=self._column_workers(),
+                                       approx=self._distinct_mode())
                 hdr, data = self._coerce_hdr_data(out)
             except Exception:
                 now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1082,6 +1595,7 @@ class MainWindow(wx.Frame):
                 hdr = ["Field", "Total", "Completeness (%)", "Unique Values",
                        "Validity (%)", "Quality Score (%)", "Analysis Date"]
                 data = rows
+            hdr, data = self._label_sampled(hdr, data)
             completeness, validity, dq = self._compute_quality_metrics(df)
             self.metrics["completeness"] = completeness
             self.metrics["validity"] = validity
@@ -1089,23 +1603,25 @@ class MainWindow(wx.Frame):
             self._render_kpis()
             self.grid.EnableEditing(False)
             self._show_catalog_toolbar(False)
-            self.kernel.log("run_quality", completeness=completeness, validity=validity, dq_score=dq)
+            self.kernel.log("run_quality", completeness=completeness, validity=validity, dq_score=dq,
+                            sampled=bool(self.sample_info))
 
         elif proc_name == "Detect Anomalies":
             try:
-                work, count = self._detect_anomalies(df)
-                hdr, data = list(work.columns), work.values.tolist()
+                work, count, rank_error = self._detect_anomalies(df)
+                hdr, data = work, None      # _display takes the frame as is
             except Exception:
-                hdr, data = list(df.columns), df.values.tolist(); count = 0
+                hdr, data = self.dataset, None; count = 0; rank_error = None
             self.metrics["anomalies"] = count
             self._render_kpis()
             self.grid.EnableEditing(False)
             self._show_catalog_toolbar(False)
-            self.kernel.log("run_detect_anomalies", anomalies=count)
+            # rank error bound (fraction of rows) of the sketched quartiles/percentiles behind the checks
+            self.kernel.log("run_detect_anomalies", anomalies=count, quantile_error=rank_error)
 
         elif proc_name == "Catalog":
             try:
-                out = catalog_analysis(df)
+                out = catalog_analysis(df, workers=self._column_workers())
                 hdr, data = self._coerce_hdr_data(out)
             except Exception:
                 now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1116,8 +1632,9 @@ class MainWindow(wx.Frame):
                     nullable = "Yes" if df[c].isna().mean() > 0 else "No"
                     friendly = c.replace("_", " ").title()
                     desc = f"{friendly} for each record."
-                    rows.append([c, friendly, desc, dtype, nullable, sample, now])
-                hdr = ["Field", "Friendly Name", "Description", "Data Type", "Nullable", "Example", "Analysis Date"]
+                    rows.append([c, friendly, desc, dtype, nullable, pattern_cell(shape_counts(df[c])), sample, now])
+                hdr = ["Field", "Friendly Name", "Description", "Data Type", "Nullable", "Pattern", "Example",
+                       "Analysis Date"]
                 data = rows
 
             hdr, data = self._apply_catalog_meta_to_table(hdr, data)
@@ -1143,48 +1660,120 @@ class MainWindow(wx.Frame):
 
         self._display(hdr, data)
 
+    def _pushed_analysis(self, proc_name: str):
+        """Profile/Quality over the whole database table, computed by the database."""
+        db = self.db_source
+        try:
+            with wx.BusyCursor():
+                if proc_name == "Profile":
+                    hdr, data = profile_table(db["dsn"], db["source"])
+                else:
+                    hdr, data = quality_table(db["dsn"], db["source"], self._compile_rules())
+        except Exception as e:
+            wx.MessageBox(f"{proc_name} in the database failed:\n{e}", proc_name, wx.OK | wx.ICON_ERROR)
+            return None, None
+        self._kpis_from_table(proc_name, hdr, data, db["rows_total"], pushed=True)
+        return hdr, data
+
+    def _chunked_analysis(self, proc_name: str):
+        """Profile/Quality/Detect Anomalies over every row of an on-disk dataset, a chunk at a time."""
+        spill = self.spill
+        try:
+            with wx.BusyCursor():
+                if proc_name == "Profile":
+                    hdr, data = profile_chunks(spill, self._distinct_mode())
+                elif proc_name == "Quality":
+                    hdr, data = quality_chunks(spill, self._compile_rules(), self._distinct_mode())
+                else:
+                    hdr, data = anomalies_chunks(spill)
+        except Exception as e:
+            wx.MessageBox(f"{proc_name} over the on-disk dataset failed:\n{e}", proc_name,
+                          wx.OK | wx.ICON_ERROR)
+            return None, None
+        if proc_name == "Detect Anomalies":
+            count = sum(1 for r in data if r[0] != "(none)")
+            self.metrics["anomalies"] = count
+            self.kernel.log("run_detect_anomalies", anomalies=count, chunked=True)
+            self._render_kpis()
+            self.grid.EnableEditing(False)
+            self._show_catalog_toolbar(False)
+        else:
+            self._kpis_from_table(proc_name, hdr, data, len(spill), chunked=True)
+        return hdr, data
+
+    @staticmethod
+    def _bound(v) -> float:
+        """A result cell as a number; ">N" lower bounds and "≈N" estimates read as N."""
+        return float(str(v).lstrip(">≈").replace(",", "")) if isinstance(v, str) else float(v)
+
+    def _kpis_from_table(self, proc_name: str, hdr, data, rows_total: int, **log_fields):
+        """Profile/Quality KPIs from a per-field result table computed outside memory (SQL, chunks)."""
+        col = {h: i for i, h in enumerate(hdr)}
+        total_cells = rows_total * max(1, len(data))
+        if proc_name == "Profile":
+            nulls = sum(r[col["Nulls"]] for r in data)
+            uniqs = [self._bound(r[col["Unique"]]) / (r[col["Total"]] - r[col["Nulls"]]) * 100.0
+                     if r[col["Total"]] - r[col["Nulls"]] else 0.0 for r in data]
+            null_pct = nulls / total_cells * 100.0 if total_cells else 0.0
+            uniq_pct = sum(uniqs) / len(uniqs) if uniqs else 0.0
+            self.metrics["null_pct"], self.metrics["uniqueness"] = null_pct, uniq_pct
+            self.kernel.log("run_profile", null_pct=null_pct, uniqueness=uniq_pct, **log_fields)
+        else:
+            completeness = sum(r[col["Completeness (%)"]] for r in data) / len(data) if data else 0.0
+            ruled = [r[col["Validity (%)"]] for r in data if r[col["Field"]] in self.quality_rules]
+            validity = sum(ruled) / len(ruled) if ruled else None
+            if self.metrics["uniqueness"] is None:
+                u = [self._bound(r[col["Uniqueness (%)"]]) for r in data]
+                self.metrics["uniqueness"] = sum(u) / len(u) if u else 0.0
+            components = [self.metrics["uniqueness"], completeness] + ([validity] if validity is not None else [])
+            dq = sum(components) / len(components)
+            self.metrics.update(completeness=completeness, validity=validity, dq_score=dq)
+            self.kernel.log("run_quality", completeness=completeness, validity=validity, dq_score=dq, **log_fields)
+        self._render_kpis()
+        self.grid.EnableEditing(False)
+        self._show_catalog_toolbar(False)
+
+    def _label_sampled(self, hdr, data):
+        """Mark per-field results computed on a sample and add the exact full-source counts."""
+        info = self.sample_info
+        if not info or "Field" not in hdr:
+            return hdr, data
+        hdr = [f"{h} (sample)" if h == "Total" else h for h in hdr]
+        fi = hdr.index("Field")
+        hdr = hdr + ["Rows (exact)", "Non-null (exact)"]
+        data = [list(r) + [info["rows_total"], info["non_null"].get(r[fi], "")] for r in data]
+        return hdr, data
+
     # Robust anomaly detector
     def _detect_anomalies(self, df: pd.DataFrame):
-        work = df.copy()
-
-        def parse_number(x):
-            if x is None: return None
-            s = str(x).strip()
-            if s == "": return None
-            neg = False
-            if s.startswith("(") and s.endswith(")"):
-                neg = True; s = s[1:-1]
-            is_percent = s.endswith("%")
-            s = s.replace("$","").replace(",","").replace("%","").strip()
-            if re.fullmatch(r"[-+]?\d*\.?\d+", s):
-                v = float(s); v = -v if neg else v
-                if is_percent: v = v / 100.0
-                return v
-            return None
+        """(frame with an __anomaly__ column, flagged rows, rank error bound of the percentiles used)."""
+        # shallow copy: only the added __anomaly__ column is new memory
+        work = df.copy(deep=False)
 
         numeric_cols=[]
-        for c in work.columns:
-            col_str = work[c].astype(str)
-            dash_ratio = col_str.str.contains(r"[-()]+").mean()
-            digit_median = col_str.str.findall(r"\d").map(len).median() if len(col_str) else 0
-            phone_like = dash_ratio > 0.5 and digit_median >= 9
-            vals = work[c].map(parse_number)
-            ratio = vals.notna().mean()
-            if ratio >= 0.60 and not phone_like:
-                numeric_cols.append((c, vals.astype(float)))
+        for c in df.columns:
+            st = column_stats(df, c)
+            # the column's cached semantic type decides: phones and codes are no numbers,
+            # $1,200 / (35) / 12% are (read through lenient_numeric)
+            if st.semantic.numeric:
+                numeric_cols.append((c, st.lenient_numeric.astype(float)))
 
         flags = pd.Series(False, index=work.index)
         reasons = [[] for _ in range(len(work))]
         pos_map = {idx: i for i, idx in enumerate(work.index)}
 
+        rank_error = 0.0
         for cname, x in numeric_cols:
             s = x.dropna()
             if s.size < 5: continue
             mu = s.mean(); sd = s.std(ddof=0)
-            q1 = s.quantile(0.25); q3 = s.quantile(0.75); iqr = q3-q1
+            # every percentile comes from the column's one quantile sketch, not a sort per call
+            digest = column_stats(df, cname).digest("lenient_numeric")
+            q1 = digest.quantile(0.25); q3 = digest.quantile(0.75); iqr = q3-q1
             lo = q1 - 1.5*iqr if iqr else None; hi = q3 + 1.5*iqr if iqr else None
-            p01 = s.quantile(0.01) if len(s)>=50 else None
-            p99 = s.quantile(0.99) if len(s)>=50 else None
+            p01 = digest.quantile(0.01) if len(s)>=50 else None
+            p99 = digest.quantile(0.99) if len(s)>=50 else None
+            rank_error = max([rank_error] + [digest.rank_error(q) for q in (0.01, 0.25, 0.75, 0.99)])
             mostly_nonneg = (s.ge(0).mean() >= 0.95)
             mostly_nonzero = (s.ne(0).mean() >= 0.95)
 
@@ -1216,8 +1805,19 @@ class MainWindow(wx.Frame):
                     if bool(zero_hits.get(idx, False)): bits.append("zero")
                     reasons[pos_map[idx]].append(f"{cname} {'/'.join(bits)}")
 
+        # rare values of coded text columns (a handful of values making up nearly every row)
+        numeric_names = {cname for cname, _ in numeric_cols}
+        for c in df.columns:
+            st = column_stats(df, c)
+            common = None if c in numeric_names or st.is_numeric else common_values(st.heavy_hitters)
+            if not common: continue
+            hits = (st.s.notna() & ~st.s.isin(common)).fillna(False)
+            flags = flags | hits
+            for idx in hits[hits].index:
+                reasons[pos_map[idx]].append(f"{c} rare")
+
         work["__anomaly__"] = ["; ".join(r) if r else "" for r in reasons]
-        return work, int(flags.sum())
+        return work, int(flags.sum()), rank_error
 
     # Tasks / export / upload
     def on_run_tasks(self, _evt=None):
@@ -1280,21 +1880,44 @@ class MainWindow(wx.Frame):
                 if act == "loadfile":
                     p = t.get("path") or t.get("file")
                     if not p: raise ValueError("LoadFile requires 'path'")
-                    text = self._load_text_file(p)
-                    self.headers, self.raw_data = detect_and_split_data(text)
-                    wx.CallAfter(self._display, self.headers, self.raw_data)
-                    wx.CallAfter(self._reset_kpis_for_new_dataset, self.headers, self.raw_data)
+                    df = self._load_source(p, self._first_batch_preview(), columns=t.get("columns"))
+                    wx.CallAfter(self._show_dataset, Dataset(self._compacted(df)))
 
                 elif act in ("loads3", "loaduri"):
                     uri = t.get("uri") or t.get("path")
                     if not uri: raise ValueError("LoadS3/LoadURI requires 'uri'")
-                    text = download_text_from_uri(uri)
-                    self.headers, self.raw_data = detect_and_split_data(text)
-                    wx.CallAfter(self._display, self.headers, self.raw_data)
-                    wx.CallAfter(self._reset_kpis_for_new_dataset, self.headers, self.raw_data)
-
-                elif act in ("profile", "quality", "catalog", "compliance", "detectanomalies"):
-                    name = {"detectanomalies": "Detect Anomalies"}.get(act, act.capitalize())
+                    df = self._load_source(uri, self._first_batch_preview(), columns=t.get("columns"))
+                    wx.CallAfter(self._show_dataset, Dataset(self._compacted(df)))
+
+                elif act == "loaddb":
+                    dsn, source = t.get("dsn"), t.get("source") or t.get("table") or t.get("query")
+                    if not dsn or not source: raise ValueError("LoadDB requires 'dsn' and 'source'")
+                    df, db = self._load_db(dsn, source, int(t["rows"]) if t.get("rows") else None,
+                                          self._first_batch_preview())
+                    wx.CallAfter(self._show_dataset, Dataset(self._compacted(df), db=db))
+
+                elif act == "loadondisk":
+                    src = t.get("path") or t.get("uri")
+                    if not src: raise ValueError("LoadOnDisk requires 'path' or 'uri'")
+                    ds = self._spill_source(src, self._first_batch_preview(), columns=t.get("columns"))
+                    wx.CallAfter(self._show_dataset, ds)
+
+                elif act == "profilesource":
+                    src = t.get("path") or t.get("uri")
+                    if not src: raise ValueError("ProfileSource requires 'path' or 'uri'")
+                    out = self._profile_source(src, columns=t.get("columns"))
+                    wx.CallAfter(self._show_source_profile, out, "profile_source", {"source": src})
+
+                elif act == "loadsample":
+                    src = t.get("path") or t.get("uri")
+                    if not src: raise ValueError("LoadSample requires 'path' or 'uri'")
+                    sample, info = self._sample_source(src, int(t.get("rows", defaults.get("sample_rows", 100000))),
+                                                       self._first_batch_preview(), columns=t.get("columns"))
+                    wx.CallAfter(self._show_dataset, Dataset(self._compacted(sample), sample=info))
+
+                elif act in ("profile", "quality", "catalog", "compliance", "detectanomalies", "topvalues"):
+                    name = {"detectanomalies": "Detect Anomalies",
+                            "topvalues": "Top Values"}.get(act, act.capitalize())
                     wx.CallAfter(self.do_analysis_process, name)
 
                 elif act == "exportcsv":
@@ -1307,6 +1930,17 @@ class MainWindow(wx.Frame):
                     if not p: raise ValueError("ExportTXT requires 'path'")
                     wx.CallAfter(self._export_to_path, p, "\t")
 
+                elif act in ("exportparquet", "exportfeather"):
+                    p = t.get("path")
+                    if not p: raise ValueError(f"{t.get('action')} requires 'path'")
+                    fmt = act[len("export"):]
+                    # the format follows the extension in _export_to_path, so it must be this one
+                    if not os.path.splitext(p)[1]:
+                        p += COLUMNAR_EXTENSIONS[fmt]
+                    elif columnar_format(p) != fmt:
+                        raise ValueError(f"{t.get('action')} needs a {COLUMNAR_EXTENSIONS[fmt]} path, not {p!r}")
+                    wx.CallAfter(self._export_to_path, p, ",")
+
                 elif act == "uploads3":
                     wx.CallAfter(self.on_upload_s3, None)
 
@@ -1319,6 +1953,7 @@ class MainWindow(wx.Frame):
 
                 ran += 1
             except Exception as e:
+                wx.CallAfter(self._drop_preview)
                 wx.CallAfter(wx.MessageBox, f"Tasks stopped at step {i}:\n{t}\n\n{e}",
                              "Tasks", wx.OK | wx.ICON_ERROR)
                 self.kernel.log("tasks_failed", step=i, action=t.get("action"), error=str(e))
@@ -1330,11 +1965,18 @@ class MainWindow(wx.Frame):
 
     def _export_to_path(self, path: str, sep: str):
         try:
-            hdr = [self.grid.GetColLabelValue(i) for i in range(self.grid.GetNumberCols())]
-            data = [[self.grid.GetCellValue(r, c) for c in range(len(hdr))]
-                    for r in range(self.grid.GetNumberRows())]
-            pd.DataFrame(data, columns=hdr).to_csv(path, index=False, sep=sep)
-            self.kernel.log("export_to_path", path=path, sep=sep, rows=len(data), cols=len(hdr))
+            ds = self._grid_table.edited()
+            fmt = columnar_format(path)
+            if ds.spill is not None:
+                # stream the on-disk chunks straight to the file
+                with wx.BusyCursor():
+                    ds.spill.write(path, sep)
+            elif fmt:
+                write_columnar(typed_frame(ds.frame), path, fmt)
+            else:
+                # compression (.gz/.bz2/.xz/.zst) follows the file extension
+                ds.frame.to_csv(path, index=False, sep=sep, compression="infer")
+            self.kernel.log("export_to_path", path=path, sep=sep, rows=len(ds), cols=ds.shape[1])
         except Exception as e:
             wx.MessageBox(f"Export failed: {e}", "Export", wx.OK | wx.ICON_ERROR)
 
@@ -1346,6 +1988,14 @@ class MainWindow(wx.Frame):
         menu = wx.Menu()
         m_csv = menu.Append(wx.ID_ANY, "Save as CSV…")
         m_tsv = menu.Append(wx.ID_ANY, "Save as TSV…")
+        m_zip = wx.Menu()
+        for kind in COMPRESSION_EXTENSIONS:
+            item = m_zip.Append(wx.ID_ANY, f"CSV + {kind}…")
+            self.Bind(wx.EVT_MENU, lambda e, k=kind: self._export_save_dialog(',', k), item)
+        menu.AppendSubMenu(m_zip, "Save as compressed CSV")
+        for fmt, ext in COLUMNAR_EXTENSIONS.items():
+            item = menu.Append(wx.ID_ANY, f"Save as {fmt.capitalize()}…")
+            self.Bind(wx.EVT_MENU, lambda e, x=ext: self._export_save_dialog(',', ext=x), item)
         menu.AppendSeparator()
         m_s3  = menu.Append(wx.ID_ANY, "Export to S3…")
         m_uri = menu.Append(wx.ID_ANY, "PUT to URI (HTTP)…")
@@ -1356,16 +2006,26 @@ class MainWindow(wx.Frame):
         self.PopupMenu(menu)
         menu.Destroy()
 
-    def _export_save_dialog(self, sep=','):
-        dlg = wx.FileDialog(self, "Save data",
-                            wildcard="CSV (*.csv)|*.csv|TSV (*.tsv)|*.tsv|All|*.*",
+    def _export_save_dialog(self, sep=',', compression=None, ext=None):
+        if ext:
+            suffix = ext
+            wildcard = f"{ext[1:].capitalize()} (*{ext})|*{ext}|All|*.*"
+        elif compression:
+            suffix = (".csv" if sep == ',' else ".tsv") + COMPRESSION_EXTENSIONS[compression]
+            wildcard = f"Compressed (*{suffix})|*{suffix}|All|*.*"
+        else:
+            wildcard = "CSV (*.csv)|*.csv|TSV (*.tsv)|*.tsv|All|*.*"
+        dlg = wx.FileDialog(self, "Save data", wildcard=wildcard,
                             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
         if dlg.ShowModal() != wx.ID_OK:
             dlg.Destroy(); return
         path = dlg.GetPath(); dlg.Destroy()
-        if sep == ',' and not path.lower().endswith('.csv'):
+        if ext or compression:
+            if not path.lower().endswith(suffix):
+                path += suffix
+        elif sep == ',' and not path.lower().endswith('.csv'):
             path += '.csv'
-        if sep == '\t' and not path.lower().endswith('.tsv'):
+        elif sep == '\t' and not path.lower().endswith('.tsv'):
             path += '.tsv'
         self._export_to_path(path, sep)
 
@@ -1378,29 +2038,38 @@ class MainWindow(wx.Frame):
         dlg.Destroy()
         if not uri:
             return
+        if self._refuse_on_disk("Export"):
+            return
         try:
-            import io
-            hdr = [self.grid.GetColLabelValue(i) for i in range(self.grid.GetNumberCols())]
-            data = [[self.grid.GetCellValue(r, c) for c in range(len(hdr))]
-                    for r in range(self.grid.GetNumberRows())]
+            ds = self._grid_table.edited()
             buf = io.StringIO()
-            pd.DataFrame(data, columns=hdr).to_csv(buf, index=False)
+            ds.frame.to_csv(buf, index=False)
             payload = buf.getvalue().encode('utf-8')
             resp = requests.put(uri, data=payload, headers={'Content-Type':'text/csv'})
             if resp.status_code >= 400:
                 raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
             wx.MessageBox("Exported to URI successfully.", "Export", wx.OK | wx.ICON_INFORMATION)
-            self.kernel.log("export_uri", uri=uri, rows=len(data), cols=len(hdr))
+            self.kernel.log("export_uri", uri=uri, rows=len(ds), cols=ds.shape[1])
         except Exception as e:
             wx.MessageBox(f"Export to URI failed:\n{e}", "Export", wx.OK | wx.ICON_ERROR)
 
+    def _refuse_on_disk(self, title) -> bool:
+        """Uploads build the whole payload in memory; an on-disk dataset is saved to a file instead."""
+        if self._grid_table.dataset.spill is None:
+            return False
+        wx.MessageBox("This dataset is kept on disk because it is too large for memory.\n"
+                      "Save it to a file (CSV, compressed CSV, Parquet or Feather) instead.",
+                      title, wx.OK | wx.ICON_INFORMATION)
+        return True
+
     def on_upload_s3(self, _evt=None):
-        hdr = [self.grid.GetColLabelValue(i) for i in range(self.grid.GetNumberCols())]
-        data = [[self.grid.GetCellValue(r, c) for c in range(len(hdr))] for r in range(self.grid.GetNumberRows())]
+        if self._refuse_on_disk("Upload"):
+            return
+        ds = self._grid_table.edited()
         try:
-            msg = upload_to_s3(self.current_process or "Unknown", hdr, data)
+            msg = upload_to_s3(self.current_process or "Unknown", ds.frame)
             wx.MessageBox(msg, "Upload", wx.OK | wx.ICON_INFORMATION)
-            self.kernel.log("upload_s3", rows=len(data), cols=len(hdr), process=self.current_process or "Unknown")
+            self.kernel.log("upload_s3", rows=len(ds), cols=ds.shape[1], process=self.current_process or "Unknown")
         except Exception as e:
             wx.MessageBox(f"Upload failed: {e}", "Upload", wx.OK | wx.ICON_ERROR)
 
@@ -1432,39 +2101,25 @@ class MainWindow(wx.Frame):
         else:
             evt.Skip()
 
-    def _display(self, hdr, data):
-        # allow pd.DataFrame too
-        if isinstance(hdr, pd.DataFrame):
-            df = hdr; hdr = list(df.columns); data = df.values.tolist()
+    def _display(self, hdr, data=None):
+        """Show a Dataset, a DataFrame or a (headers, rows) result table in the grid."""
         if isinstance(hdr, tuple) and len(hdr) == 2:
             hdr, data = hdr
-
-        self.grid.ClearGrid()
-        if self.grid.GetNumberRows(): self.grid.DeleteRows(0, self.grid.GetNumberRows())
-        if self.grid.GetNumberCols(): self.grid.DeleteCols(0, self.grid.GetNumberCols())
-
-        if not isinstance(hdr, (list, tuple)) or len(hdr) == 0:
+        if isinstance(hdr, pd.DataFrame):
+            hdr = Dataset(hdr)
+        elif isinstance(hdr, (list, tuple)) and len(hdr):
+            hdr = Dataset.from_rows(hdr, data or [])
+        ds = hdr if isinstance(hdr, Dataset) and hdr.shape[1] else None
+
+        # the grid reads cells from the dataset on demand; nothing is copied into it
+        self._grid_table = DatasetTable(ds or EMPTY)
+        self.grid.SetTable(self._grid_table, True)
+        self.grid.ForceRefresh()
+        if ds is None:
             self._render_kpis()
             self._show_catalog_toolbar(False)
             return
 
-        self.grid.AppendCols(len(hdr))
-        for i, h in enumerate(hdr): self.grid.SetColLabelValue(i, str(h))
-        self.grid.AppendRows(len(data))
-
-        try: anom_idx = hdr.index("__anomaly__")
-        except ValueError: anom_idx = -1
-
-        for r, row in enumerate(data):
-            row_has_anom = False
-            if anom_idx >= 0 and anom_idx < len(row):
-                row_has_anom = bool(str(row[anom_idx]).strip())
-            for c, val in enumerate(row):
-                self.grid.SetCellValue(r, c, "" if val is None else str(val))
-                base = wx.Colour(255,255,255) if r%2==0 else wx.Colour(248,246,255)
-                if row_has_anom: base = wx.Colour(255,235,238)
-                self.grid.SetCellBackgroundColour(r, c, base)
-
         self.adjust_grid(); self._render_kpis()
         self.grid.EnableEditing(self.current_process == "Catalog")
 
@@ -1480,6 +2135,66 @@ class MainWindow(wx.Frame):
         event.Skip(); wx.CallAfter(self.adjust_grid)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Virtual grid table over a Dataset
+# ──────────────────────────────────────────────────────────────────────────────
+
+class DatasetTable(gridlib.GridTableBase):
+    """Serves grid cells straight from a Dataset's columns, only for rows on screen.
+
+    Cells typed into the grid (Catalog edits) are kept in *edits*; the Dataset
+    itself is never written to.
+    """
+    def __init__(self, dataset: Dataset):
+        super().__init__()
+        self.dataset = dataset
+        self.edits = {}
+        cols = dataset.columns
+        self.anom_col = cols.index("__anomaly__") if "__anomaly__" in cols else -1
+        self.attrs = {}
+        for key, colour in (("even", wx.Colour(255,255,255)), ("odd", wx.Colour(248,246,255)),
+                            ("anomaly", wx.Colour(255,235,238))):
+            attr = gridlib.GridCellAttr(); attr.SetBackgroundColour(colour)
+            self.attrs[key] = attr
+
+    def GetNumberRows(self):
+        return len(self.dataset)
+
+    def GetNumberCols(self):
+        return self.dataset.shape[1]
+
+    def GetColLabelValue(self, col):
+        return str(self.dataset.columns[col])
+
+    def IsEmptyCell(self, row, col):
+        return self.GetValue(row, col) == ""
+
+    def GetValue(self, row, col):
+        if (row, col) in self.edits:
+            return self.edits[(row, col)]
+        return self.dataset.text(row, col)
+
+    def SetValue(self, row, col, value):
+        self.edits[(row, col)] = value
+
+    def GetAttr(self, row, col, kind):
+        if self.anom_col >= 0 and self.dataset.text(row, self.anom_col).strip():
+            attr = self.attrs["anomaly"]
+        else:
+            attr = self.attrs["even" if row % 2 == 0 else "odd"]
+        attr.IncRef()
+        return attr
+
+    def edited(self) -> Dataset:
+        """The table as shown, including cells edited in the grid (on-disk datasets are read-only)."""
+        if not self.edits or self.dataset.spill is not None:
+            return self.dataset
+        frame = self.dataset.frame.astype(object)
+        for (r, c), v in self.edits.items():
+            frame.iat[r, c] = v
+        return self.dataset.with_frame(frame)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # MDM dialog used above (kept here to keep file self-contained)
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1535,7 +2250,7 @@ class MDMDialog(wx.Dialog):
         btn_rm.Bind(wx.EVT_BUTTON, self._on_rm)
 
     def _on_add_file(self, _):
-        dlg = wx.FileDialog(self, "Select data file", wildcard="Data|*.csv;*.tsv;*.txt|All|*.*",
+        dlg = wx.FileDialog(self, "Select data file", wildcard="Data|*.csv;*.tsv;*.txt;*.gz;*.bz2;*.xz;*.zst;*.parquet;*.feather;*.arrow|All|*.*",
                             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST | wx.FD_MULTIPLE)
         if dlg.ShowModal() != wx.ID_OK:
             return
@@ -1545,7 +2260,8 @@ class MDMDialog(wx.Dialog):
         dlg.Destroy()
 
     def _on_add_uri(self, _):
-        with wx.TextEntryDialog(self, "Enter HTTP/HTTPS/S3 URI:", "Add URI/S3") as d:
+        with wx.TextEntryDialog(self, "Enter HTTP/HTTPS/S3 URI, s3://bucket/prefix/ or a local glob:",
+                                "Add URI/S3") as d:
             if d.ShowModal() != wx.ID_OK:
                 return
             uri = d.GetValue().strip()
@@ -0,0 +1,169 @@
+import heapq
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                Column-parallel analysis for wide tables                 ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# Per-column analyzers are independent across columns, so a wide table is cut
+# into batches of columns with about equal work and each batch runs in its own
+# process. The frame is written once, uncompressed, as an Arrow file that every
+# worker memory-maps and reads only its columns from; what gets pickled is the
+# file path, the batch's column positions and the per-column results.
+
+COLUMN_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_COLUMNS = 32       # narrower tables are analyzed in-process
+PARALLEL_MIN_CELLS = 2_000_000  # as are small ones; process start-up costs more than it saves
+BATCHES_PER_WORKER = 2          # a few batches per worker evens out cost estimates that are off
+TEXT_COST = 4                   # text columns cost about this many numeric ones per row
+
+
+def column_costs(df: pd.DataFrame) -> list:
+    """Relative analysis cost of each column: rows, weighted up for text."""
+    n = max(1, len(df))
+    return [n if pd.api.types.is_numeric_dtype(dt) or pd.api.types.is_bool_dtype(dt) else n * TEXT_COST
+            for dt in df.dtypes]
+
+
+def balanced_batches(costs: list, parts: int) -> list:
+    """Column positions split into at most *parts* batches of about equal total cost.
+
+    Longest-processing-time first: the dearest column goes to the lightest batch.
+    Each batch keeps its positions in table order.
+    """
+    bins = [(0, i, []) for i in range(max(1, parts))]
+    heapq.heapify(bins)
+    for pos in sorted(range(len(costs)), key=lambda p: -costs[p]):
+        load, i, cols = heapq.heappop(bins)
+        cols.append(pos)
+        heapq.heappush(bins, (load + costs[pos], i, cols))
+    return [sorted(cols) for _, _, cols in sorted(bins, key=lambda b: b[1]) if cols]
+
+
+def _shareable(s: pd.Series) -> bool:
+    """Whether a column survives the Arrow round trip unchanged (mixed-type objects do not)."""
+    if not pd.api.types.is_object_dtype(s):
+        return True
+    return pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+
+
+def _run_batch(path: str, positions: list, names: list, fn):
+    table = feather.read_table(path, columns=[f"c{p}" for p in positions], memory_map=True)
+    frame = table.to_pandas()
+    frame.columns = names
+    del table
+    return fn(frame)
+
+
+def map_columns(df: pd.DataFrame, fn, workers: int | None = None,
+                min_columns: int = PARALLEL_MIN_COLUMNS, min_cells: int = PARALLEL_MIN_CELLS) -> list:
+    """fn(frame) -> [one result per column of frame], run over *df* in column batches.
+
+    Returns the results in df's column order. With *workers* < 2, a small or
+    narrow table, or without pyarrow, this is simply fn(df). *fn* must be
+    picklable (a module-level function or a functools.partial of one). Columns
+    of mixed Python objects are analyzed in this process, as they would not
+    come back from Arrow as the same values.
+    """
+    workers = COLUMN_WORKERS if workers is None else workers
+    ncols = df.shape[1]
+    if (workers < 2 or feather is None or ncols < max(2, min_columns)
+            or len(df) * ncols < min_cells):
+        return fn(df)
+    local = [p for p in range(ncols) if not _shareable(df.iloc[:, p])]
+    shared = sorted(set(range(ncols)) - set(local))
+    if len(shared) < 2:
+        return fn(df)
+
+    costs = column_costs(df)
+    batches = balanced_batches([costs[p] for p in shared], min(len(shared), workers * BATCHES_PER_WORKER))
+    batches = [[shared[i] for i in b] for b in batches]
+    names = list(df.columns)
+    fd, path = tempfile.mkstemp(prefix="sidecar-cols-", suffix=".arrow")
+    os.close(fd)
+    results = [None] * ncols
+    pool = None
+    try:
+        sub = df.iloc[:, shared].copy(deep=False)
+        sub.columns = [f"c{p}" for p in shared]
+        feather.write_feather(sub, path, compression="uncompressed")
+        del sub
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(batches)))
+        futures = [pool.submit(_run_batch, path, b, [names[p] for p in b], fn) for b in batches]
+        if local:       # runs here while the workers are busy
+            for p, r in zip(local, fn(df.iloc[:, local])):
+                results[p] = r
+        for b, fut in zip(batches, futures):
+            for p, r in zip(b, fut.result()):
+                results[p] = r
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return results
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Serial vs parallel benchmark:  python -m app.parallel [rows] [columns] [workers]
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _wide_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """A CDC-like wide table: a mix of ints, floats with gaps, codes and free text."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["alpha", "beta", "gamma", "delta", "epsilon", "", "n/a", "zeta eta", "theta"])
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"id_{i}"] = rng.integers(0, rows, rows)
+        elif kind == 1:
+            v = rng.normal(100, 15, rows)
+            v[rng.random(rows) < 0.05] = np.nan
+            data[f"amount_{i}"] = v
+        elif kind == 2:
+            data[f"code_{i}"] = pd.Series(rng.integers(0, 500, rows)).map("C{:04d}".format).astype(str)
+        else:
+            data[f"note_{i}"] = pd.Series(words[rng.integers(0, len(words), rows)]).astype(str)
+    return pd.DataFrame(data)
+
+
+def benchmark(df: pd.DataFrame, workers: int | None = None):
+    """(headers, rows) of wall-clock seconds for Profile/Quality/Catalog, serial vs column-parallel."""
+    from app.analysis import profile_analysis, quality_analysis, catalog_analysis
+    workers = workers or COLUMN_WORKERS
+    runs = [("Profile", profile_analysis), ("Quality", quality_analysis), ("Catalog", catalog_analysis)]
+    rows = []
+    for name, fn in runs:
+        timings = []
+        for w in (1, workers):
+            frame = df.copy(deep=False)     # no version attr: nothing cached between runs
+            t0 = time.perf_counter()
+            fn(frame, workers=w)
+            timings.append(time.perf_counter() - t0)
+        rows.append([name, df.shape[0], df.shape[1], workers, round(timings[0], 2), round(timings[1], 2),
+                     round(timings[0] / timings[1], 2) if timings[1] else None])
+    return ["Analysis", "Rows", "Columns", "Workers", "Serial (s)", "Parallel (s)", "Speed-up"], rows
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    rows, cols, workers = (args + [50_000, 400, COLUMN_WORKERS][len(args):])[:3]
+    hdr, out = benchmark(_wide_frame(rows, cols), workers)
+    print(" | ".join(hdr))
+    for r in out:
+        print(" | ".join(str(v) for v in r))
@@ -0,0 +1,147 @@
+import itertools
+import random
+import string
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║               Value shapes: character-class masks per column            ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# A value's shape maps ASCII upper-case letters to "A", lower-case letters to
+# "a" and digits to "9" and keeps every other character, so "AB-1234" and
+# "(415) 555-0100" read as "AA-9999" and "(999) 999-9999". A column is masked
+# with one byte lookup over its Arrow string buffer (non-ASCII characters are
+# bytes >= 0x80 in UTF-8 and pass through unchanged) and its shapes counted in
+# the same pass. The counts feed the Catalog "Pattern", the quality rule
+# suggestions and the synthetic phone/ID generators.
+
+SHAPE_MAX = 40              # longer values are free text and counted under FREE_TEXT
+FREE_TEXT = "…"
+PATTERN_LIST = 3            # shapes named in a Catalog "Pattern" cell
+PATTERN_MIN_SHARE = 0.05    # shapes rarer than this are left out of it ("Free text" if all are)
+RULE_SHAPES = 3             # shapes one suggested quality rule may combine
+RULE_COVERAGE = 0.95        # share of the values a suggested rule must accept
+
+_LUT = np.arange(256, dtype=np.uint8)
+_LUT[ord("A"):ord("Z") + 1] = ord("A")
+_LUT[ord("a"):ord("z") + 1] = ord("a")
+_LUT[ord("0"):ord("9") + 1] = ord("9")
+_CLASSES = {"A": "[A-Z]", "a": "[a-z]", "9": r"\d"}
+_FILL = {"A": string.ascii_uppercase, "a": string.ascii_lowercase, "9": string.digits}
+_SPECIAL = set(".^$*+?{}[]\\|()")
+
+
+def _text(s: pd.Series) -> pd.Series:
+    """Values as strings, missing where *s* is (as ColumnStats.raw_text prints them)."""
+    return s.astype(str).where(s.notna())
+
+
+def _masked(s: pd.Series):
+    """Arrow array of the shapes of *s* (pyarrow installed)."""
+    a = pa.array(_text(s), type=pa.large_string(), from_pandas=True)
+    validity, offsets, data = a.buffers()
+    if data is None:        # no characters at all (every value missing or empty)
+        return a
+    masked = pa.py_buffer(_LUT[np.frombuffer(data, dtype=np.uint8)])
+    return pa.Array.from_buffers(pa.large_string(), len(a), [validity, offsets, masked],
+                                 null_count=a.null_count, offset=a.offset)
+
+
+def _masked_pandas(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    for rx, ch in (("[A-Z]", "A"), ("[a-z]", "a"), ("[0-9]", "9")):
+        t = t.str.replace(rx, ch, regex=True)
+    return t
+
+
+def shapes(s: pd.Series) -> pd.Series:
+    """Shape of every value of *s*, aligned with it (missing where *s* is)."""
+    if pa is None:
+        return _masked_pandas(s)
+    return pd.Series(_masked(s).to_numpy(zero_copy_only=False), index=s.index)
+
+
+def shape_counts(s: pd.Series) -> pd.Series:
+    """How many non-null, non-blank values of *s* have each shape, most common first."""
+    if pa is None:
+        t = _masked_pandas(s).dropna()
+        counts = t.where(t.str.len() <= SHAPE_MAX, FREE_TEXT).value_counts()
+    else:
+        a = _masked(s).drop_null()
+        if not len(a):
+            return pd.Series(dtype="int64")
+        vc = pc.value_counts(pc.if_else(pc.greater(pc.utf8_length(a), SHAPE_MAX), FREE_TEXT, a))
+        counts = pd.Series(vc.field("counts").to_numpy(), index=vc.field("values").to_pylist())
+    counts = counts[[bool(shape.strip()) for shape in counts.index]]     # blank values have no shape
+    return counts.sort_values(ascending=False, kind="stable")
+
+
+def collapse(counts: pd.Series) -> pd.Series:
+    """Shape counts with each run of one class merged ("AAA-9999" and "A-99" are both "A-9")."""
+    if counts.empty:
+        return counts
+    idx = pd.Series(counts.index.astype(str), index=counts.index)
+    for ch in _CLASSES:
+        idx = idx.str.replace(f"{ch}+", ch, regex=True)
+    return counts.groupby(idx.to_numpy()).sum().sort_values(ascending=False, kind="stable")
+
+
+def shape_regex(shape: str, collapsed: bool = False) -> str:
+    """Regex matching the values of *shape*; with *collapsed*, each class letter stands for a run."""
+    parts = []
+    for ch, run in itertools.groupby(shape):
+        n = len(list(run))
+        if ch in _CLASSES:
+            parts.append(_CLASSES[ch] + ("+" if collapsed else f"{{{n}}}" if n > 1 else ""))
+        else:
+            parts.append(("\\" + ch if ch in _SPECIAL else ch) * n)
+    return "".join(parts)
+
+
+def pattern_cell(counts: pd.Series) -> str:
+    """Catalog "Pattern": the common shapes with their shares, e.g. "999-999-9999 (82%), AAA (12%)"."""
+    total = counts.sum()
+    if not total:
+        return ""
+    top = [(shape, n) for shape, n in counts.head(PATTERN_LIST).items()
+           if shape != FREE_TEXT and n >= PATTERN_MIN_SHARE * total]
+    if not top:
+        return "Free text"
+    return ", ".join(f"{shape} ({100 * n / total:.0f}%)" for shape, n in top)
+
+
+def suggest_rule(counts: pd.Series) -> str | None:
+    """A regex accepting RULE_COVERAGE of the values, from at most RULE_SHAPES shapes, or None.
+
+    Exact shapes are tried first (fixed lengths), then collapsed ones (runs of
+    any length), so "AB-1234" suggests ^[A-Z]{2}-\\d{4}$ while names of mixed
+    lengths suggest ^[A-Z][a-z]+$.
+    """
+    total = counts.sum()
+    if not total:
+        return None
+    for shape_set, collapsed in ((counts, False), (collapse(counts), True)):
+        top = shape_set.drop(FREE_TEXT, errors="ignore").head(RULE_SHAPES)
+        if top.sum() >= RULE_COVERAGE * total:
+            alts = [shape_regex(shape, collapsed) for shape in top.index]
+            return f"^{alts[0]}$" if len(alts) == 1 else f"^(?:{'|'.join(alts)})$"
+    return None
+
+
+def most_common_shape(counts: pd.Series, default: str | None = None):
+    """The most common shape other than FREE_TEXT, else *default*."""
+    counts = counts.drop(FREE_TEXT, errors="ignore")
+    return counts.index[0] if len(counts) else default
+
+
+def fill_shape(shape: str, rng=random) -> str:
+    """A random value of *shape*: each 9 a digit, each A/a an upper/lower-case letter."""
+    return "".join(rng.choice(_FILL[ch]) if ch in _FILL else ch for ch in shape)
@@ -2,12 +2,20 @@ import boto3
 import requests
 import io
 import csv
+import fnmatch
 import os
+import threading
 import urllib3
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from botocore import UNSIGNED
 from botocore.config import Config
 from app.settings import defaults
+from app.uri_cache import get_cache
+from app.ingest import (COMPRESSION_EXTENSIONS, COLUMNAR_EXTENSIONS, compress_bytes,
+                        columnar_bytes, typed_frame)
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -16,51 +24,219 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # ║                          S3 Utility Functions                          ║
 # ╚═════════════════════════════════════════════════════════════════════════╝
 
+S3_POOL_CONNECTIONS = 32  # per client; covers ranged GETs and prefix fetches
+S3_MAX_ATTEMPTS = 5
+
+_clients = {}               # (key id, secret, token, region, anonymous) -> client
+_clients_lock = threading.Lock()
+_bucket_modes = {}          # bucket -> "signed" | "anonymous" | "https" (last mode that worked)
+
+def get_s3_client(anonymous: bool = False, settings: dict | None = None):
+    """Return a shared boto3 S3 client for the given credentials, building it once.
+
+    *settings* is any mapping with the aws_* keys (defaults to app.settings.defaults),
+    so the legacy scripts can pass their own config dicts.
+    """
+    cfg = defaults if settings is None else settings
+    region = cfg.get("aws_s3_region") or None
+    creds = () if anonymous else (
+        cfg.get("aws_access_key_id") or None,
+        cfg.get("aws_secret_access_key") or None,
+        cfg.get("aws_session_token") or None,
+    )
+    pool_key = (creds, region, anonymous)
+    with _clients_lock:
+        client = _clients.get(pool_key)
+        if client is None:
+            config = Config(max_pool_connections=S3_POOL_CONNECTIONS,
+                            retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": "adaptive"})
+            if anonymous:
+                config = config.merge(Config(signature_version=UNSIGNED))
+                session = boto3.session.Session(region_name=region)
+            else:
+                session = boto3.session.Session(
+                    aws_access_key_id=creds[0],
+                    aws_secret_access_key=creds[1],
+                    aws_session_token=creds[2],
+                    region_name=region,
+                )
+            client = _clients[pool_key] = session.client("s3", config=config)
+    return client
+
 def _make_s3_client(anonymous: bool = False):
     """Return a boto3 S3 client, optionally using anonymous access."""
-    if anonymous:
-        return boto3.client("s3", config=Config(signature_version=UNSIGNED))
-    return boto3.Session(
-        aws_access_key_id=defaults.get("aws_access_key_id") or None,
-        aws_secret_access_key=defaults.get("aws_secret_access_key") or None,
-        aws_session_token=defaults.get("aws_session_token") or None,
-        region_name=defaults.get("aws_s3_region") or None,
-    ).client("s3")
-
-def download_text_from_uri(uri: str) -> str:
-    """Download and return the contents of a text file from S3 or HTTP(S) URI."""
-    if uri.startswith("s3://"):
-        _, rest = uri.split("s3://", 1)
-        bucket, key = rest.split("/", 1)
-        for anonymous in (False, True):
-            try:
-                obj = _make_s3_client(anonymous).get_object(Bucket=bucket, Key=key)
-                return obj["Body"].read().decode()
-            except Exception:
-                if anonymous:
-                    region = defaults.get("aws_s3_region", "us-east-1")
-                    url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
-                    r = requests.get(url, verify=False, timeout=60)
-                    r.raise_for_status()
-                    return r.text
+    return get_s3_client(anonymous)
+
+def _access_modes(bucket: str):
+    """Access modes to try for *bucket*, the one that last worked first."""
+    modes = ["signed", "anonymous", "https"]
+    known = _bucket_modes.get(bucket)
+    if known in modes:
+        modes.remove(known)
+        modes.insert(0, known)
+    return modes
+
+PART_SIZE = 8 << 20        # bytes per ranged GET / streamed HTTP chunk
+PARTS_IN_FLIGHT = 4        # concurrent ranged GETs (peak memory ≈ PART_SIZE × this)
+
+def _split_s3_uri(uri: str):
+    _, rest = uri.split("s3://", 1)
+    bucket, key = rest.split("/", 1)
+    return bucket, key
+
+def _get_range(client, bucket: str, key: str, start: int, end: int) -> bytes:
+    obj = client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")
+    return obj["Body"].read()
+
+def _iter_s3_parts(client, bucket: str, key: str, size: int, part_size: int):
+    """Yield an object's bytes in order, fetching up to PARTS_IN_FLIGHT ranges ahead."""
+    offsets = iter(range(0, size, part_size))
+    with ThreadPoolExecutor(max_workers=PARTS_IN_FLIGHT) as pool:
+        def submit(off):
+            return pool.submit(_get_range, client, bucket, key, off, min(off + part_size, size) - 1)
+        pending = deque(submit(off) for _, off in zip(range(PARTS_IN_FLIGHT), offsets))
+        while pending:
+            part = pending.popleft().result()
+            nxt = next(offsets, None)
+            if nxt is not None:
+                pending.append(submit(nxt))
+            yield part
+
+def _iter_http(url: str, chunk_size: int, cache=None, cache_key: str | None = None):
+    cache_key = cache_key or url
+    headers = cache.validators(cache_key) if cache else {}
+    with requests.get(url, verify=False, timeout=60, stream=True, headers=headers) as r:
+        if cache and r.status_code == 304:
+            yield from cache.read(cache_key, chunk_size)
+            return
+        r.raise_for_status()
+        chunks = r.iter_content(chunk_size)
+        if cache:
+            chunks = cache.store(cache_key, chunks, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        yield from chunks
+
+def _https_reachable(url: str) -> bool:
+    try:
+        return requests.head(url, verify=False, timeout=30).ok
+    except Exception:
+        return False
+
+def _https_url(bucket: str, key: str, settings: dict | None = None) -> str:
+    region = (defaults if settings is None else settings).get("aws_s3_region") or "us-east-1"
+    return f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
+
+def _remembered(bucket: str, mode: str, chunks):
+    """Yield *chunks*, recording *mode* as the bucket's working one once it has returned data."""
+    for chunk in chunks:
+        _bucket_modes[bucket] = mode
+        yield chunk
+    _bucket_modes[bucket] = mode
+
+def iter_uri_chunks(uri: str, chunk_size: int = PART_SIZE, settings: dict | None = None,
+                    use_cache: bool = True):
+    """Yield the bytes of an S3 or HTTP(S) object chunk by chunk, in order.
+
+    For S3 the signed client, the anonymous client and the public HTTPS URL are
+    tried in turn, starting with whichever last worked for the bucket. Unchanged
+    objects (same ETag / Last-Modified) are served from the local URI cache.
+    """
+    cache = get_cache() if use_cache else None
+    if not uri.startswith("s3://"):
+        yield from _iter_http(uri, chunk_size, cache)
+        return
+    bucket, key = _split_s3_uri(uri)
+    modes = _access_modes(bucket)
+    last_error = None
+    for mode in modes:
+        if mode == "https":
+            url = _https_url(bucket, key, settings)
+            if mode != modes[-1] and not _https_reachable(url):
                 continue
-    # Handle HTTP(S) fallback
-    r = requests.get(uri, verify=False, timeout=60)
-    r.raise_for_status()
-    return r.text
-
-def upload_to_s3(process: str, headers, data) -> str:
-    """Upload a CSV to the appropriate S3 bucket for the given process."""
-    bucket = defaults.get(f"aws_{process.lower()}_bucket", "").strip()
+            yield from _remembered(bucket, mode, _iter_http(url, chunk_size, cache, cache_key=uri))
+            return
+        try:
+            client = get_s3_client(mode == "anonymous", settings)
+            head = client.head_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            last_error = e
+            continue
+        etag = head.get("ETag")
+        modified = str(head["LastModified"]) if head.get("LastModified") else None
+        if cache and cache.is_fresh(uri, etag, modified):
+            yield from _remembered(bucket, mode, cache.read(uri, chunk_size))
+            return
+        parts = _iter_s3_parts(client, bucket, key, head["ContentLength"], chunk_size)
+        if cache:
+            parts = cache.store(uri, parts, etag, modified)
+        yield from _remembered(bucket, mode, parts)
+        return
+    raise RuntimeError(f"Could not read {uri} ({', '.join(modes)} all failed): {last_error}")
+
+def list_s3_uris(uri: str, settings: dict | None = None) -> list:
+    """Object URIs under s3://bucket/prefix, following every page of the listing.
+
+    Glob characters in the key (s3://bucket/exports/part-*.csv) are matched
+    against the full key; only the part before the first one is sent as prefix.
+    """
+    bucket, key = _split_s3_uri(uri if uri.count("/") > 2 else uri + "/")
+    cut = min((key.find(c) for c in "*?[" if c in key), default=-1)
+    prefix, pattern = (key[:cut], key) if cut != -1 else (key, None)
+    last_error = None
+    for mode in _access_modes(bucket):
+        if mode == "https":
+            continue
+        try:
+            pages = get_s3_client(mode == "anonymous", settings).get_paginator("list_objects_v2")
+            keys = [o["Key"] for page in pages.paginate(Bucket=bucket, Prefix=prefix)
+                    for o in page.get("Contents", [])]
+        except Exception as e:
+            last_error = e
+            continue
+        _bucket_modes[bucket] = mode
+        if pattern:
+            keys = [k for k in keys if fnmatch.fnmatchcase(k, pattern)]
+        return [f"s3://{bucket}/{k}" for k in sorted(keys)]
+    raise RuntimeError(f"Could not list s3://{bucket}/{prefix}: {last_error}")
+
+def download_text_from_uri(uri: str, settings: dict | None = None) -> str:
+    """Download and return the contents of a text file from S3 or HTTP(S) URI."""
+    return b"".join(iter_uri_chunks(uri, settings=settings)).decode()
+
+def upload_to_s3(process: str, headers, data=None, settings: dict | None = None) -> str:
+    """Upload a table to the appropriate S3 bucket for the given process.
+
+    *headers* may also be a DataFrame (with *data* omitted). aws_upload_format
+    picks CSV (compressed per aws_upload_compression), Parquet or Feather; the
+    key gets the matching extension.
+    """
+    cfg = defaults if settings is None else settings
+    bucket = cfg.get(f"aws_{process.lower()}_bucket", "").strip()
     if not bucket:
         return f"No bucket configured for {process}"
 
-    buf = io.StringIO()
-    csv.writer(buf).writerows([headers, *data])
-    key = f"{process}_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    fmt = (cfg.get("aws_upload_format") or "csv").strip().lower()
+    stamp = f"{process}_{datetime.now():%Y%m%d_%H%M%S}"
+    frame = headers if isinstance(headers, pd.DataFrame) else None
 
     try:
-        _make_s3_client().put_object(Bucket=bucket, Key=key, Body=buf.getvalue())
+        if fmt in COLUMNAR_EXTENSIONS:
+            key = stamp + COLUMNAR_EXTENSIONS[fmt]
+            if frame is None:
+                frame = pd.DataFrame(data, columns=headers)
+            body = columnar_bytes(typed_frame(frame), fmt)
+            content_type = "application/octet-stream"
+        else:
+            buf = io.StringIO()
+            if frame is not None:
+                frame.to_csv(buf, index=False)
+            else:
+                csv.writer(buf).writerows([headers, *data])
+            compression = (cfg.get("aws_upload_compression") or "none").strip().lower()
+            key = f"{stamp}.csv{COMPRESSION_EXTENSIONS.get(compression, '')}"
+            body = compress_bytes(buf.getvalue().encode("utf-8"), compression)
+            content_type = "text/csv"
+        get_s3_client(settings=settings).put_object(Bucket=bucket, Key=key, Body=body,
+                                                    ContentType=content_type)
         return f"Uploaded to s3://{bucket}/{key}"
     except Exception as e:
         return f"S3 upload failed: {e}"
@@ -0,0 +1,168 @@
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║            Semantic types: what a column holds, from a sample           ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# infer_semantic_type reads at most INFER_SAMPLE values spread over a column
+# and classifies it as one of SEMANTIC_TYPES with a confidence (the share of
+# the sampled values that fit). The sample is checked INFER_BLOCK values at a
+# time: a type drops out once its match rate surely misses INFER_MIN_MATCH, and
+# inference stops as soon as the most specific remaining type surely reaches
+# it (95% Wilson bounds), so a clean column is settled from its first block.
+# ColumnStats.semantic caches the result per dataset version for every analyzer.
+
+SEMANTIC_TYPES = ("integer", "decimal", "currency", "percent", "date", "email", "phone", "boolean",
+                  "categorical", "text")
+NUMERIC_TYPES = ("integer", "decimal", "currency", "percent")
+INFER_SAMPLE = 2_000        # values examined per column at most
+INFER_BLOCK = 200           # values checked before deciding whether the answer is certain
+INFER_MIN_MATCH = 0.95      # share of the values a type must fit
+CATEGORICAL_MAX = 50        # distinct sampled values a categorical column may have ...
+CATEGORICAL_RATIO = 0.5     # ... and at most this share of the values sampled
+_Z = 1.96                   # 95% confidence
+
+BOOLEAN_WORDS = frozenset({"true", "false", "yes", "no", "y", "n", "t", "f", "0", "1"})
+_PHONE_NAMES = ("phone", "mobile", "cell", "tel", "telephone", "fax")
+
+# most specific first: the first type that fits wins ("1" is boolean before integer)
+_PATTERNS = {
+    "boolean": None,
+    # no leading zeros: zip codes and padded IDs stay text, as ingest types them
+    "integer": re.compile(r"[-+]?(?:0|[1-9]\d*)"),
+    "decimal": re.compile(r"[-+]?(?:0|[1-9]\d*|\d{1,3}(?:,\d{3})+)?(?:\.\d+)?(?:[eE][-+]?\d+)?"),
+    "percent": re.compile(r"[-+]?\d*\.?\d+\s?%"),
+    "currency": re.compile(r"\(?[-+]?(?:[$€£¥]|[A-Z]{3} )\s?\d[\d,]*(?:\.\d+)?\)?"
+                           r"|[-+]?\d[\d,]*(?:\.\d+)?\s?(?:[€£]|[A-Z]{3})"),
+    "date": re.compile(r"\d{4}-\d{1,2}-\d{1,2}(?:[T ]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+                       r"|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}(?: \d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?)?"
+                       r"|\d{4}/\d{1,2}/\d{1,2}|[A-Za-z]{3,9}\.? \d{1,2},? \d{4}|\d{1,2} [A-Za-z]{3,9}\.? \d{4}"),
+    "email": re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+"),
+    "phone": re.compile(r"\+?\d{0,3}[\s.-]?\(?\d{2,4}\)?[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?:\s?(?:x|ext\.?)\s?\d{1,5})?"),
+}
+
+CATALOG_TYPES = {"integer": "Numeric", "decimal": "Numeric", "currency": "Numeric", "percent": "Numeric",
+                 "date": "Date", "boolean": "Boolean", "categorical": "Categorical",
+                 "email": "Text", "phone": "Text", "text": "Text"}
+
+
+class SemanticType:
+    """A column's inferred type: *kind* (one of SEMANTIC_TYPES), *confidence* (0-1), values *sampled*."""
+
+    __slots__ = ("kind", "confidence", "sampled")
+
+    def __init__(self, kind: str, confidence: float, sampled: int):
+        self.kind, self.confidence, self.sampled = kind, confidence, sampled
+
+    def __repr__(self):
+        return f"SemanticType({self.kind!r}, {self.confidence:.2f}, sampled={self.sampled})"
+
+    @property
+    def numeric(self) -> bool:
+        return self.kind in NUMERIC_TYPES
+
+    @property
+    def catalog_type(self) -> str:
+        """The Catalog "Data Type" (Text/Numeric/Date/Boolean/Categorical), detailed where it helps."""
+        base = CATALOG_TYPES[self.kind]
+        return f"{base} ({self.kind})" if self.kind in ("currency", "percent", "email", "phone") else base
+
+
+def fits(text: pd.Series, kind: str) -> pd.Series:
+    """Which stripped, non-null strings are values of *kind* (a type with a format check)."""
+    if kind == "boolean":
+        return text.str.lower().isin(BOOLEAN_WORDS)
+    ok = text.str.fullmatch(_PATTERNS[kind]).fillna(False).astype(bool)
+    if kind == "decimal":       # every part of the pattern is optional; "." and "" are no numbers
+        ok &= text.str.contains(r"\d", regex=True).fillna(False).astype(bool)
+    elif kind == "date" and ok.any():      # "13/45/2020" has the shape but is no date
+        ok[ok] = pd.to_datetime(text[ok], errors="coerce", format="mixed").notna()
+    return ok
+
+
+def _wilson(hits: int, n: int):
+    """95% Wilson score interval of a match rate of hits/n."""
+    p, z2 = hits / n, _Z * _Z
+    mid, half = p + z2 / (2 * n), _Z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+    return (mid - half) / (1 + z2 / n), (mid + half) / (1 + z2 / n)
+
+
+def _sample(s: pd.Series) -> pd.Series:
+    """Up to INFER_SAMPLE non-null values spread evenly over *s*, in a fixed shuffled order.
+
+    The shuffle puts values from all over the column into every block, so a
+    column sorted by type (numbers first, text last) is not settled by its head.
+    """
+    pos = np.unique(np.linspace(0, len(s) - 1, min(len(s), 4 * INFER_SAMPLE)).astype(np.int64))
+    v = s.iloc[pos].dropna()
+    if len(v) > INFER_SAMPLE:
+        v = v.iloc[np.unique(np.linspace(0, len(v) - 1, INFER_SAMPLE).astype(np.int64))]
+    return v.iloc[np.random.default_rng(0).permutation(len(v))]
+
+
+def _phone_name(name) -> bool:
+    tokens = re.split(r"[^a-z0-9]+", str(name).lower())
+    return any(t in _PHONE_NAMES for t in tokens)
+
+
+def _digits_like_phone(text: pd.Series) -> bool:
+    return bool(text.str.len().between(7, 15).mean() >= INFER_MIN_MATCH)
+
+
+def _native(s: pd.Series, name):
+    """The type of a column with a non-text dtype, or None for text columns."""
+    if pd.api.types.is_bool_dtype(s):
+        return SemanticType("boolean", 1.0, 0)
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return SemanticType("date", 1.0, 0)
+    if not pd.api.types.is_numeric_dtype(s):
+        return None
+    v = _sample(s)
+    if v.empty:
+        return SemanticType("integer" if pd.api.types.is_integer_dtype(s) else "decimal", 0.0, 0)
+    if v.isin([0, 1]).all():
+        return SemanticType("boolean", 1.0, len(v))
+    if pd.api.types.is_integer_dtype(s) or bool((v % 1 == 0).all()):
+        kind = "phone" if name is not None and _phone_name(name) and _digits_like_phone(v.astype(str)) else "integer"
+        return SemanticType(kind, 1.0, len(v))
+    return SemanticType("decimal", 1.0, len(v))
+
+
+def infer_semantic_type(s: pd.Series, name=None) -> SemanticType:
+    """Classify the values of *s* (see the section notes); *name* only tells phones from plain integers."""
+    name = s.name if name is None else name
+    native = _native(s, name)
+    if native is not None:
+        return native
+    text = _sample(s).astype(str).str.strip()
+    text = text[text != ""]
+    if text.empty:
+        return SemanticType("text", 0.0, 0)
+
+    alive, hits, seen = list(_PATTERNS), dict.fromkeys(_PATTERNS, 0), 0
+    for start in range(0, len(text), INFER_BLOCK):
+        block = text.iloc[start:start + INFER_BLOCK]
+        seen += len(block)
+        for kind in list(alive):
+            hits[kind] += int(fits(block, kind).sum())
+            if _wilson(hits[kind], seen)[1] < INFER_MIN_MATCH:
+                alive.remove(kind)
+        if not alive or _wilson(hits[alive[0]], seen)[0] >= INFER_MIN_MATCH:
+            break
+    passing = [k for k in alive if hits[k] >= INFER_MIN_MATCH * seen]
+    if passing:
+        kind = passing[0]
+        if kind == "integer" and _phone_name(name) and _digits_like_phone(text.iloc[:seen]):
+            kind = "phone"
+        return SemanticType(kind, hits[passing[0]] / seen, seen)
+
+    # no format fits: a handful of repeated values is categorical, anything else free text
+    distinct = text.nunique()
+    best = max(hits.values()) / seen
+    if distinct <= CATEGORICAL_MAX and distinct <= CATEGORICAL_RATIO * len(text):
+        return SemanticType("categorical", 1.0 - distinct / len(text), len(text))
+    return SemanticType("text", 1.0 - best, len(text))
@@ -61,6 +61,22 @@ defaults = {
     "aws_compliance_bucket": "",
     "aws_anomalies_bucket": "",
     "aws_synthetic_bucket": "",
+    "aws_upload_compression": "none",   # none | gzip | bz2 | xz | zstd
+    "aws_upload_format": "csv",         # csv | parquet | feather
+
+    # data loading
+    "uri_cache_enabled": True,      # ~/.sidecar/cache for URI / S3 loads
+    "uri_cache_max_mb": "2048",
+    "parallel_parse_min_mb": "64",  # local files at least this big parse across all cores
+    "parallel_columns": True,       # Profile/Quality/Catalog of wide tables across all cores
+    "sample_rows": "100000",        # reservoir size for "Sample" loads
+    "compact_columns": True,        # categorical / Arrow strings / narrow ints for loaded data
+    "spill_min_mb": "0",            # local files at least this big open on disk (0 = only when asked)
+    "approx_distinct_rows": "5000000",  # columns with this many values get HyperLogLog unique counts (0 = always exact)
+    "approx_distinct_error": "0.01",    # relative standard error of those estimates
+    "db_last_dsn": "",
+    "db_last_source": "",
+    "db_preview_rows": "100000",    # rows of a database table shown in the grid
 
     # email
     "smtp_server": "",
@@ -103,6 +119,8 @@ STABILITY_IMAGE = ["sdxl", "sd3-medium"]
 CUSTOM_MAIN = ["aldin-mini"]        # extend as you add more
 CUSTOM_FAST = ["aldin-mini"]
 IMAGE_PROVIDERS = ["auto", "openai", "gemini", "stability", "none"]
+UPLOAD_COMPRESSIONS = ["none", "gzip", "bz2", "xz", "zstd"]
+UPLOAD_FORMATS = ["csv", "parquet", "feather"]
 PROVIDERS = ["custom", "openai", "gemini", "auto"]
 
 # how to map a provider to the keys in defaults.json
@@ -246,6 +264,19 @@ class SettingsWindow(wx.Frame):
         s.Add(wx.StaticText(panel, label="AWS Region:"), (row, 0), flag=wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL)
         self.aws_region = wx.TextCtrl(panel, value=defaults.get("aws_s3_region", "us-east-1"))
         s.Add(self.aws_region, (row, 1), flag=wx.EXPAND)
+
+        s.Add(wx.StaticText(panel, label="Upload Compression:"), (row, 2), flag=wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL)
+        self.upload_compression = wx.Choice(panel, choices=UPLOAD_COMPRESSIONS)
+        comp = defaults.get("aws_upload_compression", "none")
+        self.upload_compression.SetSelection(UPLOAD_COMPRESSIONS.index(comp) if comp in UPLOAD_COMPRESSIONS else 0)
+        s.Add(self.upload_compression, (row, 3), flag=wx.EXPAND)
+        row += 1
+
+        s.Add(wx.StaticText(panel, label="Upload Format:"), (row, 0), flag=wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL)
+        self.upload_format = wx.Choice(panel, choices=UPLOAD_FORMATS)
+        fmt = defaults.get("aws_upload_format", "csv")
+        self.upload_format.SetSelection(UPLOAD_FORMATS.index(fmt) if fmt in UPLOAD_FORMATS else 0)
+        s.Add(self.upload_format, (row, 1), flag=wx.EXPAND)
         row += 1
 
         # Buckets
@@ -457,6 +488,8 @@ class SettingsWindow(wx.Frame):
         defaults["aws_secret_access_key"] = self.aws_secret.GetValue().strip()
         defaults["aws_session_token"] = self.aws_token.GetValue().strip()
         defaults["aws_s3_region"] = self.aws_region.GetValue().strip()
+        defaults["aws_upload_compression"] = UPLOAD_COMPRESSIONS[self.upload_compression.GetSelection()]
+        defaults["aws_upload_format"] = UPLOAD_FORMATS[self.upload_format.GetSelection()]
         defaults["aws_profile_bucket"] = self.bucket_profile.GetValue().strip()
         defaults["aws_quality_bucket"] = self.bucket_quality.GetValue().strip()
         defaults["aws_catalog_bucket"] = self.bucket_catalog.GetValue().strip()
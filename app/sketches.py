@@ -0,0 +1,444 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from app.ingest import ColumnTyper
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║     Mergeable column sketches (Welford, t-digest, HLL, Space-Saving)    ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# Each sketch takes values a batch at a time, uses memory that does not grow
+# with the rows it has seen, and merges with a sketch of another batch, part
+# or worker. ColumnSketch bundles them into a profile of one column, so a file,
+# an S3 prefix or a spilled dataset can be profiled piecewise and combined.
+
+TDIGEST_COMPRESSION = 1000  # ~compression/2 centroids; median error well under 0.1% of rank
+TDIGEST_BUFFER = 8_000      # values buffered before a merge
+TDIGEST_EXACT = 4_000       # distinct values counted exactly before centroids start to merge
+TDIGEST_BLOCK = 100_000     # values sorted at a time when a digest is fed a long column
+HLL_PRECISION = 14          # 2**14 one-byte registers: 16 KB, ~0.8% relative error
+HLL_BLOCK = 250_000         # values hashed at a time by approx_distinct (hashing text encodes it)
+
+TOP_K = 20                  # values listed per column by Top Values
+TOP_COUNTERS = 200          # Space-Saving counters kept per column (10 per listed value)
+TOP_BLOCK = 250_000         # values counted at a time by SpaceSaving.update
+
+APPROX_DISTINCT_ROWS = 5_000_000    # columns with this many values get estimated distinct counts
+APPROX_DISTINCT_ERROR = 0.01        # relative standard error of those estimates
+
+
+class Moments:
+    """Count, min/max, mean and variance (Welford, merged with Chan's formula)."""
+
+    __slots__ = ("n", "mean", "m2", "lo", "hi")
+
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.lo = self.hi = None
+
+    def update(self, values):
+        v = pd.Series(values).dropna()
+        if v.empty:
+            return
+        n, mean = len(v), float(v.mean())
+        self._combine(n, mean, float(((v - mean) ** 2).sum()), v.min(), v.max())
+
+    def merge(self, other: "Moments"):
+        if other.n:
+            self._combine(other.n, other.mean, other.m2, other.lo, other.hi)
+        return self
+
+    def _combine(self, n, mean, m2, lo, hi):
+        d, tot = mean - self.mean, self.n + n
+        self.m2 += m2 + d * d * self.n * n / tot
+        self.mean += d * n / tot
+        self.n = tot
+        self.lo = lo if self.lo is None else min(self.lo, lo)
+        self.hi = hi if self.hi is None else max(self.hi, hi)
+
+    def std(self, ddof: int = 1):
+        return (self.m2 / (self.n - ddof)) ** 0.5 if self.n > ddof else float("nan")
+
+
+class TDigest:
+    """Merging t-digest (Dunning) for quantiles of a stream.
+
+    Values are buffered and merged into centroids in sorted order; centroids are
+    small near the tails and larger toward the median (k1 scale function). Equal
+    values are first counted together, so a column with up to TDIGEST_EXACT
+    distinct values (codes, flags, text lengths) gets exact quantiles however
+    many rows it has. Each centroid keeps its smallest and largest value; one
+    holding a single repeated value reads back as that value, never as
+    something interpolated across it.
+    """
+
+    def __init__(self, compression: int = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means, self.weights = np.empty(0), np.empty(0)
+        self.mins, self.maxs = np.empty(0), np.empty(0)
+        self.n = 0
+        self._buf, self._buffered = [], 0
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float)
+        for start in range(0, len(v), TDIGEST_BLOCK):   # never sorts more than a block at once
+            block = v[start:start + TDIGEST_BLOCK]
+            block = block[~np.isnan(block)]
+            if not len(block):
+                continue
+            self.n += len(block)
+            self._buf.append(block)
+            self._buffered += len(block)
+            if self._buffered + len(self.means) > TDIGEST_BUFFER:
+                self._compress()
+        return self
+
+    def merge(self, other: "TDigest"):
+        other._flush()
+        if not other.n:
+            return self
+        self._flush()
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self.mins = np.concatenate([self.mins, other.mins])
+        self.maxs = np.concatenate([self.maxs, other.maxs])
+        self.n += other.n
+        if len(self.means) > TDIGEST_BUFFER:
+            self._compress()
+        else:
+            self._flush()       # re-sorts
+        return self
+
+    def _flush(self):
+        """Move buffered values into the (sorted) centroid arrays without merging them."""
+        if self._buf:
+            vals = np.concatenate(self._buf)
+            self._buf, self._buffered = [], 0
+            self.means = np.concatenate([self.means, vals])
+            self.weights = np.concatenate([self.weights, np.ones(len(vals))])
+            self.mins = np.concatenate([self.mins, vals])
+            self.maxs = np.concatenate([self.maxs, vals])
+        order = np.argsort(self.means, kind="stable")
+        self.means, self.weights = self.means[order], self.weights[order]
+        self.mins, self.maxs = self.mins[order], self.maxs[order]
+
+    def _compress(self):
+        self._flush()
+        flat = self.mins == self.maxs
+        same = flat[1:] & flat[:-1] & (self.means[1:] == self.means[:-1])
+        self._combine(np.flatnonzero(np.concatenate([[True], ~same])))     # lossless
+        if len(self.means) <= TDIGEST_EXACT:
+            return
+        mid = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        # k1 scale: neighbouring centroids in the same unit step of k merge into one
+        k = self.compression / (2 * math.pi) * np.arcsin(np.clip(2 * mid - 1, -1, 1))
+        step = np.floor(k - k.min()).astype(np.int64)
+        self._combine(np.flatnonzero(np.concatenate([[True], np.diff(step) != 0])))
+
+    def _combine(self, starts):
+        """Merge each run of centroids beginning at *starts* into one."""
+        if len(starts) == len(self.means):
+            return
+        w = np.add.reduceat(self.weights, starts)
+        self.means = np.add.reduceat(self.weights * self.means, starts) / w
+        self.mins = np.minimum.reduceat(self.mins, starts)
+        self.maxs = np.maximum.reduceat(self.maxs, starts)
+        self.weights = w
+
+    @property
+    def exact(self) -> bool:
+        """True while every centroid holds one distinct value (quantiles are then exact)."""
+        self._flush()
+        return bool((self.mins == self.maxs).all())
+
+    def quantile(self, q: float) -> float:
+        """The q-quantile, interpolated like numpy.quantile's default (exact while exact)."""
+        self._flush()
+        if not self.n:
+            return float("nan")
+        # interpolate between centroid means; a centroid of one repeated value is flat over its ranks
+        cum = np.cumsum(self.weights)
+        flat = self.mins == self.maxs
+        first = np.where(flat, cum - self.weights + 0.5, cum - self.weights / 2)
+        last = np.where(flat, cum - 0.5, cum - self.weights / 2)
+        ranks = np.concatenate([[0.5], np.column_stack([first, last]).ravel(), [self.n - 0.5]])
+        vals = np.concatenate([[self.mins[0]], np.repeat(self.means, 2), [self.maxs[-1]]])
+        return float(np.interp(q * (self.n - 1) + 0.5, ranks, np.maximum.accumulate(vals)))
+
+    def rank_error(self, q: float) -> float:
+        """Bound on the rank error of quantile(q), as a fraction of n (0 when exact).
+
+        Every rank reads back as v = quantile(q) between the values below v and
+        those up to v. Centroids wholly below v hold only the first, those
+        starting at or below v may hold both, so the bound stays sound when the
+        centroids of merged digests overlap.
+        """
+        self._flush()
+        if not self.n or self.exact:
+            return 0.0
+        v, rank = self.quantile(q), q * (self.n - 1)
+        most_below = self.weights[self.mins < v].sum()
+        least_upto = self.weights[self.maxs <= v].sum()
+        return float(max(most_below - rank, rank - least_upto, 0.0) / self.n)
+
+
+def quantile_cell(digest: TDigest, q: float):
+    """digest.quantile(q) for a result table: the number when exact, else "≈v (±e pctl)".
+
+    e is the rank error bound in percentiles, e.g. "≈100.03 (±0.16 pctl)" is a
+    value whose true rank is within 0.16 percentiles of q.
+    """
+    if not digest.n:
+        return "N/A"
+    v = digest.quantile(q)
+    err = digest.rank_error(q)
+    return v if not err else f"≈{v:g} (±{100 * err:.2g} pctl)"
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Bit length of each uint64 value, exactly (floats lose the low bits)."""
+    n = np.zeros(len(x), dtype=np.int64)
+    for s in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(s))
+        n[big] += s
+        x = np.where(big, x >> np.uint64(s), x)
+    return n + (x > 0)
+
+
+class HyperLogLog:
+    """Distinct-count estimate from 2**precision registers of leading-zero ranks."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.p = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def for_error(cls, rel_error: float) -> "HyperLogLog":
+        """The smallest sketch whose standard error (1.04/sqrt(m)) is at most *rel_error*."""
+        return cls(min(18, max(4, math.ceil(math.log2((1.04 / rel_error) ** 2)))))
+
+    @property
+    def rel_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values):
+        """Add the non-null values of a Series (hashed with pandas' 64-bit value hash)."""
+        v = pd.Series(values).dropna()
+        if not v.empty:
+            # categorize=False hashes values directly instead of factorizing them into a hash table first
+            self.update_hashes(pd.util.hash_pandas_object(v, index=False, categorize=False).to_numpy())
+
+    def update_hashes(self, h: np.ndarray):
+        h = h.astype(np.uint64, copy=False)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = h & np.uint64((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("HyperLogLog sketches of different precision cannot be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)     # linear counting for small cardinalities
+        return int(round(est))
+
+
+def approx_distinct(s: pd.Series, rel_error: float = APPROX_DISTINCT_ERROR) -> int:
+    """HyperLogLog estimate of the distinct non-null values of *s*, hashed a block at a time."""
+    hll = HyperLogLog.for_error(rel_error)
+    for start in range(0, len(s), HLL_BLOCK):
+        hll.update(s.iloc[start:start + HLL_BLOCK])
+    return min(hll.count(), int(s.notna().sum()))
+
+
+class SpaceSaving:
+    """Heavy hitters of a stream (Metwally et al.'s Space-Saving): frequent values and their counts.
+
+    At most *capacity* counters are kept. A count may be over by at most its
+    error, never under, and every value seen more than n / capacity times is
+    guaranteed to be held. Each block of values is counted exactly and folded
+    in with the mergeable Space-Saving rule (Agarwal et al.), which is also how
+    summaries of separate parts or workers combine.
+    """
+
+    def __init__(self, capacity: int = TOP_COUNTERS):
+        self.capacity = capacity
+        empty = pd.Index([], dtype=object)      # values keep their own types (1 stays an int)
+        self.counts = pd.Series(dtype=float, index=empty)   # value -> count, over by at most errors[value]
+        self.errors = pd.Series(dtype=float, index=empty)
+        self.n = 0
+
+    @property
+    def floor(self) -> float:
+        """The most any value not held could have been seen (0 until a counter has been dropped)."""
+        return float(self.counts.min()) if len(self.counts) >= self.capacity else 0.0
+
+    def update(self, values):
+        s = pd.Series(values)
+        for start in range(0, len(s), TOP_BLOCK):
+            counts = s.iloc[start:start + TOP_BLOCK].value_counts(dropna=True, sort=False)
+            if len(counts):
+                self._fold(counts, pd.Series(0.0, index=counts.index), 0.0, int(counts.sum()))
+        return self
+
+    def merge(self, other: "SpaceSaving"):
+        if other.n:
+            self._fold(other.counts, other.errors, other.floor, other.n)
+        return self
+
+    def _fold(self, counts, errors, floor, n):
+        values = counts.index.to_numpy(dtype=object)
+        index = pd.Index(values, dtype=object)
+        counts = pd.Series(counts.to_numpy(dtype=float), index=index)
+        errors = pd.Series(errors.to_numpy(dtype=float), index=index)
+        # a value held on one side only may have been seen up to the other side's floor there
+        both = pd.Index(pd.unique(np.concatenate([self.counts.index.to_numpy(dtype=object), values])),
+                        dtype=object)
+        mine = self.floor
+        total = self.counts.reindex(both, fill_value=mine) + counts.reindex(both, fill_value=floor)
+        error = self.errors.reindex(both, fill_value=mine) + errors.reindex(both, fill_value=floor)
+        self.counts = total.nlargest(self.capacity)
+        self.errors = error[self.counts.index]
+        self.n += n
+
+    @property
+    def exact(self) -> bool:
+        """True while nothing has been dropped, so every count is exact."""
+        return bool(self.n == self.counts.sum() and not self.errors.any())
+
+    def top(self, k: int = TOP_K) -> list:
+        """[(value, count, error)] of the *k* most frequent values, most frequent first."""
+        counts = self.counts.nlargest(k)
+        return [(v, int(c), int(self.errors[v])) for v, c in counts.items()]
+
+
+class ColumnSketch:
+    """A mergeable profile of one column: counts, moments, quantiles and distinct values.
+
+    Batches may be raw text (as read) or typed; the column counts as numeric when
+    it would after ingest.infer_column_types over all of them. Numeric columns are
+    described by their values, others by the stripped text lengths, as in
+    analysis.column_metrics. *rel_error* sizes the distinct-count sketches.
+    """
+
+    def __init__(self, rel_error: float | None = None):
+        hll = HyperLogLog if rel_error is None else (lambda: HyperLogLog.for_error(rel_error))
+        self.typer = ColumnTyper()
+        self.rows = self.nulls = self.blanks = 0
+        self.num, self.num_q, self.num_hll = Moments(), TDigest(), hll()
+        self.len, self.len_q, self.text_hll = Moments(), TDigest(), hll()
+
+    def update(self, s: pd.Series):
+        self.rows += len(s)
+        nulls = int(s.isna().sum())
+        self.nulls += nulls
+        if nulls == len(s):
+            self.typer.update(s)
+            return
+        vals = s.dropna()
+        parsed = self.typer.update(s)
+        if pd.api.types.is_numeric_dtype(s):
+            self._numbers(vals)
+            return
+        if parsed is not None:
+            self._numbers(parsed)
+        t = vals.astype(str).str.strip()
+        blank = t == ""
+        self.blanks += int(blank.sum())
+        lengths = t[~blank].str.len()
+        self.len.update(lengths)
+        self.len_q.update(lengths)
+        self.text_hll.update(vals)
+
+    def _numbers(self, v: pd.Series):
+        self.num.update(v)
+        self.num_q.update(v)
+        self.num_hll.update(v.astype(float))    # 1 and "1.0" are one value, as after typing
+
+    def merge(self, other: "ColumnSketch"):
+        self.typer.merge(other.typer)
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.blanks += other.blanks
+        for mine, theirs in ((self.num, other.num), (self.num_q, other.num_q), (self.num_hll, other.num_hll),
+                             (self.len, other.len), (self.len_q, other.len_q), (self.text_hll, other.text_hll)):
+            mine.merge(theirs)
+        return self
+
+    @property
+    def numeric(self) -> bool:
+        return (self.typer.kind in ("num", "native") and self.num.n > 0
+                and self.num.n == self.rows - self.nulls)
+
+    def metrics(self, field) -> dict:
+        """The Profile part of analysis.column_metrics; the distinct count is an estimate."""
+        if self.numeric:
+            m, q, hll = self.num, self.num_q, self.num_hll
+        else:
+            m, q, hll = self.len, self.len_q, self.text_hll
+        if not m.n:
+            stats = ("N/A",) * 4
+        else:
+            stats = (m.lo, m.hi, quantile_cell(q, 0.5), m.std() if self.numeric else "N/A")
+        return {
+            "field": field, "kind": "numeric" if self.numeric else "text", "total": self.rows,
+            "nulls": self.nulls, "blanks": 0 if self.numeric else self.blanks,
+            "distinct": min(hll.count(), self.rows - self.nulls), "distinct_mark": "≈",
+            "min": stats[0], "max": stats[1], "median": stats[2], "std": stats[3], "valid": None,
+        }
+
+
+def sketch_frame(frame: pd.DataFrame, sketches: dict | None = None, rel_error: float | None = None) -> dict:
+    """Fold a batch into {column: ColumnSketch}; new columns get a sketch that counts earlier rows as null."""
+    sketches = {} if sketches is None else sketches
+    seen = max((sk.rows for sk in sketches.values()), default=0)
+    for col in frame.columns:
+        sk = sketches.get(col)
+        if sk is None:
+            sk = sketches[col] = ColumnSketch(rel_error)
+            sk.rows = sk.nulls = seen
+            if seen:
+                sk.typer.has_null = True
+        sk.update(frame[col])
+    for col, sk in sketches.items():
+        if col not in frame.columns:        # a part without this column
+            sk.rows += len(frame)
+            sk.nulls += len(frame)
+            sk.typer.has_null = True
+    return sketches
+
+
+def merge_sketches(parts) -> dict:
+    """Combine {column: ColumnSketch} dicts of separate parts of one dataset (in place into the first)."""
+    parts = [p for p in parts if p]
+    if not parts:
+        return {}
+    out = parts[0]
+    for part in parts[1:]:
+        rows_out = max((sk.rows for sk in out.values()), default=0)
+        rows_part = max((sk.rows for sk in part.values()), default=0)
+        for col, sk in part.items():
+            if col in out:
+                out[col].merge(sk)
+            else:
+                pad = ColumnSketch()
+                pad.num_hll, pad.text_hll = HyperLogLog(sk.num_hll.p), HyperLogLog(sk.text_hll.p)
+                pad.rows = pad.nulls = rows_out
+                pad.typer.has_null = bool(rows_out)
+                out[col] = pad.merge(sk)
+        for col in out:
+            if col not in part:
+                out[col].rows += rows_part
+                out[col].nulls += rows_part
+                out[col].typer.has_null = out[col].typer.has_null or bool(rows_part)
+    return out
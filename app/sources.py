@@ -0,0 +1,86 @@
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from app.ingest import read_frame, infer_column_types, iter_batches
+from app.s3_utils import iter_uri_chunks, list_s3_uris
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║             Multi-part sources (S3 prefixes, local globs)               ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+
+SOURCE_WORKERS = 8          # parts fetched/parsed at once
+_GLOB_CHARS = "*?["
+
+
+def is_multi_source(src: str) -> bool:
+    """True for s3://bucket/prefix/, S3 key globs, local globs and directories."""
+    src = (src or "").strip()
+    if src.startswith("s3://"):
+        return src.endswith("/") or src.count("/") == 2 or any(c in src for c in _GLOB_CHARS)
+    if "://" in src:
+        return False
+    return any(c in src for c in _GLOB_CHARS) or os.path.isdir(src)
+
+
+def _is_data_part(name: str) -> bool:
+    # skip directory markers and writer bookkeeping (_SUCCESS, _metadata, .crc files)
+    if name.endswith("/"):
+        return False
+    base = name.rsplit("/", 1)[-1]
+    return bool(base) and not base.startswith(("_", "."))
+
+
+def expand_source(src: str, settings: dict | None = None) -> list:
+    """The part files/URIs behind a multi-part source, in sorted order."""
+    src = src.strip()
+    if src.startswith("s3://"):
+        parts = list_s3_uris(src, settings)
+    elif os.path.isdir(src):
+        parts = sorted(p for p in glob.glob(os.path.join(src, "*")) if os.path.isfile(p))
+    else:
+        parts = sorted(p for p in glob.glob(os.path.expanduser(src), recursive=True)
+                       if os.path.isfile(p))
+    return [p for p in parts if _is_data_part(p.replace(os.sep, "/"))]
+
+
+def _read_part(part: str, columns, settings, progress=None):
+    src = iter_uri_chunks(part, settings=settings) if "://" in part else part
+    return read_frame(src, columns=columns, infer_types=False, progress=progress)
+
+
+def iter_source_batches(src: str, columns=None, settings: dict | None = None, progress=None):
+    """Raw batches of every part of *src*, one part after another (for single-pass readers)."""
+    for part in expand_source(src, settings):
+        yield from iter_batches(iter_uri_chunks(part, settings=settings) if "://" in part else part,
+                                columns=columns, progress=progress)
+
+
+def read_source_frame(src: str, workers: int = SOURCE_WORKERS, on_batch=None, columns=None,
+                      settings: dict | None = None, progress=None) -> pd.DataFrame:
+    """Load every part of *src* concurrently and return them as one typed DataFrame.
+
+    Parts are joined in listing order; columns missing from a part are filled with
+    nulls and new columns are appended in first-seen order. Dtypes are inferred
+    once over the combined columns so parts cannot disagree.
+    """
+    parts = expand_source(src, settings)
+    if not parts:
+        raise FileNotFoundError(f"No data files match {src}")
+    frames, rows = [], 0
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(parts))))
+    try:
+        for f in pool.map(lambda p: _read_part(p, columns, settings, progress), parts):
+            if not len(f):
+                continue
+            frames.append(f)
+            rows += len(f)
+            if on_batch:
+                on_batch(f, rows)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    if not frames:
+        return pd.DataFrame()
+    return infer_column_types(pd.concat(frames, ignore_index=True, join="outer", sort=False))
@@ -0,0 +1,208 @@
+import bisect
+import os
+import shutil
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from app.ingest import ColumnTyper, _arrow_ready, _require_pyarrow, columnar_format, compression_for_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = feather = pa_ipc = pq = None
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║               Out-of-core datasets: row chunks spilled to disk          ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# A SpilledFrame is a directory of Feather (Arrow IPC) files, one per batch of
+# rows, written in a single streaming pass over the source. Text is stored as
+# read; the dtype of each column is settled over the whole source during that
+# pass (same rules as ingest.infer_column_types) and applied whenever a chunk
+# is paged back in. Only PAGE_CACHE chunks are held in memory at a time.
+
+SPILL_DIR = os.path.join(os.path.expanduser("~"), ".sidecar", "spill")
+PAGE_CACHE = 4          # chunks kept in memory for random access (the grid)
+PREVIEW_ROWS = 10_000   # rows of a spilled dataset also held in memory (Catalog, Synthetic, MDM)
+
+
+class SpilledFrame:
+    """Rows of one dataset kept on disk in source-batch chunks, paged in on demand."""
+
+    def __init__(self, root: str, columns: list, lengths: list, dtypes: dict):
+        self.root = root
+        self.columns = list(columns)
+        self.lengths = list(lengths)
+        self.offsets = list(np.cumsum([0] + self.lengths))
+        self.dtypes = dtypes
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._cleanup = weakref.finalize(self, shutil.rmtree, root, True)
+
+    # ── building ──────────────────────────────────────────────────────────────
+    @classmethod
+    def from_batches(cls, batches, root: str | None = None, on_batch=None) -> "SpilledFrame":
+        """Write each raw batch (ingest.iter_batches / iter_source_batches) to its own chunk file."""
+        _require_pyarrow()
+        root = root or os.path.join(SPILL_DIR, uuid.uuid4().hex)
+        os.makedirs(root, exist_ok=True)
+        columns, lengths, types = [], [], {}
+        try:
+            for f in batches:
+                if not len(f):
+                    continue
+                f = f.rename(columns=str)
+                for c in columns:
+                    if c not in f.columns:      # parts of a glob/prefix may lack columns
+                        types[c].has_null = True
+                for c in f.columns:
+                    if c not in types:
+                        columns.append(c)
+                        types[c] = ColumnTyper()
+                        types[c].has_null = bool(lengths)
+                    types[c].update(f[c])
+                feather.write_feather(_arrow_ready(f.reset_index(drop=True)),
+                                      os.path.join(root, f"{len(lengths):06d}.arrow"), compression="lz4")
+                lengths.append(len(f))
+                if on_batch:
+                    on_batch(f, sum(lengths))
+        except BaseException:
+            shutil.rmtree(root, True)
+            raise
+        dtypes = {c: t.dtype() for c, t in types.items()}
+        return cls(root, columns, lengths, dtypes)
+
+    # ── reading ───────────────────────────────────────────────────────────────
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self.lengths)
+
+    def _path(self, i: int) -> str:
+        return os.path.join(self.root, f"{i:06d}.arrow")
+
+    def read_chunk(self, i: int, columns=None) -> pd.DataFrame:
+        """Chunk *i* from disk, typed, with every dataset column (or just *columns*)."""
+        cols = self.columns if columns is None else list(columns)
+        table = feather.read_table(self._path(i), memory_map=True)
+        present = [c for c in cols if c in table.column_names]
+        df = table.select(present).to_pandas().reindex(columns=cols)
+        for c in cols:
+            dt = self.dtypes.get(c)
+            if dt == "str":
+                if not pd.api.types.is_string_dtype(df[c]):
+                    df[c] = df[c].astype(str)       # keeps NaN
+            elif dt is not None:
+                df[c] = pd.to_numeric(df[c]).astype(dt)
+        df.index = pd.RangeIndex(self.offsets[i], self.offsets[i] + len(df))
+        return df
+
+    def iter_chunks(self, columns=None, progress=None):
+        """Stream every chunk in order without disturbing the page cache."""
+        for i in range(self.n_chunks):
+            df = self.read_chunk(i, columns)
+            if progress:
+                progress.add(rows=len(df))
+            yield df
+
+    def page(self, i: int) -> pd.DataFrame:
+        """Chunk *i* through the small LRU page cache (random access from the grid)."""
+        with self._lock:
+            df = self._pages.get(i)
+            if df is not None:
+                self._pages.move_to_end(i)
+                return df
+        df = self.read_chunk(i)
+        with self._lock:
+            self._pages[i] = df
+            while len(self._pages) > PAGE_CACHE:
+                self._pages.popitem(last=False)
+        return df
+
+    def locate(self, row: int):
+        """(chunk, row within chunk) of a dataset row."""
+        i = bisect.bisect_right(self.offsets, row) - 1
+        return i, row - self.offsets[i]
+
+    def value(self, row: int, col: int):
+        i, r = self.locate(row)
+        return self.page(i).iat[r, col]
+
+    def head(self, n: int) -> pd.DataFrame:
+        frames, got = [], 0
+        for i in range(self.n_chunks):
+            if got >= n:
+                break
+            df = self.read_chunk(i)
+            frames.append(df.iloc[:n - got])
+            got += len(frames[-1])
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def slice(self, start: int, stop: int) -> pd.DataFrame:
+        frames = []
+        i, _ = self.locate(start)
+        while i < self.n_chunks and self.offsets[i] < stop:
+            df = self.page(i)
+            lo = max(start, self.offsets[i]) - self.offsets[i]
+            hi = min(stop, self.offsets[i + 1]) - self.offsets[i]
+            frames.append(df.iloc[lo:hi])
+            i += 1
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def disk_bytes(self) -> int:
+        return sum(os.path.getsize(self._path(i)) for i in range(self.n_chunks))
+
+    def close(self):
+        """Delete the chunk files now rather than when the frame is collected."""
+        with self._lock:
+            self._pages.clear()
+        self._cleanup()
+
+    # ── writing out ───────────────────────────────────────────────────────────
+    def write(self, path: str, sep: str = ",", progress=None) -> int:
+        """Stream the whole dataset to CSV/TSV (compressed per extension), Parquet or Feather."""
+        fmt = columnar_format(path)
+        rows = 0
+        if fmt:
+            writer = None
+            try:
+                for df in self.iter_chunks(progress=progress):
+                    table = pa.Table.from_pandas(_arrow_ready(df), preserve_index=False)
+                    if writer is None:
+                        writer = (pq.ParquetWriter(path, table.schema, compression="zstd") if fmt == "parquet"
+                                  else pa_ipc.new_file(path, table.schema,
+                                                       options=pa_ipc.IpcWriteOptions(compression="zstd")))
+                    writer.write_table(table)
+                    rows += len(df)
+            finally:
+                if writer is not None:
+                    writer.close()
+            return rows
+        compression = compression_for_path(path)
+        options = {"method": compression} if compression else None
+        for i, df in enumerate(self.iter_chunks(progress=progress)):
+            # each chunk is its own compressed member; gzip/bz2/xz/zstd readers concatenate them
+            df.to_csv(path, index=False, sep=sep, header=i == 0, mode="w" if i == 0 else "a",
+                      compression=options)
+            rows += len(df)
+        return rows
+
+
+def spill_batches(batches, on_batch=None) -> SpilledFrame:
+    """A SpilledFrame under SPILL_DIR holding every row of *batches*."""
+    return SpilledFrame.from_batches(batches, on_batch=on_batch)
+
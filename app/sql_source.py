@@ -0,0 +1,298 @@
+import importlib
+import re
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+from urllib.parse import parse_qsl
+
+import pandas as pd
+
+from app.analysis import _default_valid_count
+from app.dataset import ColumnStats
+from app.ingest import BATCH_ROWS, infer_column_types, _blank_to_null
+from app.semantic import infer_semantic_type
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                 Database sources (SQLite / any DB-API)                  ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+#
+# Connection strings:
+#   sqlite:///C:/data/sales.db  or just a path ending .db / .sqlite / .sqlite3
+#   postgresql://user:pw@host/db          (psycopg2, when installed)
+#   module:<dbapi module>?key=value&...   e.g. module:pymysql?host=h&user=u&database=d
+#
+# Identifiers are quoted ANSI style ("name"); MySQL needs ANSI_QUOTES for that.
+
+SAMPLE_ROWS = 1000          # rows fetched to decide which columns are numeric
+_SCHEMES = {"postgresql": "psycopg2", "postgres": "psycopg2"}
+
+
+def connect(dsn: str):
+    """Open a DB-API connection for *dsn* (see the formats above)."""
+    dsn = dsn.strip()
+    if dsn.startswith("sqlite:///"):
+        return sqlite3.connect(dsn[len("sqlite:///"):])
+    if re.search(r"\.(db|sqlite3?)$", dsn, re.I) and "://" not in dsn:
+        return sqlite3.connect(dsn)
+    if dsn.startswith("module:"):
+        name, _, query = dsn[len("module:"):].partition("?")
+        return importlib.import_module(name).connect(**dict(parse_qsl(query)))
+    scheme = dsn.split("://", 1)[0].lower()
+    if scheme in _SCHEMES:
+        try:
+            driver = importlib.import_module(_SCHEMES[scheme])
+        except ImportError:
+            raise RuntimeError(f"{scheme} sources need the '{_SCHEMES[scheme]}' package")
+        return driver.connect(dsn)
+    raise ValueError(f"Unsupported database connection string: {dsn}")
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def from_clause(source: str) -> str:
+    """FROM target for a table name (schema.table allowed) or a SELECT/WITH query."""
+    source = source.strip().rstrip(";")
+    if re.match(r"(?is)^\s*(select|with)\b", source):
+        return f"({source}) src"
+    return ".".join(_quote(p) for p in source.split("."))
+
+
+def _stream_cursor(conn):
+    """Server-side cursor where the driver has one (psycopg2), so fetchmany really streams."""
+    try:
+        return conn.cursor(name="sidecar_stream")
+    except TypeError:
+        return conn.cursor()
+
+
+def iter_table_batches(conn, source: str, batch_rows: int = BATCH_ROWS, limit: int | None = None,
+                       progress=None):
+    """Yield raw DataFrame batches of *source* using cursor.fetchmany.
+
+    Stops after *limit* rows when given; *progress* (a LoadProgress) counts rows.
+    """
+    cur = _stream_cursor(conn)
+    try:
+        cur.execute(f"SELECT * FROM {from_clause(source)}")
+        cols = [d[0] for d in cur.description]
+        fetched = 0
+        while limit is None or fetched < limit:
+            n = batch_rows if limit is None else min(batch_rows, limit - fetched)
+            rows = cur.fetchmany(n)
+            if not rows:
+                break
+            fetched += len(rows)
+            if progress:
+                progress.add(rows=len(rows))
+            yield pd.DataFrame.from_records(rows, columns=cols)
+    finally:
+        cur.close()
+
+
+def read_table(dsn: str, source: str, limit: int | None = None, on_batch=None, progress=None) -> pd.DataFrame:
+    """Typed DataFrame for a table or query, like read_frame for files."""
+    conn = connect(dsn)
+    try:
+        frames, rows = [], 0
+        for f in iter_table_batches(conn, source, limit=limit, progress=progress):
+            frames.append(f)
+            rows += len(f)
+            if on_batch:
+                on_batch(f, rows)
+    finally:
+        conn.close()
+    if not frames:
+        return pd.DataFrame()
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return infer_column_types(_blank_to_null(df))
+
+
+def count_rows(dsn: str, source: str) -> int:
+    conn = connect(dsn)
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM {from_clause(source)}")
+        return int(cur.fetchone()[0])
+    finally:
+        conn.close()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SQL-pushed profile / quality
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _column_kinds(cur, src: str):
+    """({column: 'numeric' | 'text' | 'other'}, {column: SemanticType}) from a small sample.
+
+    The kinds follow the driver's Python types; the semantic types are inferred
+    from the sample typed the way read_table types a loaded table.
+    """
+    cur.execute(f"SELECT * FROM {src} LIMIT {SAMPLE_ROWS}")
+    cols = [d[0] for d in cur.description]
+    rows = cur.fetchall()
+    kinds = {c: None for c in cols}
+    for row in rows:
+        for c, v in zip(cols, row):
+            if v is None or kinds[c] == "other":
+                continue
+            if isinstance(v, (int, float, Decimal)) and not isinstance(v, bool):
+                k = "numeric"
+            elif isinstance(v, str):
+                k = "text"
+            else:
+                k = "other"
+            kinds[c] = k if kinds[c] in (None, k) else "other"
+    sample = infer_column_types(_blank_to_null(pd.DataFrame.from_records(rows, columns=cols)))
+    semantic = {c: infer_semantic_type(sample.iloc[:, i], c) for i, c in enumerate(cols)}
+    return {c: k or "text" for c, k in kinds.items()}, semantic
+
+
+def _num(v):
+    if v is None:
+        return "N/A"
+    v = float(v)
+    return int(v) if v.is_integer() else v
+
+
+def _median(cur, src: str, expr: str, where: str, n: int):
+    if not n:
+        return "N/A"
+    lo, hi = (n - 1) // 2, n // 2
+    vals = []
+    for off in sorted({lo, hi}):
+        cur.execute(f"SELECT {expr} FROM {src} WHERE {where} ORDER BY {expr} LIMIT 1 OFFSET {off}")
+        vals.append(float(cur.fetchone()[0]))
+    return _num(sum(vals) / len(vals) if lo != hi else vals[0])
+
+
+def column_stats(conn, source: str, medians: bool = True):
+    """Per-column aggregates computed by the database in one scan (plus a median lookup per column).
+
+    Returns [{field, kind, semantic, total, non_null, distinct, blanks, min, max, median, std}].
+    """
+    src = from_clause(source)
+    cur = conn.cursor()
+    kinds, semantic = _column_kinds(cur, src)
+    parts = ["COUNT(*)"]
+    for c, kind in kinds.items():
+        q = _quote(c)
+        parts += [f"COUNT({q})", f"COUNT(DISTINCT {q})"]
+        if kind == "text":
+            length = f"LENGTH(TRIM({q}))"
+            parts += [f"SUM(CASE WHEN TRIM({q}) = '' THEN 1 ELSE 0 END)",
+                      f"MIN(CASE WHEN TRIM({q}) <> '' THEN {length} END)",
+                      f"MAX(CASE WHEN TRIM({q}) <> '' THEN {length} END)", "NULL", "NULL"]
+        elif kind == "numeric":
+            parts += ["0", f"MIN({q})", f"MAX({q})", f"SUM(1.0 * {q})", f"SUM(1.0 * {q} * {q})"]
+        else:
+            parts += ["0", "NULL", "NULL", "NULL", "NULL"]
+    cur.execute(f"SELECT {', '.join(parts)} FROM {src}")
+    agg = list(cur.fetchone())
+    total, agg = int(agg[0]), agg[1:]
+    stats = []
+    for i, (c, kind) in enumerate(kinds.items()):
+        non_null, distinct, blanks, mn, mx, s1, s2 = agg[i * 7:(i + 1) * 7]
+        non_null, blanks = int(non_null or 0), int(blanks or 0)
+        st = {"field": c, "kind": kind, "semantic": semantic[c], "total": total, "non_null": non_null,
+              "distinct": int(distinct or 0), "blanks": blanks,
+              "min": _num(mn) if kind != "other" else "N/A",
+              "max": _num(mx) if kind != "other" else "N/A", "median": "N/A", "std": "N/A"}
+        q = _quote(c)
+        if kind == "numeric" and non_null:
+            if medians:
+                st["median"] = _median(cur, src, q, f"{q} IS NOT NULL", non_null)
+            if non_null > 1:
+                s1, s2 = float(s1), float(s2)
+                var = max(0.0, (s2 - s1 * s1 / non_null) / (non_null - 1))
+                st["std"] = var ** 0.5
+        elif kind == "text" and medians and non_null - blanks:
+            st["median"] = _median(cur, src, f"LENGTH(TRIM({q}))", f"TRIM({q}) <> ''", non_null - blanks)
+        stats.append(st)
+    return stats
+
+
+def profile_table(dsn: str, source: str):
+    """profile_analysis for a database table or query, computed in SQL."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = connect(dsn)
+    try:
+        stats = column_stats(conn, source)
+    finally:
+        conn.close()
+    rows = []
+    for st in stats:
+        total, nulls = st["total"], st["total"] - st["non_null"]
+        comp = round(100 * (total - nulls - st["blanks"]) / total, 2) if total else 0
+        rows.append([st["field"], total, st["distinct"], comp, nulls, st["blanks"],
+                     st["min"], st["max"], st["median"], st["std"], now])
+    hdr = ["Field", "Total", "Unique", "Completeness (%)",
+           "Nulls", "Blanks", "Min", "Max", "Median", "Std", "Analysis Date"]
+    return hdr, rows
+
+
+def _count_where(cur, src: str, cond: str, params=()) -> int:
+    cur.execute(f"SELECT COUNT(*) FROM {src} WHERE {cond}", params)
+    return int(cur.fetchone()[0])
+
+
+def _count_in_python(conn, src: str, col: str, test) -> int:
+    """Stream one column through *test(series) -> matches* for checks SQL cannot express portably."""
+    valid = 0
+    for f in iter_table_batches(conn, f"SELECT {_quote(col)} FROM {src} WHERE {_quote(col)} IS NOT NULL"):
+        valid += int(test(f.iloc[:, 0]))
+    return valid
+
+
+def quality_table(dsn: str, source: str, rules: dict | None = None):
+    """quality_analysis for a database table or query, computed in SQL where it can be.
+
+    Regex rules run inside SQLite via a registered function; other drivers stream
+    just the ruled column through Python. Other columns are checked against the
+    semantic type inferred from the kinds sample (app.semantic), as a loaded table
+    is: dates, emails, phones, booleans and numbers in text stream through Python.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = connect(dsn)
+    try:
+        stats = column_stats(conn, source, medians=False)
+        src = from_clause(source)
+        cur = conn.cursor()
+        is_sqlite = isinstance(conn, sqlite3.Connection)
+        if is_sqlite:
+            conn.create_function("sidecar_match", 2,
+                                 lambda pat, v: v is not None and re.match(pat, str(v)) is not None,
+                                 deterministic=True)
+        rows = []
+        for st in stats:
+            col, q, total = st["field"], _quote(st["field"]), st["total"]
+            kind = st["semantic"].kind
+            nulls = total - st["non_null"]
+            rule = (rules or {}).get(col)
+            if rule is not None:
+                pat = getattr(rule, "pattern", str(rule))
+                if is_sqlite:
+                    valid_cnt = _count_where(cur, src, f"sidecar_match(?, {q})", (pat,))
+                else:
+                    rx = re.compile(pat)
+                    valid_cnt = _count_in_python(conn, src, col, lambda s: s.astype(str).str.match(rx).sum())
+            elif st["kind"] == "numeric":
+                valid_cnt = st["non_null"]
+            elif (st["kind"] == "other" or kind not in ("text", "categorical")
+                  or "date" in col.lower() or "email" in col.lower()):
+                # the same semantic-type check quality_analysis runs on a loaded table
+                valid_cnt = _count_in_python(conn, src, col,
+                                             lambda s, k=kind: _default_valid_count(ColumnStats(s), k))
+            else:
+                valid_cnt = st["non_null"] - st["blanks"]
+            comp_pct = round(100 * (total - nulls - st["blanks"]) / total, 2) if total else 0
+            uniq_pct = round(100 * st["distinct"] / total, 2) if total else 0
+            valid_pct = round(100 * valid_cnt / total, 2) if total else 0
+            score = round((comp_pct + valid_pct) / 2, 2)
+            rows.append([col, total, comp_pct, uniq_pct, valid_pct, score, now])
+    finally:
+        conn.close()
+    hdr = ["Field", "Total", "Completeness (%)", "Uniqueness (%)",
+           "Validity (%)", "Quality Score (%)", "Analysis Date"]
+    return hdr, rows
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app.settings import defaults
+
+# ╔═════════════════════════════════════════════════════════════════════════╗
+# ║                    On-disk cache for URI / S3 loads                     ║
+# ╚═════════════════════════════════════════════════════════════════════════╝
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".sidecar", "cache")
+READ_CHUNK = 8 << 20
+
+
+class UriCache:
+    """Bodies of downloaded objects keyed by URI, with their ETag/Last-Modified.
+
+    Entries are revalidated by the caller (conditional GET or S3 HEAD) and evicted
+    least-recently-used first once the total size passes *max_bytes*.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=2048 << 20):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.index_path = os.path.join(self.root, "index.json")
+        self.index = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        except Exception:
+            self.index = {}
+
+    @staticmethod
+    def _key(uri: str) -> str:
+        return hashlib.sha256(uri.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.root, key + ".body")
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+    def entry(self, uri: str):
+        with self.lock:
+            key = self._key(uri)
+            ent = self.index.get(key)
+            if ent and not os.path.exists(self._body_path(key)):
+                self.index.pop(key, None)
+                ent = None
+            return dict(ent) if ent else None
+
+    def validators(self, uri: str) -> dict:
+        """Conditional-request headers for a cached *uri* (empty when not cached)."""
+        ent = self.entry(uri)
+        if not ent:
+            return {}
+        headers = {}
+        if ent.get("etag"):
+            headers["If-None-Match"] = ent["etag"]
+        if ent.get("last_modified"):
+            headers["If-Modified-Since"] = ent["last_modified"]
+        return headers
+
+    def is_fresh(self, uri: str, etag: str | None, last_modified: str | None) -> bool:
+        ent = self.entry(uri)
+        if not ent:
+            return False
+        if etag:
+            return ent.get("etag") == etag
+        return bool(last_modified) and ent.get("last_modified") == last_modified
+
+    def read(self, uri: str, chunk_size: int = READ_CHUNK):
+        """Yield the cached body of *uri* and mark it recently used."""
+        key = self._key(uri)
+        with self.lock:
+            if key in self.index:
+                self.index[key]["atime"] = time.time()
+                self._save_index()
+        with open(self._body_path(key), "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+
+    def store(self, uri: str, chunks, etag: str | None, last_modified: str | None):
+        """Pass *chunks* through while writing them to the cache.
+
+        The entry is only committed when the stream is consumed to the end.
+        """
+        key = self._key(uri)
+        tmp = self._body_path(key) + f".{threading.get_ident()}.part"
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        with self.lock:
+            os.replace(tmp, self._body_path(key))
+            self.index[key] = {"uri": uri, "etag": etag, "last_modified": last_modified,
+                               "size": size, "atime": time.time()}
+            self._evict(keep=key)
+            self._save_index()
+
+    def _evict(self, keep: str):
+        total = sum(e.get("size", 0) for e in self.index.values())
+        for key, ent in sorted(self.index.items(), key=lambda kv: kv[1].get("atime", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            total -= ent.get("size", 0)
+            del self.index[key]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache, or None when disabled in settings."""
+    global _cache
+    if str(defaults.get("uri_cache_enabled", True)).lower() in ("0", "false", "no", "off"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = UriCache(max_bytes=int(float(defaults.get("uri_cache_max_mb", 2048)) * (1 << 20)))
+        return _cache
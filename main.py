@@ -1,6 +1,7 @@
 # main.py
 import os
 import json
+import multiprocessing
 import wx
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -65,6 +66,7 @@ def save_defaults():
 # ──────────────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()   # parse workers in frozen (PyInstaller) builds
     load_defaults()
 
     app = wx.App(False)
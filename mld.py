@@ -47,6 +47,10 @@ import ssl
 
 from datetime import datetime
 
+from app.ingest import iter_batches  # profiling counts value frequencies locally
+
+from app.analysis import top_values_stream  # one Space-Saving pass per column
+
  
 
 # =========================================
@@ -605,6 +609,24 @@ class SummaryDialog(wx.Dialog):
 
  
 
+def local_frequency_table(file_content, k=10):
+
+    """Pipe-delimited top-k values and counts of every field over the whole file; "" if it cannot be parsed."""
+
+    try:
+
+        hdr, rows = top_values_stream(iter_batches(io.BytesIO(file_content.encode("utf-8"))), k)
+
+    except Exception:
+
+        return ""
+
+    lines = [" | ".join(hdr[:-1])] + [" | ".join(str(c) for c in r[:-1]) for r in rows]
+
+    return "\n".join(lines)
+
+ 
+
 def analyze_file_content_with_gpt(file_content, analysis_type):
 
     if file_content:
@@ -619,11 +641,17 @@ def analyze_file_content_with_gpt(file_content, analysis_type):
 
         if analysis_type == 'profiling':
 
+            frequency_table = local_frequency_table(file_content)
+
             prompt = f"""
 
             To analyze the data quality of the provided sample data, please calculate the record count, standard deviation, completeness, uniqueness, minimum, maximum, median, null count, blank count, and identify any patterns for each field.
 
-            Additionally, provide a frequency distribution of values for each field. Present the results in a clear pipe-delimited table format.
+            Present the results in a clear pipe-delimited table format.
+
+            Additionally, include the frequency distribution of values for each field below as given. It was counted over every row of the file, not just the sample; do not recompute it.
+
+            {frequency_table}
 
             {data_sample}
 
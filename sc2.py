@@ -7,13 +7,13 @@ import wx.richtext as rt
 
 import pandas as pd
 
-import re, csv, io, os, json, threading, requests, boto3, urllib3
+import re, csv, os, json, threading, requests, urllib3
 
 from datetime import datetime
 
-from botocore import UNSIGNED
+from app.s3_utils import get_s3_client, download_text_from_uri as _shared_download, upload_to_s3 as _shared_upload
 
-from botocore.config import Config
+from app.analysis import profile_analysis, quality_analysis  # one fused pass per column (app.analysis.column_metrics)
 
 import speech_recognition as sr          # reserved for future voice UI
 
@@ -200,132 +200,6 @@ def _split_words(col: str) -> str:
 
  
 
-# ─────────────────────────────────────────────────────────────────────────
-
-#  Analyses – Profile
-
-# ─────────────────────────────────────────────────────────────────────────
-
-def profile_analysis(df: pd.DataFrame):
-
-    now, total = datetime.now().strftime("%Y-%m-%d %H:%M:%S"), len(df)
-
-    rows = []
-
-    for col in df.columns:
-
-        s = df[col]
-
-        nulls = int(s.isnull().sum())
-
-        blanks = int((s.astype(str).str.strip() == "").sum())
-
-        uniq = int(s.nunique(dropna=True))
-
-        comp = round(100 * (total - nulls - blanks) / total, 2) if total else 0
-
-        if pd.api.types.is_numeric_dtype(s):
-
-            vals = pd.to_numeric(s, errors="coerce").dropna()
-
-            stats = (vals.min(), vals.max(), vals.median(), vals.std()) if not vals.empty else ("N/A",) * 4
-
-        else:
-
-            lengths = s.dropna().astype(str).str.strip().replace("", pd.NA).dropna().str.len()
-
-            stats = (
-
-                lengths.min() if not lengths.empty else "N/A",
-
-                lengths.max() if not lengths.empty else "N/A",
-
-                lengths.median() if not lengths.empty else "N/A",
-
-                "N/A"
-
-            )
-
-        rows.append([col, total, uniq, comp, nulls, blanks, *stats, now])
-
-    hdr = ["Field", "Total", "Unique", "Completeness (%)",
-
-           "Nulls", "Blanks", "Min", "Max", "Median", "Std", "Analysis Date"]
-
-    return hdr, rows
-
- 
-
-# ─────────────────────────────────────────────────────────────────────────
-
-#  Analyses – Quality
-
-# ─────────────────────────────────────────────────────────────────────────
-
-_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
-
-_DATE_PARSE = lambda x: pd.to_datetime(x, errors="coerce")
-
- 
-
-def _default_valid_count(s: pd.Series) -> int:
-
-    if pd.api.types.is_numeric_dtype(s):
-
-        return pd.to_numeric(s, errors="coerce").notna().sum()
-
-    if "date" in s.name.lower() or pd.api.types.is_datetime64_any_dtype(s):
-
-        return _DATE_PARSE(s).notna().sum()
-
-    if "email" in s.name.lower():
-
-        return s.astype(str).str.match(_EMAIL_RE).sum()
-
-    return s.astype(str).str.strip().ne("").sum()
-
- 
-
-def quality_analysis(df: pd.DataFrame, rules: dict[str, re.Pattern] | None = None):
-
-    now, total = datetime.now().strftime("%Y-%m-%d %H:%M:%S"), len(df)
-
-    rows = []
-
-    for col in df.columns:
-
-        s = df[col]
-
-        nulls = int(s.isnull().sum())
-
-        blanks = int((s.astype(str).str.strip() == "").sum())
-
-        comp_pct = round(100 * (total - nulls - blanks) / total, 2) if total else 0
-
-        uniq_pct = round(100 * s.nunique(dropna=True) / total, 2) if total else 0
-
-        if rules and col in rules:
-
-            valid_cnt = s.dropna().astype(str).str.match(rules[col]).sum()
-
-        else:
-
-            valid_cnt = _default_valid_count(s)
-
-        valid_pct = round(100 * valid_cnt / total, 2) if total else 0
-
-        score = round((comp_pct + valid_pct) / 2, 2)
-
-        rows.append([col, total, comp_pct, uniq_pct, valid_pct, score, now])
-
-    hdr = ["Field", "Total", "Completeness (%)", "Uniqueness (%)",
-
-           "Validity (%)", "Quality Score (%)", "Analysis Date"]
-
-    return hdr, rows
-
- 
-
 # ─────────────────────────────────────────────────────────────────────────
 
 #  Analyses – Catalog
@@ -464,81 +338,19 @@ def compliance_analysis(_df: pd.DataFrame):
 
 def _make_s3_client(anonymous: bool = False):
 
-    if anonymous:
-
-        return boto3.client("s3", config=Config(signature_version=UNSIGNED))
-
-    return boto3.Session(
-
-        aws_access_key_id=defaults["aws_access_key_id"] or None,
-
-        aws_secret_access_key=defaults["aws_secret_access_key"] or None,
-
-        aws_session_token=defaults["aws_session_token"] or None,
-
-        region_name=defaults["aws_s3_region"] or None,
-
-    ).client("s3")
+    return get_s3_client(anonymous, settings=defaults)
 
  
 
 def download_text_from_uri(uri: str) -> str:
 
-    if uri.startswith("s3://"):
-
-        _, rest = uri.split("s3://", 1)
-
-        bucket, key = rest.split("/", 1)
-
-        for anonymous in (False, True):
-
-            try:
-
-                obj = _make_s3_client(anonymous).get_object(Bucket=bucket, Key=key)
-
-                return obj["Body"].read().decode()
-
-            except Exception:
-
-                if anonymous:
-
-                    region = defaults.get("aws_s3_region", "us-east-1")
-
-                    url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
-
-                    r = requests.get(url, verify=False, timeout=60); r.raise_for_status()
-
-                    return r.text
-
-                continue
-
-    r = requests.get(uri, verify=False, timeout=60); r.raise_for_status()
-
-    return r.text
+    return _shared_download(uri, settings=defaults)
 
  
 
 def upload_to_s3(process: str, headers, data):
 
-    bucket = defaults.get(f"aws_{process.lower()}_bucket", "").strip()
-
-    if not bucket:
-
-        return f"No bucket configured for {process}"
-
-    buf = io.StringIO(); csv.writer(buf).writerows([headers, *data])
-
-    key = f"{process}_{datetime.now():%Y%m%d_%H%M%S}.csv"
-
-    try:
-
-        _make_s3_client().put_object(Bucket=bucket, Key=key, Body=buf.getvalue())
-
-        return f"Uploaded to s3://{bucket}/{key}"
-
-    except Exception as e:
-
-        return f"S3 upload failed: {e}"
+    return _shared_upload(process, headers, data, settings=defaults)
 
  
 
@@ -46,6 +46,14 @@ import ssl
 
 from datetime import datetime
 
+from app.dataset import ColumnStats  # per-column derived views, built once
+
+from app.analysis import column_metrics  # one fused Profile/Quality pass per column
+
+from app.sketches import quantile_cell  # medians from the column's quantile sketch
+
+from app.patterns import pattern_cell  # value shapes ("AAA-999-9999")
+
  
 
 # =========================================
@@ -636,15 +644,17 @@ def profile_analysis(df, application, table_name):
 
     for col in df.columns:
 
-        col_data = df[col]
+        st = ColumnStats(df[col])
+
+        m = column_metrics(st)
 
         field_name = col
 
-        unique_count = col_data.nunique(dropna=True)
+        unique_count = m["distinct"]
 
-        null_count = col_data.isnull().sum()
+        null_count = m["nulls"]
 
-        blank_count = (col_data.astype(str).str.strip() == '').sum()
+        blank_count = m["blanks"]
 
         completeness_pct = (
 
@@ -654,7 +664,7 @@ def profile_analysis(df, application, table_name):
 
         )
 
-        numeric_data = pd.to_numeric(col_data, errors='coerce').dropna()
+        numeric_data = st.numeric.dropna()
 
         if len(numeric_data) > 0:
 
@@ -662,7 +672,7 @@ def profile_analysis(df, application, table_name):
 
             max_val = numeric_data.max()
 
-            median_val = numeric_data.median()
+            median_val = quantile_cell(st.digest("numeric"), 0.5)
 
             std_val = numeric_data.std()
 
@@ -752,13 +762,15 @@ def quality_analysis(df, application, table_name):
 
     for col in df.columns:
 
-        col_data = df[col]
+        st = ColumnStats(df[col])
+
+        m = column_metrics(st)
 
         field_name = col
 
-        null_count = col_data.isnull().sum()
+        null_count = m["nulls"]
 
-        blank_count = (col_data.astype(str).str.strip() == '').sum()
+        blank_count = m["blanks"]
 
         completeness_pct = (
 
@@ -770,15 +782,13 @@ def quality_analysis(df, application, table_name):
 
         uniqueness_pct = (
 
-            100.0 * col_data.nunique(dropna=True) / total_records
+            100.0 * m["distinct"] / total_records
 
             if total_records > 0 else 0.0
 
         )
 
-        numeric_data = pd.to_numeric(col_data, errors='coerce')
-
-        valids = numeric_data.notnull().sum()
+        valids = st.numeric.notnull().sum()
 
         # simplistic validity
 
@@ -1086,19 +1096,11 @@ def catalog_analysis(df, application, table_name, knowledge_data=None):
 
        
 
-        # guess type
-
-        if pd.api.types.is_numeric_dtype(col_data):
-
-            data_type = "Numeric"
-
-            pattern = "Digits"
-
-        else:
+        st = ColumnStats(col_data)
 
-            data_type = "Text"
+        data_type = st.semantic.catalog_type  # inferred from a sample of the column (app.semantic)
 
-            pattern = "Free text"
+        pattern = pattern_cell(st.patterns)  # most common shapes with their shares
 
  
 
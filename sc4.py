@@ -26,10 +26,21 @@ import string
 
 import uuid
 
-import boto3  # boto3 for AWS connectivity
+import threading
+
 
 from botocore.exceptions import ClientError  # For AWS error handling
 
+from app.s3_utils import get_s3_client  # shared, cached S3 clients
+
+from app.ingest import read_frame, write_columnar, columnar_format  # Parquet / Feather
+
+from app.ingest import LoadProgress, LoadCancelled  # background loads
+
+from app.sources import is_multi_source, read_source_frame  # S3 prefixes / globs
+
+from app.dataset import Dataset, DatasetHistory, replace_columns  # copy-on-write snapshots / undo
+
 from datetime import datetime
 
 from faker import Faker
@@ -70,7 +81,9 @@ default_values = {
 
     "aws_s3_bucket": "",
 
-    "aws_s3_region": ""
+    "aws_s3_region": "",
+
+    "repo_filename": "syn-data-repo.csv"  # .parquet / .feather keep the repo columnar
 
 }
 
@@ -904,7 +917,9 @@ class SettingsDialog(wx.Dialog):
 
             ("AWS S3 Bucket:", "aws_s3_bucket"),
 
-            ("AWS S3 Region:", "aws_s3_region")
+            ("AWS S3 Region:", "aws_s3_region"),
+
+            ("Repository File:", "repo_filename")
 
         ]
 
@@ -982,13 +997,15 @@ class MainFrame(wx.Frame):
 
         self.uploaded_df = None
 
+        self.history = DatasetHistory()  # undo/redo over uploaded_df versions
+
         self.field_info = {}
 
         self.table_data = []
 
         self.selected_columns = []
 
-        self.repo_filename = "syn-data-repo.csv"
+        self.repo_filename = default_values.get("repo_filename") or "syn-data-repo.csv"
 
         self.anomaly_info = {}
 
@@ -1080,6 +1097,12 @@ class MainFrame(wx.Frame):
 
         editMenu = wx.Menu()
 
+        un = editMenu.Append(wx.ID_UNDO, "&Undo Data Change")
+
+        rd = editMenu.Append(wx.ID_REDO, "&Redo Data Change")
+
+        editMenu.AppendSeparator()
+
         g1 = editMenu.Append(wx.ID_ANY, "Generate Synthetic Data")
 
         s2 = editMenu.Append(wx.ID_ANY, "Select Columns...")
@@ -1126,6 +1149,10 @@ class MainFrame(wx.Frame):
 
         self.Bind(wx.EVT_MENU, self.on_anomaly_detection, d1)
 
+        self.Bind(wx.EVT_MENU, self.on_undo, un)
+
+        self.Bind(wx.EVT_MENU, self.on_redo, rd)
+
         self.Bind(wx.EVT_MENU, self.on_settings, settingsMenu.FindItemById(wx.ID_PREFERENCES))
 
  
@@ -1282,7 +1309,7 @@ class MainFrame(wx.Frame):
 
         try:
 
-            df = pd.read_csv(self.repo_filename).replace(["nan","NaN"], "")
+            df = self._read_repo()
 
             self.display_grid(df.columns.tolist(), df.values.tolist(), self.repoGrid)
 
@@ -1294,11 +1321,37 @@ class MainFrame(wx.Frame):
 
  
 
+    def _read_repo(self):
+
+        fmt = columnar_format(self.repo_filename)
+
+        if fmt:
+
+            return read_frame(self.repo_filename).astype(object).fillna("")
+
+        return pd.read_csv(self.repo_filename).replace(["nan","NaN"], "")
+
+ 
+
+    def _write_repo(self, df):
+
+        fmt = columnar_format(self.repo_filename)
+
+        if fmt:
+
+            write_columnar(df, self.repo_filename, fmt)
+
+        else:
+
+            df.to_csv(self.repo_filename, index=False)
+
+ 
+
     def on_upload_data(self, event):
 
-        with wx.FileDialog(self, "Open CSV or TXT file",
+        with wx.FileDialog(self, "Open CSV, TXT, Parquet or Feather file",
 
-                           wildcard="CSV (*.csv)|*.csv|Text (*.txt)|*.txt",
+                           wildcard="CSV (*.csv)|*.csv|Text (*.txt)|*.txt|Parquet (*.parquet)|*.parquet|Feather (*.feather;*.arrow)|*.feather;*.arrow",
 
                            style=wx.FD_OPEN|wx.FD_FILE_MUST_EXIST) as dlg:
 
@@ -1308,63 +1361,147 @@ class MainFrame(wx.Frame):
 
             path = dlg.GetPath()
 
-            try:
+        # parse on a worker thread; the dialog keeps the UI alive and can cancel the read
+
+        progress = LoadProgress(None if columnar_format(path) else os.path.getsize(path))
+
+        busy = wx.ProgressDialog("Loading", f"Reading {os.path.basename(path)}…", maximum=1000, parent=self,
+
+                                 style=wx.PD_APP_MODAL|wx.PD_CAN_ABORT|wx.PD_ELAPSED_TIME)
+
+        progress.on_update = lambda p: wx.CallAfter(self._update_load_dialog, busy, p)
+
+        threading.Thread(target=self._read_upload, args=(path, progress, busy), daemon=True).start()
+
+ 
+    def _read_upload(self, path, progress, busy):
+
+        try:
+
+            if columnar_format(path):
+
+                df = read_frame(path, progress=progress)
+
+            else:
 
                 ext = os.path.splitext(path)[1].lower()
 
                 delim = ',' if ext=='.csv' else None
 
-                df = pd.read_csv(path, delimiter=delim)
+                frames = []
 
-                if df.empty:
+                with open(path, 'rb') as f:
 
-                    raise ValueError("File is empty.")
+                    for chunk in pd.read_csv(f, delimiter=delim, chunksize=50_000):
 
-                self.original_headers = df.columns.tolist()
+                        frames.append(chunk)
 
-                self.uploaded_data = df.values.tolist()
+                        progress.add(rows=len(chunk), nbytes=f.tell()-progress.bytes)
 
-                self.uploaded_df = df.copy()
+                df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
-                self.field_info = {}
+        except LoadCancelled:
 
-                for col in self.original_headers:
+            wx.CallAfter(self._finish_upload, path, None, None, busy)
 
-                    sample = next((v for v in df[col] if pd.notnull(v)), None)
+        except Exception as e:
 
-                    values = df[col].dropna().tolist()
+            wx.CallAfter(self._finish_upload, path, None, e, busy)
 
-                    self.field_info[col] = {
+        else:
 
-                        "sample": sample,
+            wx.CallAfter(self._finish_upload, path, df, None, busy)
 
-                        "dtype": str(df[col].dtype),
+ 
+    def _update_load_dialog(self, busy, progress):
 
-                        "values": values
+        if progress.cancelled:
 
-                    }
+            return
 
-                self.load_field_specifications()
+        msg = f"{progress.rows:,} rows read"
 
-                self.table_data = self.uploaded_data.copy()
+        frac = progress.fraction()
 
-                self.display_grid(self.original_headers, self.table_data, self.dataGrid)
+        cont, _ = busy.Pulse(msg) if frac is None else busy.Update(int(frac*1000), msg)
 
-                self.SetStatusText(f"Uploaded: {os.path.basename(path)}")
+        if not cont:
 
-                logging.info(f"Uploaded file: {path}")
+            progress.cancel()
 
-            except Exception as e:
+ 
+    def _finish_upload(self, path, df, error, busy):
 
-                wx.MessageBox(f"Failed to load file: {e}", "Error", wx.OK|wx.ICON_ERROR)
+        busy.Destroy()
 
-                logging.error(f"Upload error: {e}")
+        if error is not None:
 
- 
+            wx.MessageBox(f"Failed to load file: {error}", "Error", wx.OK|wx.ICON_ERROR)
+
+            logging.error(f"Upload error: {error}")
+
+            return
+
+        if df is None:
+
+            self.SetStatusText("Upload cancelled.")
+
+            return
+
+        try:
+
+            if df.empty:
+
+                raise ValueError("File is empty.")
+
+            # swap the new dataset in only once it is complete
+
+            self.original_headers = df.columns.tolist()
+
+            self.uploaded_data = df.values.tolist()
+
+            self.uploaded_df = df
+
+            self.history.reset(Dataset(df))
+
+            self.field_info = {}
+
+            for col in self.original_headers:
+
+                sample = next((v for v in df[col] if pd.notnull(v)), None)
+
+                values = df[col].dropna().tolist()
+
+                self.field_info[col] = {
+
+                    "sample": sample,
+
+                    "dtype": str(df[col].dtype),
+
+                    "values": values
 
+                }
+
+            self.load_field_specifications()
+
+            self.table_data = self.uploaded_data.copy()
+
+            self.display_grid(self.original_headers, self.table_data, self.dataGrid)
+
+            self.SetStatusText(f"Uploaded: {os.path.basename(path)}")
+
+            logging.info(f"Uploaded file: {path}")
+
+        except Exception as e:
+
+            wx.MessageBox(f"Failed to load file: {e}", "Error", wx.OK|wx.ICON_ERROR)
+
+            logging.error(f"Upload error: {e}")
+
+ 
     def on_load_from_s3(self, event):
 
-        dlg = wx.TextEntryDialog(self, "Enter S3 URI (s3://bucket/key.csv):", "Load from S3")
+        dlg = wx.TextEntryDialog(self, "Enter S3 URI (s3://bucket/key.csv or s3://bucket/prefix/):", "Load from S3")
 
         if dlg.ShowModal() != wx.ID_OK:
 
@@ -1384,7 +1521,7 @@ class MainFrame(wx.Frame):
 
         bucket, key = parsed.netloc, parsed.path.lstrip('/')
 
-        if not bucket or not key:
+        if not bucket or (not key and not is_multi_source(uri)):
 
             wx.MessageBox("Invalid S3 URI.", "Error", wx.OK|wx.ICON_ERROR)
 
@@ -1392,43 +1529,35 @@ class MainFrame(wx.Frame):
 
         try:
 
-            creds = {
-
-                "aws_access_key_id": default_values["aws_access_key_id"],
-
-                "aws_secret_access_key": default_values["aws_secret_access_key"]
+            if is_multi_source(uri):
 
-            }
+                # s3://bucket/prefix/ or a key glob: every part, fetched concurrently
 
-            if default_values.get("aws_session_token"):
+                df = read_source_frame(uri, settings=default_values)
 
-                creds["aws_session_token"] = default_values["aws_session_token"]
-
-            if default_values.get("aws_s3_region"):
-
-                creds["region_name"] = default_values["aws_s3_region"]
+            else:
 
-            session = boto3.session.Session(**creds)
+                s3 = get_s3_client(settings=default_values)
 
-            s3 = session.client("s3")
+                try:
 
-            resp = s3.list_objects_v2(Bucket=bucket, Prefix=key)
+                    s3.head_object(Bucket=bucket, Key=key)
 
-            if 'Contents' not in resp or not any(o['Key']==key for o in resp['Contents']):
+                except ClientError:
 
-                raise FileNotFoundError(f"{key} not found in {bucket}")
+                    raise FileNotFoundError(f"{key} not found in {bucket}")
 
-            tmp = os.path.join(os.getcwd(), f"_s3_{os.path.basename(key)}")
+                tmp = os.path.join(os.getcwd(), f"_s3_{os.path.basename(key)}")
 
-            s3.download_file(bucket, key, tmp)
+                s3.download_file(bucket, key, tmp)
 
-            ext = os.path.splitext(tmp)[1].lower()
+                ext = os.path.splitext(tmp)[1].lower()
 
-            delim = ',' if ext=='.csv' else None
+                delim = ',' if ext=='.csv' else None
 
-            df = pd.read_csv(tmp, delimiter=delim)
+                df = read_frame(tmp) if columnar_format(tmp) else pd.read_csv(tmp, delimiter=delim)
 
-            os.remove(tmp)
+                os.remove(tmp)
 
             if df.empty:
 
@@ -1438,7 +1567,9 @@ class MainFrame(wx.Frame):
 
             self.uploaded_data = df.values.tolist()
 
-            self.uploaded_df = df.copy()
+            self.uploaded_df = df
+
+            self.history.reset(Dataset(df))
 
             self.field_info = {}
 
@@ -1572,49 +1703,45 @@ class MainFrame(wx.Frame):
 
             return
 
-        headers = ["Unique ID"] + self.original_headers if "Unique ID" not in self.original_headers else self.original_headers.copy()
+        df = self.uploaded_df
 
-        new_data = []
+        # regenerate only the selected columns; the rest stay shared with uploaded_df
 
-        unique_sets = {}
+        changes = {}
 
         for col in self.selected_columns:
 
-            if self.field_info[col].get("primary_key"):
+            cons = self.field_info[col]
 
-                unique_sets[col] = set()
+            ft = cons["dtype"]
 
-        for row in self.uploaded_data:
+            seen = set() if cons.get("primary_key") else None
 
-            base = [str(uuid.uuid4())] + row if "Unique ID" not in self.original_headers else list(row)
+            vals = []
 
-            for col in self.selected_columns:
+            for orig in df[col]:
 
-                idx = self.original_headers.index(col)
+                sv = orig if pd.notnull(orig) else cons["sample"]
 
-                orig = row[idx]
+                if seen is not None:
 
-                sv = orig if pd.notnull(orig) else self.field_info[col]["sample"]
+                    vals.append(generate_unique_synthetic_value(col, sv, ft, cons, seen))
 
-                ft = self.field_info[col]["dtype"]
+                else:
 
-                cons = self.field_info[col]
+                    vals.append(generate_synthetic_value(col, sv, ft, cons))
 
-                if cons.get("primary_key"):
+            changes[col] = vals
 
-                    v = generate_unique_synthetic_value(col, sv, ft, cons, unique_sets[col])
-
-                else:
+        out = replace_columns(df, changes)
 
-                    v = generate_synthetic_value(col, sv, ft, cons)
+        if "Unique ID" not in out.columns:
 
-                base[idx + (0 if "Unique ID" in self.original_headers else 1)] = v
+            out.insert(0, "Unique ID", [str(uuid.uuid4()) for _ in range(len(out))])
 
-            new_data.append(base)
+        self.table_data = out.values.tolist()
 
-        self.table_data = new_data
-
-        self.display_grid(headers, self.table_data, self.dataGrid)
+        self.display_grid(out.columns.tolist(), self.table_data, self.dataGrid)
 
         self.SetStatusText("Anonymization completed.")
 
@@ -1658,7 +1785,7 @@ class MainFrame(wx.Frame):
 
             return
 
-        df = self.uploaded_df.copy()
+        changes = {}
 
         for col in self.original_headers:
 
@@ -1668,7 +1795,7 @@ class MainFrame(wx.Frame):
 
                 new_vals = []
 
-                for val in df[col]:
+                for val in self.uploaded_df[col]:
 
                     sv = val if pd.notnull(val) else spec.get("sample")
 
@@ -1676,13 +1803,11 @@ class MainFrame(wx.Frame):
 
                     new_vals.append(generate_synthetic_value(col, sv, ft, spec))
 
-                df[col] = new_vals
+                changes[col] = new_vals
 
-        self.uploaded_df = df
-
-        self.table_data = df.values.tolist()
+        if changes:
 
-        self.display_grid(df.columns.tolist(), self.table_data, self.dataGrid)
+            self._commit_df(replace_columns(self.uploaded_df, changes))
 
         self.SetStatusText("Applied field specs.")
 
@@ -1700,7 +1825,7 @@ class MainFrame(wx.Frame):
 
         info = {}
 
-        df = self.uploaded_df.copy()
+        df = self.uploaded_df  # only read here
 
         # numeric outliers
 
@@ -1828,15 +1953,19 @@ class MainFrame(wx.Frame):
 
             return
 
-        df = self.uploaded_df.copy()
+        # copy just the cleansed columns; the others stay shared with the previous version
+
+        changes = {}
 
         for col, detail in self.anomaly_info.items():
 
             inds = detail["indices"]
 
+            ser = self.uploaded_df[col].copy()
+
             if "median" in detail:
 
-                df.loc[inds, col] = detail["median"]
+                ser.loc[inds] = detail["median"]
 
             else:
 
@@ -1848,7 +1977,27 @@ class MainFrame(wx.Frame):
 
                     cons = self.field_info[col]
 
-                    df.at[i, col] = generate_synthetic_value(col, sv, ft, cons)
+                    ser.at[i] = generate_synthetic_value(col, sv, ft, cons)
+
+            changes[col] = ser
+
+        self._commit_df(replace_columns(self.uploaded_df, changes))
+
+        self.SetStatusText("Data cleansed.")
+
+        logging.info("Applied cleansing.")
+
+        self.btnCleanse.Disable()
+
+ 
+
+    def _commit_df(self, df, record=True):
+
+        """Make df the working data and redraw it; record keeps the previous version for Undo."""
+
+        if record:
+
+            self.history.push(Dataset(df))
 
         self.uploaded_df = df
 
@@ -1856,11 +2005,37 @@ class MainFrame(wx.Frame):
 
         self.display_grid(df.columns.tolist(), self.table_data, self.dataGrid)
 
-        self.SetStatusText("Data cleansed.")
+ 
 
-        logging.info("Applied cleansing.")
+    def on_undo(self, event):
 
-        self.btnCleanse.Disable()
+        ds = self.history.undo()
+
+        if ds is None:
+
+            self.SetStatusText("Nothing to undo.")
+
+            return
+
+        self._commit_df(ds.frame, record=False)
+
+        self.SetStatusText("Undone.")
+
+ 
+
+    def on_redo(self, event):
+
+        ds = self.history.redo()
+
+        if ds is None:
+
+            self.SetStatusText("Nothing to redo.")
+
+            return
+
+        self._commit_df(ds.frame, record=False)
+
+        self.SetStatusText("Redone.")
 
  
 
@@ -1874,11 +2049,11 @@ class MainFrame(wx.Frame):
 
             if not os.path.exists(self.repo_filename):
 
-                df_new.to_csv(self.repo_filename, index=False)
+                self._write_repo(df_new)
 
             else:
 
-                df_old = pd.read_csv(self.repo_filename).replace(["nan","NaN"], "")
+                df_old = self._read_repo()
 
                 for c in df_new.columns:
 
@@ -1890,7 +2065,7 @@ class MainFrame(wx.Frame):
 
                 df_concat = pd.concat([df_old, df_new], ignore_index=True).fillna("")
 
-                df_concat.to_csv(self.repo_filename, index=False)
+                self._write_repo(df_concat)
 
             self.SetStatusText("Saved to repo.")
 
@@ -1914,7 +2089,7 @@ class MainFrame(wx.Frame):
 
             return
 
-        wildcard = "CSV (*.csv)|*.csv|Text (*.txt)|*.txt|Excel (*.xlsx)|*.xlsx"
+        wildcard = "CSV (*.csv)|*.csv|Text (*.txt)|*.txt|Excel (*.xlsx)|*.xlsx|Parquet (*.parquet)|*.parquet|Feather (*.feather)|*.feather"
 
         with wx.FileDialog(self, "Export Data", wildcard=wildcard,
 
@@ -1952,6 +2127,10 @@ class MainFrame(wx.Frame):
 
                     pd.DataFrame(self.table_data,columns=headers).to_excel(path,index=False)
 
+                elif columnar_format(path):
+
+                    write_columnar(pd.DataFrame(self.table_data,columns=headers), path, columnar_format(path))
+
                 else:
 
                     raise ValueError("Unsupported format")
@@ -1976,27 +2155,9 @@ class MainFrame(wx.Frame):
 
             return
 
-        creds = {
-
-            "aws_access_key_id": default_values["aws_access_key_id"],
-
-            "aws_secret_access_key": default_values["aws_secret_access_key"]
-
-        }
-
-        if default_values.get("aws_session_token"):
-
-            creds["aws_session_token"] = default_values["aws_session_token"]
-
-        if default_values.get("aws_s3_region"):
-
-            creds["region_name"] = default_values["aws_s3_region"]
-
         try:
 
-            session = boto3.session.Session(**creds)
-
-            s3 = session.client("s3")
+            s3 = get_s3_client(settings=default_values)
 
             bucket = default_values["aws_s3_bucket"]
 
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from app.ingest import read_frame, read_frame_parallel
+
+ROWS = "".join(f"{i},x{i},{i % 7}\n" for i in range(2000)).encode()
+
+
+@pytest.mark.parametrize("header", [
+    b"\xef\xbb\xbfid,name,score\n",         # UTF-8 BOM, as Excel writes it
+    b"id,a,a\n",                            # repeated name
+    b'id,"long\nname",score\n',             # quoted name spanning lines
+    b"\n\nid,name,score\n",                 # blank lines before the header
+])
+def test_parallel_matches_serial(tmp_path, header):
+    path = tmp_path / "data.csv"
+    path.write_bytes(header + ROWS)
+    serial = read_frame(str(path))
+    parallel = read_frame_parallel(str(path), workers=2, min_bytes=0)
+    pd.testing.assert_frame_equal(parallel, serial)
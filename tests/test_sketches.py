@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.sketches import HyperLogLog, Moments, SpaceSaving, TDigest
+
+N = 100_000
+PARTS = 10
+
+
+def _parts(values):
+    return np.array_split(values, PARTS)
+
+
+def _built(cls, values, **kw):
+    parts = []
+    for part in _parts(values):
+        s = cls(**kw)
+        s.update(part)
+        parts.append(s)
+    whole = parts[0]
+    for s in parts[1:]:
+        whole.merge(s)
+    return whole
+
+
+def test_moments_merge_matches_numpy():
+    v = np.random.default_rng(0).normal(50, 7, N)
+    single = Moments()
+    single.update(v)
+    merged = _built(Moments, v)
+    for m in (single, merged):
+        assert m.n == N
+        assert m.mean == pytest.approx(v.mean(), rel=1e-12)
+        assert m.std() == pytest.approx(v.std(ddof=1), rel=1e-10)
+        assert (m.lo, m.hi) == (v.min(), v.max())
+
+
+@pytest.mark.parametrize("q", [0.5, 0.99])
+def test_tdigest_quantiles_within_rank_error(q):
+    v = np.random.default_rng(1).lognormal(3, 1, N)
+    ordered = np.sort(v)
+    single = TDigest().update(v)
+    for d in (single, _built(TDigest, v)):
+        assert d.n == N
+        rank = np.searchsorted(ordered, d.quantile(q)) / N
+        assert abs(rank - q) <= d.rank_error(q) + 1 / N
+
+
+def test_tdigest_exact_on_few_distinct_values():
+    v = np.random.default_rng(2).integers(0, 100, N).astype(float)
+    d = _built(TDigest, v)
+    assert d.exact
+    for q in (0.01, 0.5, 0.99):
+        assert d.quantile(q) == np.quantile(v, q)
+
+
+def test_hyperloglog_merge_equals_single_pass():
+    v = pd.Series(np.arange(N) * 7919)
+    single = HyperLogLog(14)
+    single.update(v)
+    merged = _built(HyperLogLog, v, precision=14)
+    assert np.array_equal(single.registers, merged.registers)
+    assert abs(merged.count() - N) / N <= 3 * merged.rel_error
+
+
+def test_space_saving_top_values_on_zipf_stream():
+    v = pd.Series(np.random.default_rng(3).zipf(1.5, N))
+    exact = v.value_counts()
+    for ss in (SpaceSaving().update(v), _built(SpaceSaving, v)):
+        assert ss.n == N
+        top = ss.top(10)
+        assert [value for value, _, _ in top] == exact.index[:10].tolist()
+        for value, count, error in top:
+            assert count - error <= exact[value] <= count